@@ -1,22 +1,374 @@
+import os
+import uuid
+from contextlib import nullcontext
+
 import streamlit as st
-import pandas as pd
 
+from gearing.backend import available_backends, default_backend, make_backend
+from gearing.cache import cached_gearing_frame, cached_sheets, file_digest
+from gearing.datasets import DATASETS
+from gearing.downsample import downsample, webgl_points
+from gearing.parsing import bulan_id
+from gearing.preview import PREVIEW_ROWS, format_value, preview_page
+from gearing.profiling import Profiler, profiling_enabled, stage
+from gearing.filters import PeriodIndex
+from gearing.ingest import INGEST
+from gearing.memo import AGG_CACHE, selection_key
+from gearing.penjaminan import (
+    LAINNYA,
+    TOP_N_DEFAULT,
+    opsi_filter,
+    sheet_kind,
+    top_n_dimensi,
+)
+from gearing.ratio import build_pivot, gearing_series
+from gearing.store import PeriodStore
+
+# Satu-satunya set_page_config, dipanggil sebelum elemen lain
 st.set_page_config(
-    page_title="Dashboard Gearing Ratio KUR & PEN",
+    page_title="Dashboard Gearing Ratio & Penjaminan",
     layout="wide"
 )
 
-def bagian_1_proyeksi():
+# ===============================
+# ASET STATIS (SEKALI PER PROSES)
+# ===============================
+ASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gambar")
+
+
+# Logo & contoh format dibaca dari disk sekali, bukan setiap rerun
+@st.cache_resource
+def aset(nama):
+    with open(os.path.join(ASET_DIR, nama), "rb") as f:
+        return f.read()
+
+
+# ===============================
+# RIWAYAT LOKAL (SQLITE)
+# ===============================
+@st.cache_resource
+def get_store():
+    return PeriodStore.from_env()
+
+
+# Versi naik setiap upsert yang mengubah isi, sehingga frame & index
+# riwayat hanya dibaca ulang setelah ada perubahan
+@st.cache_resource(show_spinner="Membaca riwayat...", max_entries=2)
+def load_store(versi):
+    df = get_store().frame()
+    return df, PeriodIndex(df), f"store-{versi}"
+
+
+# ===============================
+# DATASET BERSAMA (LINTAS SESI)
+# ===============================
+# Hash isi upload dihitung sekali per file yang diupload, bukan setiap rerun
+def digest_upload(file):
+    kunci = f"_digest_{getattr(file, 'file_id', None)}"
+    if kunci not in st.session_state:
+        st.session_state[kunci] = file_digest(file)
+    return st.session_state[kunci]
+
+
+# Parse berjalan di thread pool (INGEST); script hanya menggambar progress.
+# Upload baru memicu rerun yang memutus loop ini, lalu submit() melepas
+# (dan membatalkan) job lama sesi ini.
+def muat_dataset(key, judul, loader, *args, **kwargs):
+    if key in DATASETS:
+        return DATASETS.get_or_load(key, loader, *args, **kwargs)
+
+    sesi = st.session_state.setdefault("_sesi", uuid.uuid4().hex)
+    job = INGEST.submit(key, sesi, DATASETS.get_or_load, key, loader, *args, **kwargs)
+    bar = st.progress(0.0, text=judul)
+    while not job.wait(0.2):
+        bar.progress(job.fraksi or 0.0, text=f"{judul} {job.pesan}")
+    bar.empty()
+    INGEST.release(sesi)
+
+    job.result()  # error parse diteruskan ke pemanggil
+    # Ambil lagi dari DATASETS: setiap sesi mendapat salinan dangkal sendiri
+    return DATASETS.get_or_load(key, loader, *args, **kwargs)
+
+
+def lepas_upload():
+    """Upload dihapus: batalkan parse sesi ini yang belum selesai."""
+    if "_sesi" in st.session_state:
+        INGEST.release(st.session_state["_sesi"])
+
+
+def cache_caption():
+    st.sidebar.caption(
+        "⚡ Cache agregasi: {hits} hit / {misses} miss ({entries} entri)"
+        .format(**AGG_CACHE.stats())
+    )
+    st.sidebar.caption(
+        "📦 Dataset bersama: {entries} entri, {mb:,.0f} MB "
+        "({hits} hit / {misses} parse / {waits} menunggu)"
+        .format(**DATASETS.stats())
+    )
+
+
+# ===============================
+# DAFTAR GRAFIK GEARING RATIO
+# ===============================
+# Satu entri per grafik: key seri (gearing_series), jenis grafik,
+# kolom y, format tabel & nama file download.
+SEKSI_GEARING = [
+    dict(
+        seri="os_kur", judul="OS Penjaminan KUR", grafik="area",
+        y="OS_KUR_T", y_title="Outstanding KUR (Triliun)", suffix=" T",
+        format={"OS_KUR_Rp": "Rp {:,.2f}", "OS_KUR_T": "{:.2f}"},
+        tabel="Tabel Hasil Pengolahan OS Penjaminan KUR",
+        download="Download Hasil OS KUR", file="os_penjaminan_kur.csv",
+    ),
+    dict(
+        seri="os_kpp", judul="OS Penjaminan KPP", grafik="area",
+        y="OS_KPP_T", y_title="Outstanding KPP (Triliun)", suffix=" T",
+        format={"OS_KPP_Rp": "Rp {:,.2f}", "OS_KPP_T": "{:.2f}"},
+        tabel="Tabel Hasil Pengolahan OS Penjaminan KPP",
+        download="Download Hasil OS KPP", file="os_penjaminan_kpp.csv",
+    ),
+    dict(
+        seri="ekuitas_kur", judul="Ekuitas KUR", grafik="area",
+        y="Ekuitas_KUR_T", y_title="Ekuitas KUR (Triliun)", suffix=" T",
+        format={"Ekuitas_KUR_Rp": "Rp {:,.2f}", "Ekuitas_KUR_T": "{:.2f}"},
+        tabel="Tabel Hasil Pengolahan Ekuitas KUR",
+        download="Download Hasil Ekuitas KUR", file="Ekuitas_kur.csv",
+    ),
+    dict(
+        seri="os_kur_pen", judul="OS Penjaminan KUR Dan PEN", grafik="area",
+        y="OS_KUR_PEN_T", y_title="Outstanding KUR_PEN (Triliun)", suffix=" T",
+        format={"OS_KUR_PEN_Rp": "Rp {:,.2f}", "OS_KUR_PEN_T": "{:.2f}"},
+        tabel="Tabel Hasil Pengolahan OS Penjaminan KUR & PEN",
+        download="Download Hasil OS KUR_PEN", file="os_penjaminan_kur_pen.csv",
+    ),
+    # (KUR Gen 1 + KUR Gen 2) / Ekuitas KUR
+    dict(
+        seri="gr_kur", judul="Gearing Ratio KUR", grafik="line",
+        y="Gearing_Ratio", y_title="Gearing Ratio KUR", suffix="x",
+        format={"KUR_Total_Rp": "Rp {:,.2f}", "Ekuitas_Rp": "Rp {:,.2f}",
+                "Gearing_Ratio": "{:.2f}"},
+        tabel="Tabel Gearing Ratio KUR",
+        download="Download Hasil Gearing Ratio KUR", file="gearing_ratio_kur.csv",
+    ),
+    # (KPP Gen 1 + KPP Gen 2) / Ekuitas KPP
+    dict(
+        seri="gr_kpp", judul="Gearing Ratio KPP", grafik="line",
+        y="Gearing_Ratio", y_title="Gearing Ratio KPP", suffix="x",
+        format={"KPP_Total_Rp": "Rp {:,.2f}", "Ekuitas_Rp": "Rp {:,.2f}",
+                "Gearing_Ratio": "{:.2f}"},
+        tabel="Tabel Gearing Ratio KPP",
+        download="Download Hasil Gearing Ratio KPP", file="gearing_ratio_kpp.csv",
+    ),
+    # (KUR Gen 1 + KUR Gen 2 + PEN Gen 1 + PEN Gen 2) / Ekuitas KUR
+    dict(
+        seri="gr_kur_pen", judul="Gearing Ratio KUR & PEN", grafik="line",
+        y="GR_KUR_PEN", y_title="Gearing Ratio KUR dan PEN", suffix="x",
+        format={"KUR_PEN_Total_Rp": "Rp {:,.2f}", "Ekuitas_Rp": "Rp {:,.2f}",
+                "GR_KUR_PEN": "{:.2f}"},
+        tabel="Tabel Gearing Ratio KUR dan PEN",
+        download="Download Hasil Gearing Ratio KUR dan PEN",
+        file="gearing_ratio_kurpen.csv",
+    ),
+]
+
+
+METODE_LABEL = {"lttb": "LTTB", "minmax": "Min/Max", None: "Tanpa downsampling"}
+
+
+# Serialisasi figure ke browser dicatat sebagai tahap "plotly" (mode profil)
+def plotly_chart(fig, **kwargs):
+    with stage("plotly"):
+        st.plotly_chart(fig, **kwargs)
+
+
+# ===============================
+# PANEL PROFIL (MODE DEBUG)
+# ===============================
+# Aktif dengan ?profile=1 di URL atau GEARING_PROFILE=1: waterfall
+# ms & MB per tahap / sheet di sidebar, bisa diunduh sebagai JSON.
+def tampil_profil(prof, menu):
+    import plotly.graph_objects as go
+
+    df = prof.frame()
+    if df.empty:
+        return
+
+    label = [
+        "· " * d + (f"{s} / {n}" if s and d == 0 else n)
+        for n, s, d in zip(df["stage"], df["sheet"], df["depth"])
+    ]
+    teks = [f"{ms:,.0f} ms · {mb:+.1f} MB" for ms, mb in zip(df["ms"], df["mb"])]
+
+    fig = go.Figure(go.Bar(
+        y=list(range(len(df))),
+        x=df["ms"],
+        base=df["start_ms"],
+        orientation="h",
+        text=teks,
+        textposition="auto",
+        marker_color=df["depth"],
+        hovertext=label,
+    ))
+    fig.update_layout(
+        height=80 + 22 * len(df),
+        margin=dict(l=0, r=0, t=10, b=30),
+        xaxis_title="ms",
+        yaxis=dict(
+            tickvals=list(range(len(df))),
+            ticktext=label,
+            autorange="reversed",
+        ),
+    )
+
+    with st.sidebar.expander("⏱️ Profil tahap", expanded=True):
+        akar = df[df["depth"] == 0]
+        st.caption(
+            f"{len(df)} tahap · {akar['ms'].sum():,.0f} ms · "
+            "tracemalloc aktif (run lebih lambat dari biasa) · MB = alokasi "
+            "seluruh proses, termasuk sesi lain yang berjalan bersamaan"
+        )
+        if prof.bersama:
+            st.caption(
+                "⚠️ Sesi profil lain aktif bersamaan: puncak MB (mb_peak) "
+                "tidak bisa dipisah per sesi"
+            )
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(
+            df[["stage", "sheet", "ms", "mb", "mb_peak"]].round(2),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.download_button(
+            "⬇️ Download profil (JSON)",
+            lambda: prof.to_json(menu=menu).encode("utf-8"),
+            "profil_dashboard.json",
+            "application/json"
+        )
+
+
+# ===============================
+# PREVIEW DATA PER HALAMAN (FRAGMENT)
+# ===============================
+# Hanya dijalankan saat expander dibuka; yang diformat & dikirim ke browser
+# hanya satu halaman, bukan seluruh frame.
+@st.fragment
+def tampil_preview(df, judul, key, metrics_col=None, format_nilai=True):
+    box = st.expander(judul, expanded=False, key=key, on_change="rerun")
+
+    with box:
+        if not box.open:
+            return
+
+        jumlah_halaman = preview_page(df)["halaman"]
+        halaman = st.number_input(
+            f"Halaman (1–{jumlah_halaman:,})",
+            min_value=1,
+            max_value=jumlah_halaman,
+            value=1,
+            key=f"{key}_halaman"
+        )
+
+        page = preview_page(df, halaman - 1)
+        rows = page["rows"]
+        if format_nilai:
+            rows = format_value(rows, metrics_col)
+
+        st.dataframe(rows, use_container_width=True)
+
+        mulai = (halaman - 1) * PREVIEW_ROWS
+        st.caption(
+            f"Baris {mulai + 1:,}–{mulai + len(rows):,} dari {page['total']:,}"
+        )
+
+
+# ===============================
+# SATU GRAFIK + TABEL (FRAGMENT)
+# ===============================
+# Interaksi di dalam seksi (buka tabel, download) hanya me-rerun
+# seksi ini, bukan seluruh halaman.
+@st.fragment
+def tampil_seksi(spec, df_agg, metode="lttb"):
     import plotly.express as px
-    import re
-    
+
+    st.subheader(f"📈 {spec['judul']}")
+
+    # Seri panjang (mingguan / harian) diringkas sebelum dikirim ke browser;
+    # di atas GEARING_WEBGL_POINTS titik trace dirender WebGL (Scattergl)
+    df_plot, n_asli = downsample(df_agg, spec["y"], metode=metode)
+    webgl = len(df_plot) > webgl_points()
+
+    if webgl:
+        fig = px.line(
+            df_plot,
+            x="Periode_Label",
+            y=spec["y"],
+            render_mode="webgl"
+        )
+        if spec["grafik"] == "area":
+            fig.update_traces(fill="tozeroy")
+    else:
+        plot = px.area if spec["grafik"] == "area" else px.line
+        fig = plot(
+            df_plot,
+            x="Periode_Label",
+            y=spec["y"],
+            markers=True
+        )
+
+    fig.update_layout(
+        xaxis_title="Periode",
+        yaxis_title=spec["y_title"],
+        yaxis=dict(ticksuffix=spec["suffix"]),
+        hovermode="x unified"
+    )
+
+    fig.update_xaxes(
+        type="category",
+        categoryorder="array",
+        categoryarray=df_plot["Periode_Label"].tolist(),
+        tickangle=-45
+    )
+
+    plotly_chart(fig, use_container_width=True)
+
+    if len(df_plot) < n_asli:
+        st.caption(
+            f"Menampilkan {len(df_plot):,} dari {n_asli:,} titik "
+            f"({METODE_LABEL[metode]}{', WebGL' if webgl else ''})"
+        )
+
+    # Tabel (Styler) hanya dibangun saat expander dibuka,
+    # CSV baru dibuat saat tombol download diklik
+    tabel = st.expander(
+        f"📋 {spec['tabel']}",
+        expanded=False,
+        key=f"tabel_{spec['seri']}",
+        on_change="rerun"
+    )
+    with tabel:
+        if tabel.open:
+            st.dataframe(
+                df_agg.style.format(spec["format"]),
+                use_container_width=True
+            )
+
+            st.download_button(
+                f"⬇️ {spec['download']}",
+                lambda: df_agg.to_csv(index=False).encode("utf-8"),
+                spec["file"],
+                "text/csv"
+            )
+
+
+def bagian_1_proyeksi():
     # ===============================
     # HEADER DENGAN LOGO
     # ===============================
     col_logo, col_title = st.columns([1, 8])
     
     with col_logo:
-        st.image("gambar/OIP.jpg", width=90)
+        st.image(aset("OIP.jpg"), width=90)
     
     with col_title:
         st.markdown(
@@ -34,7 +386,7 @@ def bagian_1_proyeksi():
     st.info("Website ini akan otomatis menampilkan dashboard untuk perhitungan Trend Gearing Ratio setelah anda mengupload file dengan format xlxs atau csv, dan pastikan format tabel yang akan diinput sesuai dengan contoh")
     # Tampilkan gambar contoh format Excel
     st.image(
-        "gambar/ssXlsx.png",
+        aset("ssXlsx.png"),
         caption="Contoh format file Excel (.xlsx) yang didukung",
         use_container_width=True
     )
@@ -50,727 +402,673 @@ def bagian_1_proyeksi():
     )
     
     if uploaded_file is None:
+        lepas_upload()
         st.info("Silakan upload file terlebih dahulu")
         st.stop()
     
     # ===============================
     # LOAD DATA
     # ===============================
-    @st.cache_data
+    # Cache memori lintas sesi (DATASETS) di atas cache Parquet di disk,
+    # keduanya dikunci hash isi file: analis yang mengupload file yang sama
+    # memakai satu dataset & index, dan upload bersamaan hanya diparse sekali.
     def load_data(file):
-        if file.name.endswith(".csv"):
-            return pd.read_csv(file)
-        return pd.read_excel(file)
-    
-    df = load_data(uploaded_file)
-    
-    # ===============================
-    # VALIDASI KOLOM
-    # ===============================
-    required_cols = ["Periode", "Value"]
-    for col in required_cols:
-        if col not in df.columns:
-            st.error(f"❌ Kolom '{col}' tidak ditemukan")
-            st.stop()
-    
-    # ===============================
-    # SIMPAN PERIODE ASLI
-    # ===============================
-    df["Periode_Raw"] = df["Periode"].astype(str)
+        digest = digest_upload(file)
+
+        def parse(progress=None):
+            df = cached_gearing_frame(file, digest=digest, progress=progress)
+            return df, PeriodIndex(df)
+
+        df, idx = muat_dataset((digest, "gearing"), "Membaca file...", parse)
+        return df, idx, digest
     
     # ===============================
-    # PARSING PERIODE
+    # VALIDASI KOLOM & PARSING
     # ===============================
-    bulan_map = {
-        "jan": 1, "feb": 2, "mar": 3, "apr": 4,
-        "may": 5, "mei": 5, "jun": 6, "jul": 7,
-        "aug": 8, "agu": 8, "sep": 9,
-        "oct": 10, "okt": 10,
-        "nov": 11, "dec": 12
-    }
-    
-    def parse_periode(val):
-        try:
-            dt = pd.to_datetime(val)
-            return dt.year, dt.month
-        except:
-            pass
-    
-        text = str(val).lower()
-        for b, m in bulan_map.items():
-            if b in text:
-                year_match = re.search(r"(20\d{2}|\d{2})", text)
-                if year_match:
-                    y = int(year_match.group())
-                    if y < 100:
-                        y += 2000
-                    return y, m
-        return None, None
-    
-    df[["Year", "Month"]] = df["Periode_Raw"].apply(
-        lambda x: pd.Series(parse_periode(x))
-    )
-    
-    df = df.dropna(subset=["Year", "Month"])
-    df["SortKey"] = df["Year"] * 100 + df["Month"]
+    # Periode -> Year/Month/SortKey/Periode_Label, flag audited, Value numerik
+    try:
+        with stage("load"):
+            df, idx, digest = load_data(uploaded_file)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        st.stop()
     
     # ===============================
-    # LABEL BULAN
+    # RIWAYAT LOKAL (INCREMENTAL)
     # ===============================
-    bulan_id = {
-        1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr",
-        5: "Mei", 6: "Jun", 7: "Jul", 8: "Agu",
-        9: "Sep", 10: "Okt", 11: "Nov", 12: "Des"
-    }
-    
-    df["Periode_Label"] = (
-        df["Month"].map(bulan_id) + " " + df["Year"].astype(int).astype(str)
+    # Upload bulanan di-upsert ke SQLite per (periode, Jenis); dashboard lalu
+    # memakai seluruh riwayat, dan pivot hanya dihitung ulang untuk periode
+    # yang berubah.
+    pakai_store = st.sidebar.toggle(
+        "💾 Gabung ke riwayat lokal",
+        help="Simpan upload ke riwayat SQLite (GEARING_STORE_PATH) sehingga "
+             "cukup upload periode baru setiap bulan"
     )
     
-    # ===============================
-    # FLAG AUDITED (PRIORITAS)
-    # ===============================
-    df["Is_Audited"] = df["Periode_Raw"].str.contains(
-        "audit", case=False, na=False
-    ).astype(int)
-    
-    # ===============================
-    # CLEAN VALUE (AMAN FORMAT INDONESIA)
-    # ===============================
-    def parse_value(val):
-        if pd.isna(val):
-            return None
-        if isinstance(val, (int, float)):
-            return float(val)
-    
-        text = str(val).strip()
-    
-        # format Indonesia: 516.859.837.493,95
-        if "." in text and "," in text:
-            text = text.replace(".", "").replace(",", ".")
-        elif "." in text and "," not in text:
-            text = text.replace(".", "")
+    if pakai_store:
+        store = get_store()
+        if not store.has_ingested(digest):
+            changed = store.upsert(df, digest)
+            st.sidebar.success(f"{len(changed)} periode baru / berubah")
     
-        try:
-            return float(text)
-        except:
-            return None
-    
-    df["Value"] = df["Value"].apply(parse_value)
+        df, idx, digest = load_store(store.version)
+        st.sidebar.caption(
+            "Riwayat: {periods} periode dari {uploads} upload".format(
+                **store.stats()
+            )
+        )
     
     # ===============================
     # SIDEBAR FILTER
     # ===============================
     st.sidebar.header("🔎 Filter Data")
     
-    df_f = df.copy()
-    
     # ===============================
     # FILTER TAHUN
     # ===============================
-    available_years = sorted(df_f["Year"].unique())
+    # Index Tahun/Bulan dibangun sekali saat load; filter tidak menyalin
+    # maupun memetakan nama bulan per baris
+    available_years = idx.tahun
     selected_years = st.sidebar.multiselect(
         "Tahun",
         available_years,
         default=available_years
     )
     
-    df_f = df_f[df_f["Year"].isin(selected_years)]
-    
     # ===============================
     # FILTER BULAN
     # ===============================
-    df_f["Bulan_Nama"] = df_f["Month"].map(bulan_id)
-    
     selected_months = st.sidebar.multiselect(
         "Bulan",
         list(bulan_id.values()),
         default=list(bulan_id.values())
     )
     
-    df_f = df_f[df_f["Bulan_Nama"].isin(selected_months)]
+    with stage("filter"):
+        df_f = idx.apply(df, selected_years, selected_months)
+
+    # ===============================
+    # DOWNSAMPLING GRAFIK
+    # ===============================
+    metode = st.sidebar.selectbox(
+        "Downsampling grafik",
+        list(METODE_LABEL),
+        format_func=METODE_LABEL.get,
+        help="Seri di atas GEARING_MAX_POINTS titik diringkas sebelum diplot"
+    )
     
     # ===============================
     # PREVIEW DATA (MENTAH - TANPA AGREGASI)
     # ===============================
-    with st.expander("👀 Preview Data (Klik untuk tampil / sembunyi)", expanded=False):
+    tampil_preview(
+        df_f,
+        "👀 Preview Data (Klik untuk tampil / sembunyi)",
+        key="preview_gearing"
+    )
     
-        st.dataframe(
-            df_f.style.format({"Value": "Rp {:,.2f}"}),
-            use_container_width=True
-        )
     
+    # ===============================
+    # PIVOT SortKey x Jenis (AUDITED PRIORITY)
+    # ===============================
+    # Satu kali dedup + pivot, semua series di bawah diturunkan dari sini.
+    # Dimemo per (dataset, filter): rerun tanpa perubahan filter tidak
+    # menyentuh pandas sama sekali.
+    with stage("pivot"):
+        seri = AGG_CACHE.get_or_compute(
+            ("gearing", digest,
+             selection_key(selected_years), selection_key(selected_months)),
+            lambda: gearing_series(
+                store.pivot(selected_years, selected_months) if pakai_store
+                else build_pivot(df_f)
+            )
+        )
     
     # ===============================
-    # AGREGASI KHUSUS KUR (AUDITED PRIORITY)
+    # TAB PER GRAFIK (LAZY)
+    # ===============================
+    # Hanya tab yang sedang dibuka yang membangun figure & tabelnya;
+    # pindah tab = rerun ringan karena seri sudah dimemo.
+    tabs = st.tabs(
+        [s["judul"] for s in SEKSI_GEARING],
+        key="tab_gearing",
+        on_change="rerun"
+    )
+
+    for tab, spec in zip(tabs, SEKSI_GEARING):
+        with tab:
+            if tab.open:
+                with stage("grafik", sheet=spec["judul"]):
+                    tampil_seksi(spec, seri[spec["seri"]], metode)
+
+    # ===============================
+    # STATUS CACHE
     # ===============================
-    st.subheader("📈 OS Penjaminan KUR")
+    cache_caption()
     
-    df_kur = df_f[df_f["Jenis"].isin(["KUR Gen 1", "KUR Gen 2"])]
+     # ===============================
+    # FOOTER
+    # ===============================
+    st.markdown("---")
     
-    # Urutkan: audited diutamakan
-    df_kur_sorted = df_kur.sort_values(
-        ["SortKey", "Is_Audited"],
-        ascending=[True, False]
+    st.markdown(
+        """
+        <div style="text-align:center; color:gray; font-size:13px;">
+            © 2026 | PT. Askrindo<br>
+            by @Rehanda Umamil Hadi & @Rani Rahmawati<br>
+            Developed with ❤️ using <b>Streamlit</b> & <b>Plotly</b>
+        </div>
+        """,
+        unsafe_allow_html=True
     )
-    
-    # Ambil audited jika ada, jika tidak ambil data biasa
-    df_kur_agg = (
-        df_kur_sorted
-        .groupby(["SortKey", "Periode_Label"], as_index=False)
-        .agg(OS_KUR_Rp=("Value", "last"))
-        .sort_values("SortKey")
+    #====================================================================================================================================================================
+
+
+# ===============================
+# BACKEND AGREGASI PENJAMINAN
+# ===============================
+@st.cache_resource
+def get_backend(nama):
+    return make_backend(nama)
+
+
+# ===============================
+# TOP-N + PAGING DIMENSI BESAR
+# ===============================
+def pilih_top_n(sheet, df_agg, key, label):
+    """
+    Kota / Bank / Jenis Kredit dengan banyak nilai: hanya Top-N (per halaman)
+    yang dikirim ke browser, semua nilai di luar halaman jadi satu bar
+    "Lainnya".
+    """
+    if len(df_agg) <= TOP_N_DEFAULT:
+        return df_agg
+
+    c1, c2 = st.columns(2)
+
+    with c1:
+        n = st.number_input(
+            f"🔝 Top N {label}",
+            min_value=5,
+            max_value=200,
+            value=TOP_N_DEFAULT,
+            step=5,
+            key=f"topn_{sheet}"
+        )
+
+    with c2:
+        halaman = st.selectbox(
+            "📄 Halaman",
+            range(-(-len(df_agg) // n)),
+            format_func=lambda h: (
+                f"Peringkat {h * n + 1:,}–{min((h + 1) * n, len(df_agg)):,}"
+            ),
+            key=f"hal_{sheet}"
+        )
+
+    view = AGG_CACHE.get_or_compute(
+        key + ("top_n", n, halaman), top_n_dimensi, df_agg, n, halaman
     )
-    
-    df_kur_agg["OS_KUR_T"] = df_kur_agg["OS_KUR_Rp"] / 1_000_000_000_000
-    
+
+    if view["sisa"]:
+        st.caption(
+            f"{view['total']:,} {label}; {view['sisa']:,} lainnya di luar "
+            f"halaman ini (peringkat di atas maupun di bawahnya) digabung "
+            f"menjadi bar \"{LAINNYA}\""
+        )
+
+    return view["rows"]
+
+
+# ===============================
+# SATU SHEET PENJAMINAN (FRAGMENT)
+# ===============================
+# Filter per sheet (per_/kp_/dim_/tenor) hanya me-rerun sheet itu sendiri;
+# sheet lain memakai hasil render sebelumnya.
+@st.fragment
+def tampil_sheet(sheet, df, dimensi_label, error, digest, mesin):
+    st.divider()
+    st.header(f"📘 by {sheet}")
+
+    # Sheet kosong / kolom < 5 / tanpa kolom Value
+    if error:
+        st.warning(error)
+        return
+
+    # ===============================
+    # PREVIEW DATA
+    # ===============================
+    # Value diformat per Metrics (Rupiah / jumlah debitur)
+    if "Metrics" in df.columns:
+        tampil_preview(
+            df, "👀 Preview Data", key=f"preview_{sheet}", metrics_col="Metrics"
+        )
+    else:
+        tampil_preview(df, "👀 Preview Data", key=f"preview_{sheet}",
+                       format_nilai=False)
+
     # ===============================
-    # GRAFIK
+    # FILTER (STRUKTURAL)
     # ===============================
-    fig = px.area(
-        df_kur_agg,
-        x="Periode_Label",
-        y="OS_KUR_T",
-        markers=True
+    # Nilai unik terurut dihitung sekali per (dataset, sheet), bukan per rerun
+    opsi = AGG_CACHE.get_or_compute(
+        ("sheet", digest, sheet, "opsi"), opsi_filter, df
     )
-    
-    fig.update_layout(
-        xaxis_title="Periode",
-        yaxis_title="Outstanding KUR (Triliun)",
-        yaxis=dict(ticksuffix=" T"),
-        hovermode="x unified"
+    c1, c2, c3 = st.columns(3)
+
+    with c1:
+        per = st.multiselect(
+            "📅 Periode",
+            opsi["Periode"],
+            default=opsi["Periode"],
+            key=f"per_{sheet}"
+        )
+
+    with c2:
+        kp = st.multiselect(
+            "🏦 KUR / PEN / KPP",
+            opsi["KUR/PEN/KPP"],
+            default=opsi["KUR/PEN/KPP"],
+            key=f"kp_{sheet}"
+        )
+
+    with c3:
+        dim = st.multiselect(
+            f"🏷️ {dimensi_label}",
+            opsi["Dimensi"],
+            default=opsi["Dimensi"],
+            key=f"dim_{sheet}"
+        )
+
+    # Filter + agregasi dijalankan backend (pandas / DuckDB) atas sheet
+    # terdaftar; semua hasil dimemo per (dataset, sheet, filter, backend)
+    nama = f"{digest}:{sheet}"
+    mesin.register(nama, df)
+    sel = (per, kp, dim)
+    key = (
+        "sheet", digest, sheet,
+        selection_key(per), selection_key(kp), selection_key(dim), mesin.name
     )
-    
-    fig.update_xaxes(
-        type="category",
-        categoryorder="array",
-        categoryarray=df_kur_agg["Periode_Label"].tolist(),
-        tickangle=-45
+    n_baris = AGG_CACHE.get_or_compute(
+        key + ("count",), mesin.count, nama, *sel
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
+
+    if n_baris == 0:
+        st.warning("Data kosong setelah filter")
+        return
+
+    # Plotly baru diimpor saat sheet benar-benar menggambar grafik
+    import plotly.express as px
+    import plotly.graph_objects as go
+#=============================================================================
     # ===============================
-    # TABEL HASIL OLAHAN
+    # KHUSUS SHEET PROYEKSI
+    # OS GROSS & OS NET + FILTER TENOR
     # ===============================
-    with st.expander("📋 Tabel Hasil Pengolahan OS Penjaminan KUR", expanded=False):
-    
-            st.dataframe(
-                df_kur_agg.style.format({
-                    "OS_KUR_Rp": "Rp {:,.2f}",
-                    "OS_KUR_T": "{:.2f}"
-                }),
-                use_container_width=True
-            )
-            
-            # ===============================
-            # DOWNLOAD
-            # ===============================
-            st.download_button(
-                "⬇️ Download Hasil OS KUR",
-                df_kur_agg.to_csv(index=False).encode("utf-8"),
-                "os_penjaminan_kur.csv",
-                "text/csv"
-            )
+    kind = sheet_kind(sheet)
     
-    #=============================================================================================================================
-    #========================================================================================================================================
-
- # ===============================
-    # AGREGASI KHUSUS KPP (AUDITED PRIORITY)
-    # ===============================
-    st.subheader("📈 OS Penjaminan KPP")
+    if kind == "proyeksi":
     
-    df_kpp = df_f[df_f["Jenis"].isin(["KPP Gen 1", "KPP Gen 2"])]
+        # ===============================
+        # AMBIL KOLOM TENOR (KOLOM KE-4)
+        # ===============================
+        TENOR_COL = df.columns[3]
     
-    # Urutkan: audited diutamakan
-    df_kpp_sorted = df_kpp.sort_values(
-        ["SortKey", "Is_Audited"],
-        ascending=[True, False]
-    )
+        # ===============================
+        # FILTER TENOR (UI)
+        # ===============================
+        tenor_list = AGG_CACHE.get_or_compute(
+            key + ("tenor_list",), mesin.distinct, nama, TENOR_COL, *sel
+        )
     
-    # Ambil audited jika ada, jika tidak ambil data biasa
-    df_kpp_agg = (
-        df_kpp_sorted
-        .groupby(["SortKey", "Periode_Label"], as_index=False)
-        .agg(OS_KPP_Rp=("Value", "last"))
-        .sort_values("SortKey")
-    )
+        selected_tenor = st.multiselect(
+            "⏳ Pilih Tenor",
+            tenor_list,
+            default=tenor_list,
+            key="tenor_proyeksi"
+        )
     
-    df_kpp_agg["OS_KPP_T"] = df_kpp_agg["OS_KPP_Rp"] / 1_000_000_000_000
+        proyeksi = AGG_CACHE.get_or_compute(
+            key + ("proyeksi", selection_key(selected_tenor)),
+            mesin.proyeksi_view, nama, TENOR_COL, selected_tenor, *sel
+        )
     
-    # ===============================
-    # GRAFIK
-    # ===============================
-    fig = px.area(
-        df_kpp_agg,
-        x="Periode_Label",
-        y="OS_KPP_T",
-        markers=True
-    )
+        if proyeksi["rows"] == 0:
+            st.warning("Data kosong setelah filter Tenor")
+            return
     
-    fig.update_layout(
-        xaxis_title="Periode",
-        yaxis_title="Outstanding KPP (Triliun)",
-        yaxis=dict(ticksuffix=" T"),
-        hovermode="x unified"
-    )
+        col_per = "Periode"
     
-    fig.update_xaxes(
-        type="category",
-        categoryorder="array",
-        categoryarray=df_kur_agg["Periode_Label"].tolist(),
-        tickangle=-45
-    )
+        # ===============================
+        # OS GROSS
+        # ===============================
+        # st.markdown("### 🔹 OS Gross")
     
-    st.plotly_chart(fig, use_container_width=True)
+        df_gross_agg = proyeksi["gross"]
     
-    # ===============================
-    # TABEL HASIL OLAHAN
-    # ===============================
-    with st.expander("📋 Tabel Hasil Pengolahan OS Penjaminan KPP", expanded=False):
+        if df_gross_agg.empty:
+            st.warning("Data OS Gross tidak tersedia")
+        else:
+            fig_gross = px.bar(
+                df_gross_agg,
+                x=col_per,
+                y="Total_Value",
+                text="Total_Value",
+                title="📊 Proyeksi OS Gross"
+            )
     
-            st.dataframe(
-                df_kpp_agg.style.format({
-                    "OS_KPP_Rp": "Rp {:,.2f}",
-                    "OS_KPP_T": "{:.2f}"
-                }),
-                use_container_width=True
+            fig_gross.update_traces(
+                texttemplate="%{text:,.0f}",
+                textposition="outside"
             )
-            
-            # ===============================
-            # DOWNLOAD
-            # ===============================
-            st.download_button(
-                "⬇️ Download Hasil OS KPP",
-                df_kpp_agg.to_csv(index=False).encode("utf-8"),
-                "os_penjaminan_kpp.csv",
-                "text/csv"
+    
+            fig_gross.update_layout(
+                yaxis_title="Nilai (Rp)",
+                height=450
             )
     
-    #=============================================================================================================================
-    #========================================================================================================================================
+            plotly_chart(fig_gross, use_container_width=True)
     
+        # ===============================
+        # OS NETT
+        # ===============================
+        # st.markdown("### 🔹 OS Nett")
     
-    # ===============================
-    # AGREGASI KHUSUS KUR (AUDITED PRIORITY)
-    # ===============================
-    st.subheader("📈 Ekuitas KUR")
+        df_net_agg = proyeksi["nett"]
     
-    df_kur = df_f[df_f["Jenis"].isin(["Ekuitas KUR"])]
+        if df_net_agg.empty:
+            st.warning("Data OS Nett tidak tersedia")
+        else:
+            fig_net = px.bar(
+                df_net_agg,
+                x=col_per,
+                y="Total_Value",
+                text="Total_Value",
+                title="📊 Proyeksi OS Nett"
+            )
     
-    # Urutkan: audited diutamakan
-    df_kur_sorted = df_kur.sort_values(
-        ["SortKey", "Is_Audited"],
-        ascending=[True, False]
-    )
+            fig_net.update_traces(
+                texttemplate="%{text:,.0f}",
+                textposition="outside"
+            )
     
-    # Ambil audited jika ada, jika tidak ambil data biasa
-    df_kur_agg = (
-        df_kur_sorted
-        .groupby(["SortKey", "Periode_Label"], as_index=False)
-        .agg(Ekuitas_KUR_Rp=("Value", "last"))
-        .sort_values("SortKey")
-    )
+            fig_net.update_layout(
+                yaxis_title="Nilai (Rp)",
+                height=450
+            )
     
-    df_kur_agg["Ekuitas_KUR_T"] = df_kur_agg["Ekuitas_KUR_Rp"] / 1_000_000_000_000
+            plotly_chart(fig_net, use_container_width=True)
     
+        return  # ⬅️ PENTING
+
     # ===============================
-    # GRAFIK
+    # KHUSUS SHEET TENOR
+    # PLOT VALUE vs TENOR
     # ===============================
-    fig = px.area(
-        df_kur_agg,
-        x="Periode_Label",
-        y="Ekuitas_KUR_T",
-        markers=True
-    )
+    if kind == "tenor":
+        # Tenor numerik & urut
+        df_tenor_agg = AGG_CACHE.get_or_compute(
+            key + ("dimensi",), mesin.agg_dimensi, nama, kind, *sel
+        )
     
-    fig.update_layout(
-        xaxis_title="Periode",
-        yaxis_title="Ekuitas KUR (Triliun)",
-        yaxis=dict(ticksuffix=" T"),
-        hovermode="x unified"
-    )
-    
-    fig.update_xaxes(
-        type="category",
-        categoryorder="array",
-        categoryarray=df_kur_agg["Periode_Label"].tolist(),
-        tickangle=-45
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # ===============================
-    # TABEL HASIL OLAHAN
-    # ===============================
-    with st.expander("📋 Tabel Hasil Pengolahan Ekuitas KUR", expanded=False):
-    
-            st.dataframe(
-                df_kur_agg.style.format({
-                    "Ekuitas_KUR_Rp": "Rp {:,.2f}",
-                    "Ekuitas_KUR_T": "{:.2f}"
-                }),
-                use_container_width=True
-            )
-            
-            # ===============================
-            # DOWNLOAD
-            # ===============================
-            st.download_button(
-                "⬇️ Download Hasil Ekuitas KUR",
-                df_kur_agg.to_csv(index=False).encode("utf-8"),
-                "Ekuitas_kur.csv",
-                "text/csv"
-            )
-    
-    #============================================================================================================================================
-    #==============================================================================================================================================
-    
-    # ===============================
-    # AGREGASI KHUSUS KUR (AUDITED PRIORITY)
-    # ===============================
-    st.subheader("📈 OS Penjaminan KUR Dan PEN")
-    
-    df_kur = df_f[df_f["Jenis"].isin(["KUR Gen 1", "KUR Gen 2","PEN Gen 1", "PEN Gen 2"])]
-    
-    # Urutkan: audited diutamakan
-    df_kur_sorted = df_kur.sort_values(
-        ["SortKey", "Is_Audited"],
-        ascending=[True, False]
-    )
+        fig_tenor = px.bar(
+            df_tenor_agg,
+            x="Dimensi",
+            y="Total_Value",
+            text="Total_Value",
+            labels={
+                "Dimensi": "Tenor (Tahun)",
+                "Total_Value": "Nilai"
+            }
+        )
     
-    # Ambil audited jika ada, jika tidak ambil data biasa
-    df_kur_agg = (
-        df_kur_sorted
-        .groupby(["SortKey", "Periode_Label"], as_index=False)
-        .agg(OS_KUR_PEN_Rp =("Value", "last"))
-        .sort_values("SortKey")
-    )
+        fig_tenor.update_traces(
+            texttemplate="%{text:,.2f}",
+            textposition="outside"
+        )
     
-    df_kur_agg["OS_KUR_PEN_T"] = df_kur_agg["OS_KUR_PEN_Rp"] / 1_000_000_000_000
+        fig_tenor.update_layout(
+            xaxis=dict(
+                tickmode="linear",
+                tick0=1,
+                dtick=1
+            ),
+            yaxis_title="Nilai (Rupiah)",
+            title="📊 Total Nilai per Tenor",
+            height=450
+        )
     
+        plotly_chart(fig_tenor, use_container_width=True)
+
+    #-------------------------------------------------------------------------------------------
     # ===============================
-    # GRAFIK
+    # KHUSUS SHEET JENIS POLIS
+    # PLOT VALUE vs JENIS POLIS
     # ===============================
-    fig = px.area(
-        df_kur_agg,
-        x="Periode_Label",
-        y="OS_KUR_PEN_T",
-        markers=True
-    )
+    if kind == "jenis polis":
+        # Agregasi per Jenis Polis (SPR, NEW, dll)
+        df_polis_agg = AGG_CACHE.get_or_compute(
+            key + ("dimensi",), mesin.agg_dimensi, nama, kind, *sel
+        )
     
-    fig.update_layout(
-        xaxis_title="Periode",
-        yaxis_title="Outstanding KUR_PEN (Triliun)",
-        yaxis=dict(ticksuffix=" T"),
-        hovermode="x unified"
-    )
+        fig_polis = px.bar(
+            df_polis_agg,
+            x="Dimensi",
+            y="Total_Value",
+            text="Total_Value",
+            labels={
+                "Dimensi": "Jenis Polis",
+                "Total_Value": "Nilai"
+            }
+        )
     
-    fig.update_xaxes(
-        type="category",
-        categoryorder="array",
-        categoryarray=df_kur_agg["Periode_Label"].tolist(),
-        tickangle=-45
-    )
+        fig_polis.update_traces(
+            texttemplate="%{text:,.2f}",
+            textposition="outside"
+        )
     
-    st.plotly_chart(fig, use_container_width=True)
+        fig_polis.update_layout(
+            xaxis_title="Jenis Polis",
+            yaxis_title="Nilai (Rupiah)",
+            title="📊 Total Nilai berdasarkan Jenis Polis",
+            height=450
+        )
     
+        plotly_chart(fig_polis, use_container_width=True)
+
     # ===============================
-    # TABEL HASIL OLAHAN
+    # KHUSUS SHEET JENIS KREDIT (KUR)
+    # PLOT VALUE vs JENIS KREDIT
     # ===============================
-    with st.expander("📋 Tabel Hasil Pengolahan OS Penjaminan KUR & PEN", expanded=False):
+    if kind == "jenis kredit":
+        # Agregasi per Jenis Kredit
+        df_kredit_agg = AGG_CACHE.get_or_compute(
+            key + ("dimensi",), mesin.agg_dimensi, nama, kind, *sel
+        )
     
-            st.dataframe(
-                df_kur_agg.style.format({
-                    "OS_KUR_PEN_Rp": "Rp {:,.2f}",
-                    "OS_KUR_PEN_T": "{:.2f}"
-                }),
-                use_container_width=True
+        if df_kredit_agg.empty:
+            st.warning("Data Jenis Kredit kosong setelah filter")
+        else:
+            df_kredit_plot = pilih_top_n(sheet, df_kredit_agg, key, "Jenis Kredit")
+
+            fig_kredit = px.bar(
+                df_kredit_plot,
+                x="Dimensi",
+                y="Total_Value",
+                text="Total_Value",
+                labels={
+                    "Dimensi": "Jenis Kredit (KUR)",
+                    "Total_Value": "Nilai"
+                }
             )
-            
-            # ===============================
-            # DOWNLOAD
-            # ===============================
-            st.download_button(
-                "⬇️ Download Hasil OS KUR_PEN",
-                df_kur_agg.to_csv(index=False).encode("utf-8"),
-                "os_penjaminan_kur_pen.csv",
-                "text/csv"
+    
+            fig_kredit.update_traces(
+                texttemplate="%{text:,.2f}",
+                textposition="outside"
             )
     
-    #================================================================================================================================================
-    #===================================================================================================================================================
+            fig_kredit.update_layout(
+                xaxis_title="Jenis Kredit (KUR)",
+                yaxis_title="Nilai (Rupiah)",
+                title="📊 Total Nilai berdasarkan Jenis Kredit KUR",
+                height=450
+            )
     
+            plotly_chart(fig_kredit, use_container_width=True)
+
     # ===============================
-    # AGREGASI KUR UNTUK Gearing Ratio
+    # KHUSUS SHEET BANK
+    # PLOT VALUE vs BANK
     # ===============================
-    st.subheader("📈 Gearing Ratio KUR")
-    
-    # Ambil KUR Gen 1 + KUR Gen 2 untuk numerator
-    df_kur_num = df_f[df_f["Jenis"].isin(["KUR Gen 1", "KUR Gen 2"])]
-    
-    # Jumlahkan Value per Periode_Label (numerator)
-    df_kur_num_agg = (
-        df_kur_num.groupby(["Periode_Label"], as_index=False)
-        .agg(KUR_Total_Rp=("Value", "sum"))
-    )
+    if kind == "bank":
+        # Agregasi per Bank
+        df_bank_agg = AGG_CACHE.get_or_compute(
+            key + ("dimensi",), mesin.agg_dimensi, nama, kind, *sel
+        )
     
-    # Ambil Ekuitas KUR (asumsi ada di df_f, misal Jenis == "Ekuitas KUR")
-    df_ekuitas = df_f[df_f["Jenis"] == "Ekuitas KUR"]
+        if df_bank_agg.empty:
+            st.warning("Data Bank kosong setelah filter")
+        else:
+            df_bank_plot = pilih_top_n(sheet, df_bank_agg, key, "Bank")
+
+            fig_bank = px.bar(
+                df_bank_plot,
+                x="Dimensi",
+                y="Total_Value",
+                text="Total_Value",
+                labels={
+                    "Dimensi": "Bank",
+                    "Total_Value": "Nilai"
+                }
+            )
     
-    # Gabungkan numerator dan ekuitas berdasarkan Periode_Label
-    df_gear = pd.merge(
-        df_kur_num_agg,
-        df_ekuitas[["Periode_Label", "Value"]].rename(columns={"Value": "Ekuitas_Rp"}),
-        on="Periode_Label",
-        how="left"
-    )
+            fig_bank.update_traces(
+                texttemplate="%{text:,.2f}",
+                textposition="outside"
+            )
     
-    # Hitung Gearing Ratio
-    df_gear["Gearing_Ratio"] = df_gear["KUR_Total_Rp"] / df_gear["Ekuitas_Rp"]
+            fig_bank.update_layout(
+                xaxis_title="Bank",
+                yaxis_title="Nilai (Rupiah)",
+                title="📊 Total Nilai berdasarkan BANK",
+                height=450
+            )
     
+            plotly_chart(fig_bank, use_container_width=True) 
+
     # ===============================
-    # GRAFIK Gearing Ratio
+    # KHUSUS SHEET KOTA
+    # PLOT VALUE vs KOTA
     # ===============================
-    fig = px.line(
-        df_gear,
-        x="Periode_Label",
-        y="Gearing_Ratio",
-        markers=True
-    )
-    
-    fig.update_layout(
-        xaxis_title="Periode",
-        yaxis_title="Gearing Ratio KUR",
-        yaxis=dict(ticksuffix="x"),  # misal ratio dikali 1
-        hovermode="x unified"
-    )
-    
-    fig.update_xaxes(
-        type="category",
-        categoryorder="array",
-        categoryarray=df_gear["Periode_Label"].tolist(),
-        tickangle=-45
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    if kind == "kota":
+        # Agregasi per Kota (Dimensi kosong / "nan" dibuang)
+        df_kota_agg = AGG_CACHE.get_or_compute(
+            key + ("dimensi",), mesin.agg_dimensi, nama, kind, *sel
+        )
     
-    # ===============================
-    # TABEL HASIL
-    # ===============================
-    with st.expander("📋 Tabel Gearing Ratio KUR", expanded=False):
+        if df_kota_agg.empty:
+            st.warning("⚠️ Data Kota kosong setelah filter")
+        else:
+            df_kota_plot = pilih_top_n(sheet, df_kota_agg, key, "Kota")
+
+            fig_kota = px.bar(
+                df_kota_plot,
+                x="Dimensi",
+                y="Total_Value",
+                text="Total_Value",
+                labels={
+                    "Dimensi": "Kota",
+                    "Total_Value": "Nilai"
+                }
+            )
     
-            st.dataframe(
-                df_gear.style.format({
-                    "KUR_Total_Rp": "Rp {:,.2f}",
-                    "Ekuitas_Rp": "Rp {:,.2f}",
-                    "Gearing_Ratio": "{:.2f}"
-                }),
-                use_container_width=True
+            fig_kota.update_traces(
+                texttemplate="%{text:,.2f}",
+                textposition="outside"
             )
-            
-            # ===============================
-            # DOWNLOAD
-            # ===============================
-            st.download_button(
-                "⬇️ Download Hasil Gearing Ratio KUR",
-                df_gear.to_csv(index=False).encode("utf-8"),
-                "gearing_ratio_kur.csv",
-                "text/csv"
+    
+            fig_kota.update_layout(
+                xaxis_title="Kota",
+                yaxis_title="Nilai (Rupiah)",
+                title="📊 Total Nilai berdasarkan Kota",
+                height=500
             )
     
-    #================================================================================================================================================
-    #===================================================================================================================================================
+            plotly_chart(fig_kota, use_container_width=True)
 
- # ===============================
-    # AGREGASI KPP UNTUK Gearing Ratio
-    # ===============================
-    st.subheader("📈 Gearing Ratio KPP")
-    
-    # Ambil KPP Gen 1 + KUR Gen 2 untuk numerator
-    df_kpp_num = df_f[df_f["Jenis"].isin(["KPP Gen 1", "KPP Gen 2"])]
-    
-    # Jumlahkan Value per Periode_Label (numerator)
-    df_kpp_num_agg = (
-        df_kpp_num.groupby(["Periode_Label"], as_index=False)
-        .agg(KPP_Total_Rp=("Value", "sum"))
-    )
-    
-    # Ambil Ekuitas KPP (asumsi ada di df_f, misal Jenis == "Ekuitas KPP")
-    df_ekuitas = df_f[df_f["Jenis"] == "Ekuitas KPP"]
-    
-    # Gabungkan numerator dan ekuitas berdasarkan Periode_Label
-    df_gear = pd.merge(
-        df_kpp_num_agg,
-        df_ekuitas[["Periode_Label", "Value"]].rename(columns={"Value": "Ekuitas_Rp"}),
-        on="Periode_Label",
-        how="left"
-    )
-    
-    # Hitung Gearing Ratio
-    df_gear["Gearing_Ratio"] = df_gear["KPP_Total_Rp"] / df_gear["Ekuitas_Rp"]
     
+
     # ===============================
-    # GRAFIK Gearing Ratio
+    # AGREGASI METRICS
     # ===============================
-    fig = px.line(
-        df_gear,
-        x="Periode_Label",
-        y="Gearing_Ratio",
-        markers=True
+    # Total per Metrics + pemisahan Finansial / Debitur (dual axis)
+    df_agg = AGG_CACHE.get_or_compute(
+        key + ("metrics",), mesin.agg_metrics, nama, *sel
     )
-    
-    fig.update_layout(
-        xaxis_title="Periode",
-        yaxis_title="Gearing Ratio KPP",
-        yaxis=dict(ticksuffix="x"),  # misal ratio dikali 1
-        hovermode="x unified"
-    )
-    
-    fig.update_xaxes(
-        type="category",
-        categoryorder="array",
-        categoryarray=df_gear["Periode_Label"].tolist(),
-        tickangle=-45
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
+
     # ===============================
-    # TABEL HASIL
+    # GRAFIK BATANG (TRILIUN)
     # ===============================
-    with st.expander("📋 Tabel Gearing Ratio KPP", expanded=False):
-    
-            st.dataframe(
-                df_gear.style.format({
-                    "KPP_Total_Rp": "Rp {:,.2f}",
-                    "Ekuitas_Rp": "Rp {:,.2f}",
-                    "Gearing_Ratio": "{:.2f}"
-                }),
-                use_container_width=True
-            )
-            
-            # ===============================
-            # DOWNLOAD
-            # ===============================
-            st.download_button(
-                "⬇️ Download Hasil Gearing Ratio KPP",
-                df_gear.to_csv(index=False).encode("utf-8"),
-                "gearing_ratio_kpp.csv",
-                "text/csv"
-            )
-    
-    #================================================================================================================================================
-    #===================================================================================================================================================
-    
-    
-    # ===========================================
-    # AGREGASI KUR UNTUK Gearing Ratio KUR & PEN
-    # ===========================================
-    st.subheader("📈 Gearing Ratio KUR & PEN")
-    
-    # Ambil KUR Gen 1 + KUR Gen 2 untuk numerator
-    df_kur_num = df_f[df_f["Jenis"].isin(["KUR Gen 1", "KUR Gen 2", "PEN Gen 1", "PEN Gen 2"])]
-    
-    # Jumlahkan Value per Periode_Label (numerator)
-    df_kur_num_agg = (
-        df_kur_num.groupby(["Periode_Label"], as_index=False)
-        .agg(KUR_PEN_Total_Rp=("Value", "sum"))
-    )
-    
-    # Ambil Ekuitas KUR (asumsi ada di df_f, misal Jenis == "Ekuitas KUR")
-    df_ekuitas = df_f[df_f["Jenis"] == "Ekuitas KUR"]
-    
-    # Gabungkan numerator dan ekuitas berdasarkan Periode_Label
-    df_gear = pd.merge(
-        df_kur_num_agg,
-        df_ekuitas[["Periode_Label", "Value"]].rename(columns={"Value": "Ekuitas_Rp"}),
-        on="Periode_Label",
-        how="left"
+    fig = px.bar(
+        df_agg,
+        x="Metrics",
+        y="Total_T",
+        text="Total_T",
+        title=f"📊 Summary Metrics berdasarkan {dimensi_label}"
     )
-    
-    # Hitung Gearing Ratio
-    df_gear["GR_KUR_PEN"] = df_gear["KUR_PEN_Total_Rp"] / df_gear["Ekuitas_Rp"]
-    
-    # ===============================
-    # GRAFIK GEaring Ratio
-    # ===============================
-    fig = px.line(
-        df_gear,
-        x="Periode_Label",
-        y="GR_KUR_PEN",
-        markers=True
+
+    fig.update_traces(
+        texttemplate="%{text:,.2f} T",
+        textposition="outside"
     )
-    
+
     fig.update_layout(
-        xaxis_title="Periode",
-        yaxis_title="Gearing Ratio KUR dan PEN",
-        yaxis=dict(ticksuffix="x"),  # misal ratio dikali 1
-        hovermode="x unified"
+        yaxis_title="Nilai Finansial (Triliun)",
+        xaxis_title="Metrics"
     )
-    
-    fig.update_xaxes(
-        type="category",
-        categoryorder="array",
-        categoryarray=df_gear["Periode_Label"].tolist(),
-        tickangle=-45
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
+
+    plotly_chart(fig, use_container_width=True)
+
     # ===============================
-    # TABEL HASIL
+    # GRAFIK DUAL AXIS (FOKUS DEBITUR)
     # ===============================
-    with st.expander("📋 Tabel Gearing Ratio KUR dan PEN", expanded=False):
-    
-            st.dataframe(
-                df_gear.style.format({
-                    "KUR_PEN_Total_Rp": "Rp {:,.2f}",
-                    "Ekuitas_Rp": "Rp {:,.2f}",
-                    "GR_KUR_PEN": "{:.2f}"
-                }),
-                use_container_width=True
-            )
-            
-            # ===============================
-            # DOWNLOAD
-            # ===============================
-            st.download_button(
-                "⬇️ Download Hasil Gearing Ratio KUR dan PEN",
-                df_gear.to_csv(index=False).encode("utf-8"),
-                "gearing_ratio_kurpen.csv",
-                "text/csv"
-            )
-    
-     # ===============================
-    # FOOTER
-    # ===============================
-    st.markdown("---")
-    
-    st.markdown(
-        """
-        <div style="text-align:center; color:gray; font-size:13px;">
-            © 2026 | PT. Askrindo<br>
-            by @Rehanda Umamil Hadi & @Rani Rahmawati<br>
-            Developed with ❤️ using <b>Streamlit</b> & <b>Plotly</b>
-        </div>
-        """,
-        unsafe_allow_html=True
+    fig2 = go.Figure()
+
+    fig2.add_bar(
+        x=df_agg["Metrics"],
+        y=df_agg["Value_T"],
+        name="Nilai Finansial (Triliun)",
+        yaxis="y"
     )
-    #====================================================================================================================================================================
+
+    fig2.add_bar(
+        x=df_agg["Metrics"],
+        y=df_agg["Value_Debitur"],
+        name="Jumlah Debitur",
+        yaxis="y2"
+    )
+
+    fig2.update_layout(
+        title=f"📊 Metrics vs Jumlah Debitur berdasarkan {dimensi_label}",
+        barmode="group",
+        yaxis=dict(title="Triliun Rupiah"),
+        yaxis2=dict(
+            title="Jumlah Debitur",
+            overlaying="y",
+            side="right"
+        )
+    )
+
+    plotly_chart(fig2, use_container_width=True)
 
 
 def bagian_2_penjaminan():
-    import plotly.express as px
-    import plotly.graph_objects as go
     # ===============================
     # HEADER DENGAN LOGO
     # ===============================
     col_logo, col_title = st.columns([1, 8])
     
     with col_logo:
-        st.image("gambar/OIP.jpg", width=90)
+        st.image(aset("OIP.jpg"), width=90)
     
     with col_title:
         st.markdown(
@@ -787,7 +1085,7 @@ def bagian_2_penjaminan():
     
     st.info("Website ini akan otomatis menampilkan dashboard untuk perhitungan Outstanding Penjamin setelah anda mengupload file dengan format xlxs atau csv, dan pastikan format tabel yang akan diinput sesuai dengan contoh")
     st.image(
-        "gambar/xlsxPic2.png",
+        aset("xlsxPic2.png"),
         caption="Contoh format file Excel (.xlsx) yang didukung",
         use_container_width=True
     )
@@ -803,583 +1101,51 @@ def bagian_2_penjaminan():
     )
     
     if uploaded_file is None:
+        lepas_upload()
         st.info("Silakan upload file terlebih dahulu")
         st.stop()
     
     # ===============================
-    # GET SHEET NAMES
+    # LOAD DATA
     # ===============================
-    if uploaded_file.name.endswith(".xlsx"):
-        sheet_names = pd.ExcelFile(uploaded_file).sheet_names
-    else:
-        sheet_names = ["CSV"]
+    # Semua sheet dipetakan & diparse sekali, disimpan di cache Parquet (hash isi file).
+    # DATASETS: dipakai bersama lintas sesi, upload bersamaan diparse sekali.
+    def load_data(file):
+        digest = digest_upload(file)
+        sheets = muat_dataset(
+            (digest, "sheets"), "Membaca workbook...", cached_sheets, file,
+            digest=digest
+        )
+        return sheets, digest
     
-    # Skip sheet Proyeksi
-    #sheet_names = [s for s in sheet_names if s.lower() != "proyeksi"]
+    with stage("load"):
+        sheets, digest = load_data(uploaded_file)
     
     # ===============================
-    # LOAD DATA
+    # BACKEND AGREGASI
     # ===============================
-    @st.cache_data(show_spinner=False)
-    def load_data(file, sheet=None):
-        if file.name.endswith(".csv"):
-            return pd.read_csv(file)
-        return pd.read_excel(file, sheet_name=sheet)
+    # DuckDB (opsional) untuk sheet besar; default dari GEARING_BACKEND
+    pilihan = available_backends()
+    backend = st.sidebar.selectbox(
+        "⚙️ Mesin agregasi",
+        pilihan,
+        index=pilihan.index(default_backend()),
+        disabled=len(pilihan) == 1,
+        help="Pasang paket duckdb untuk mengaktifkan backend DuckDB"
+    )
+    mesin = get_backend(backend)
     
     # ===============================
-    # PARSE VALUE (FORMAT INDONESIA)
+    # LOOP PER SHEET
     # ===============================
-    def parse_value(val):
-        if pd.isna(val):
-            return None
-        if isinstance(val, (int, float)):
-            return float(val)
-    
-        text = str(val).strip()
-        if "." in text and "," in text:
-            text = text.replace(".", "").replace(",", ".")
-        elif "." in text:
-            text = text.replace(".", "")
-    
-        try:
-            return float(text)
-        except:
-            return None
+    for sheet, df, dimensi_label, error in sheets:
+        with stage("sheet", sheet=sheet):
+            tampil_sheet(sheet, df, dimensi_label, error, digest, mesin)
     
     # ===============================
-    # LOOP PER SHEET
+    # STATUS CACHE
     # ===============================
-    for sheet in sheet_names:
-    
-        st.divider()
-        st.header(f"📘 by {sheet}")
-    
-        df_raw = load_data(uploaded_file, sheet if sheet != "CSV" else None)
-    
-        if df_raw.empty:
-            st.warning("Sheet kosong")
-            continue
-    
-        # ===============================
-        # VALIDASI STRUKTUR MINIMAL
-        # ===============================
-        cols = list(df_raw.columns)
-    
-        if len(cols) < 5:
-            st.warning("Struktur kolom tidak memenuhi standar → dilewati")
-            continue
-    
-        # ===============================
-        # MAPPING BERDASARKAN POSISI KOLOM
-        # ===============================
-        COL_PERIODE = cols[0]
-        COL_KURPENKPP = cols[1]
-        COL_DIMENSI = cols[2]   # <<< KUNCI UTAMA
-        COL_METRICS = "Metrics"
-        COL_VALUE = "Value"
-    
-        dimensi_label = COL_DIMENSI  # Untuk UI
-    
-        df = df_raw.rename(columns={
-            COL_PERIODE: "Periode",
-            COL_KURPENKPP: "KUR/PEN/KPP",
-            COL_DIMENSI: "Dimensi"
-        })
-    
-        # ===============================
-        # CLEAN VALUE
-        # ===============================
-        if "Value" in df.columns:
-            df["Value"] = df["Value"].apply(parse_value)
-        else:
-            st.warning("Kolom Value tidak ditemukan")
-            continue
-    
-        # ===============================
-        # PREVIEW DATA
-        # ===============================
-        with st.expander("👀 Preview Data", expanded=False):
-            df_prev = df.copy()
-    
-            if "Metrics" in df_prev.columns:
-                def fmt(row):
-                    if "debitur" in str(row["Metrics"]).lower():
-                        return f"{row['Value']:,.0f}" if pd.notna(row["Value"]) else ""
-                    return f"Rp {row['Value']:,.2f}" if pd.notna(row["Value"]) else ""
-    
-                df_prev["Value"] = df_prev.apply(fmt, axis=1)
-    
-            st.dataframe(df_prev, use_container_width=True)
-    
-        # ===============================
-        # FILTER (STRUKTURAL)
-        # ===============================
-        c1, c2, c3 = st.columns(3)
-    
-        with c1:
-            per = st.multiselect(
-                "📅 Periode",
-                sorted(df["Periode"].dropna().unique()),
-                default=sorted(df["Periode"].dropna().unique()),
-                key=f"per_{sheet}"
-            )
-    
-        with c2:
-            kp = st.multiselect(
-                "🏦 KUR / PEN / KPP",
-                sorted(df["KUR/PEN/KPP"].dropna().unique()),
-                default=sorted(df["KUR/PEN/KPP"].dropna().unique()),
-                key=f"kp_{sheet}"
-            )
-    
-        with c3:
-            dim = st.multiselect(
-                f"🏷️ {dimensi_label}",
-                sorted(df["Dimensi"].dropna().unique()),
-                default=sorted(df["Dimensi"].dropna().unique()),
-                key=f"dim_{sheet}"
-            )
-    
-        df_f = df[
-            df["Periode"].isin(per) &
-            df["KUR/PEN/KPP"].isin(kp) &
-            df["Dimensi"].isin(dim)
-        ]
-    
-        if df_f.empty:
-            st.warning("Data kosong setelah filter")
-            continue
-    #=============================================================================
-        # ===============================
-        # KHUSUS SHEET PROYEKSI
-        # OS GROSS & OS NET + FILTER TENOR
-        # ===============================
-        if sheet.lower() == "proyeksi":
-        
-            # ===============================
-            # AMBIL KOLOM TENOR (KOLOM KE-4)
-            # ===============================
-            TENOR_COL = df_raw.columns[3]
-            df_f["Tenor"] = df_raw[TENOR_COL]
-        
-            # ===============================
-            # FILTER TENOR (UI)
-            # ===============================
-            tenor_list = sorted(df_f["Tenor"].dropna().unique())
-        
-            selected_tenor = st.multiselect(
-                "⏳ Pilih Tenor",
-                tenor_list,
-                default=tenor_list,
-                key="tenor_proyeksi"
-            )
-        
-            df_f = df_f[df_f["Tenor"].isin(selected_tenor)]
-        
-            if df_f.empty:
-                st.warning("Data kosong setelah filter Tenor")
-                continue
-        
-            col_dim = "Dimensi"
-            col_per = "Periode"
-            col_val = "Value"
-        
-            # ===============================
-            # OS GROSS
-            # ===============================
-            # st.markdown("### 🔹 OS Gross")
-        
-            df_gross = df_f[
-                df_f[col_dim].str.lower() == "os gross"
-            ].dropna(subset=[col_val])
-        
-            if df_gross.empty:
-                st.warning("Data OS Gross tidak tersedia")
-            else:
-                df_gross_agg = (
-                    df_gross
-                    .groupby(col_per, as_index=False)
-                    .agg(Total_Value=(col_val, "sum"))
-                )
-        
-                fig_gross = px.bar(
-                    df_gross_agg,
-                    x=col_per,
-                    y="Total_Value",
-                    text="Total_Value",
-                    title="📊 Proyeksi OS Gross"
-                )
-        
-                fig_gross.update_traces(
-                    texttemplate="%{text:,.0f}",
-                    textposition="outside"
-                )
-        
-                fig_gross.update_layout(
-                    yaxis_title="Nilai (Rp)",
-                    height=450
-                )
-        
-                st.plotly_chart(fig_gross, use_container_width=True)
-        
-            # ===============================
-            # OS NETT
-            # ===============================
-            # st.markdown("### 🔹 OS Nett")
-        
-            df_net = df_f[
-                df_f[col_dim].str.lower() == "os nett"
-            ].dropna(subset=[col_val])
-        
-            if df_net.empty:
-                st.warning("Data OS Nett tidak tersedia")
-            else:
-                df_net_agg = (
-                    df_net
-                    .groupby(col_per, as_index=False)
-                    .agg(Total_Value=(col_val, "sum"))
-                )
-        
-                fig_net = px.bar(
-                    df_net_agg,
-                    x=col_per,
-                    y="Total_Value",
-                    text="Total_Value",
-                    title="📊 Proyeksi OS Nett"
-                )
-        
-                fig_net.update_traces(
-                    texttemplate="%{text:,.0f}",
-                    textposition="outside"
-                )
-        
-                fig_net.update_layout(
-                    yaxis_title="Nilai (Rp)",
-                    height=450
-                )
-        
-                st.plotly_chart(fig_net, use_container_width=True)
-        
-            continue  # ⬅️ PENTING
-    
-        # ===============================
-        # KHUSUS SHEET TENOR
-        # PLOT VALUE vs TENOR
-        # ===============================
-        if sheet.lower() == "tenor":   
-            # Pastikan tenor numerik & urut
-            df_tenor = df_f.copy()
-            df_tenor["Dimensi"] = pd.to_numeric(df_tenor["Dimensi"], errors="coerce")
-        
-            df_tenor = df_tenor.dropna(subset=["Dimensi", "Value"])
-        
-            # Agregasi per tenor
-            df_tenor_agg = (
-                df_tenor
-                .groupby("Dimensi", as_index=False)
-                .agg(Total_Value=("Value", "sum"))
-                .sort_values("Dimensi")
-            )
-        
-            fig_tenor = px.bar(
-                df_tenor_agg,
-                x="Dimensi",
-                y="Total_Value",
-                text="Total_Value",
-                labels={
-                    "Dimensi": "Tenor (Tahun)",
-                    "Total_Value": "Nilai"
-                }
-            )
-        
-            fig_tenor.update_traces(
-                texttemplate="%{text:,.2f}",
-                textposition="outside"
-            )
-        
-            fig_tenor.update_layout(
-                xaxis=dict(
-                    tickmode="linear",
-                    tick0=1,
-                    dtick=1
-                ),
-                yaxis_title="Nilai (Rupiah)",
-                title="📊 Total Nilai per Tenor",
-                height=450
-            )
-        
-            st.plotly_chart(fig_tenor, use_container_width=True)
-    
-        #-------------------------------------------------------------------------------------------
-        # ===============================
-        # KHUSUS SHEET JENIS POLIS
-        # PLOT VALUE vs JENIS POLIS
-        # ===============================
-        if sheet.lower() == "jenis polis":    
-            df_polis = df_f.copy()
-            # Pastikan data valid
-            df_polis = df_polis.dropna(subset=["Dimensi", "Value"])
-            # Agregasi per Jenis Polis (SPR, NEW, dll)
-            df_polis_agg = (
-                df_polis
-                .groupby("Dimensi", as_index=False)
-                .agg(Total_Value=("Value", "sum"))
-                .sort_values("Dimensi")
-            )
-        
-            fig_polis = px.bar(
-                df_polis_agg,
-                x="Dimensi",
-                y="Total_Value",
-                text="Total_Value",
-                labels={
-                    "Dimensi": "Jenis Polis",
-                    "Total_Value": "Nilai"
-                }
-            )
-        
-            fig_polis.update_traces(
-                texttemplate="%{text:,.2f}",
-                textposition="outside"
-            )
-        
-            fig_polis.update_layout(
-                xaxis_title="Jenis Polis",
-                yaxis_title="Nilai (Rupiah)",
-                title="📊 Total Nilai berdasarkan Jenis Polis",
-                height=450
-            )
-        
-            st.plotly_chart(fig_polis, use_container_width=True)
-    
-        # ===============================
-        # KHUSUS SHEET JENIS KREDIT (KUR)
-        # PLOT VALUE vs JENIS KREDIT
-        # ===============================
-        if "jenis kredit" in sheet.lower():    
-            df_kredit = df_f.copy()
-        
-            # Pastikan data valid
-            df_kredit = df_kredit.dropna(subset=["Dimensi", "Value"])
-        
-            if df_kredit.empty:
-                st.warning("Data Jenis Kredit kosong setelah filter")
-            else:
-                # Agregasi per Jenis Kredit
-                df_kredit_agg = (
-                    df_kredit
-                    .groupby("Dimensi", as_index=False)
-                    .agg(Total_Value=("Value", "sum"))
-                    .sort_values("Dimensi")
-                )
-        
-                fig_kredit = px.bar(
-                    df_kredit_agg,
-                    x="Dimensi",
-                    y="Total_Value",
-                    text="Total_Value",
-                    labels={
-                        "Dimensi": "Jenis Kredit (KUR)",
-                        "Total_Value": "Nilai"
-                    }
-                )
-        
-                fig_kredit.update_traces(
-                    texttemplate="%{text:,.2f}",
-                    textposition="outside"
-                )
-        
-                fig_kredit.update_layout(
-                    xaxis_title="Jenis Kredit (KUR)",
-                    yaxis_title="Nilai (Rupiah)",
-                    title="📊 Total Nilai berdasarkan Jenis Kredit KUR",
-                    height=450
-                )
-        
-                st.plotly_chart(fig_kredit, use_container_width=True)
-    
-        # ===============================
-        # KHUSUS SHEET BANK
-        # PLOT VALUE vs BANK
-        # ===============================
-        if "bank" in sheet.lower():    
-            df_bank = df_f.copy()
-        
-            # Pastikan data valid
-            df_bank = df_bank.dropna(subset=["Dimensi", "Value"])
-        
-            if df_bank.empty:
-                st.warning("Data Jenis Kredit kosong setelah filter")
-            else:
-                # Agregasi per Jenis Kredit
-                df_bank_agg = (
-                    df_bank
-                    .groupby("Dimensi", as_index=False)
-                    .agg(Total_Value=("Value", "sum"))
-                    .sort_values("Dimensi")
-                )
-        
-                fig_bank = px.bar(
-                    df_bank_agg,
-                    x="Dimensi",
-                    y="Total_Value",
-                    text="Total_Value",
-                    labels={
-                        "Dimensi": "Bank",
-                        "Total_Value": "Nilai"
-                    }
-                )
-        
-                fig_bank.update_traces(
-                    texttemplate="%{text:,.2f}",
-                    textposition="outside"
-                )
-        
-                fig_bank.update_layout(
-                    xaxis_title="Bank",
-                    yaxis_title="Nilai (Rupiah)",
-                    title="📊 Total Nilai berdasarkan BANK",
-                    height=450
-                )
-        
-                st.plotly_chart(fig_bank, use_container_width=True) 
-    
-        # ===============================
-        # KHUSUS SHEET KOTA
-        # PLOT VALUE vs KOTA
-        # ===============================
-        sheet_norm = sheet.lower().strip()
-        
-        if "kota" in sheet_norm:    
-            df_kota = df_f.copy()
-        
-            # Bersihkan kolom Dimensi (Kota)
-            df_kota["Dimensi"] = df_kota["Dimensi"].astype(str).str.strip()
-        
-            df_kota = df_kota[
-                (df_kota["Dimensi"] != "") &
-                (df_kota["Dimensi"].str.lower() != "nan")
-            ]
-        
-            df_kota = df_kota.dropna(subset=["Value"])
-        
-            if df_kota.empty:
-                st.warning("⚠️ Data Kota kosong setelah filter")
-            else:
-                # Agregasi per Kota
-                df_kota_agg = (
-                    df_kota
-                    .groupby("Dimensi", as_index=False)
-                    .agg(Total_Value=("Value", "sum"))
-                    .sort_values("Total_Value", ascending=False)
-                )
-        
-                fig_kota = px.bar(
-                    df_kota_agg,
-                    x="Dimensi",
-                    y="Total_Value",
-                    text="Total_Value",
-                    labels={
-                        "Dimensi": "Kota",
-                        "Total_Value": "Nilai"
-                    }
-                )
-        
-                fig_kota.update_traces(
-                    texttemplate="%{text:,.2f}",
-                    textposition="outside"
-                )
-        
-                fig_kota.update_layout(
-                    xaxis_title="Kota",
-                    yaxis_title="Nilai (Rupiah)",
-                    title="📊 Total Nilai berdasarkan Kota",
-                    height=500
-                )
-        
-                st.plotly_chart(fig_kota, use_container_width=True)
-    
-        
-    
-        # ===============================
-        # AGREGASI METRICS
-        # ===============================
-        df_agg = (
-            df_f.groupby("Metrics", as_index=False)
-            .agg(Total_Value=("Value", "sum"))
-        )
-    
-        df_agg["Total_T"] = df_agg["Total_Value"] / 1_000_000_000_000
-    
-        # ===============================
-        # GRAFIK BATANG (TRILIUN)
-        # ===============================
-        fig = px.bar(
-            df_agg,
-            x="Metrics",
-            y="Total_T",
-            text="Total_T",
-            title=f"📊 Summary Metrics berdasarkan {dimensi_label}"
-        )
-    
-        fig.update_traces(
-            texttemplate="%{text:,.2f} T",
-            textposition="outside"
-        )
-    
-        fig.update_layout(
-            yaxis_title="Nilai Finansial (Triliun)",
-            xaxis_title="Metrics"
-        )
-    
-        st.plotly_chart(fig, use_container_width=True)
-    
-        # ===============================
-        # GRAFIK DUAL AXIS (FOKUS DEBITUR)
-        # ===============================
-        df_agg["Jenis"] = df_agg["Metrics"].apply(
-            lambda x: "Debitur" if "debitur" in str(x).lower() else "Finansial"
-        )
-    
-        df_agg["Value_T"] = df_agg.apply(
-            lambda r: r["Total_T"] if r["Jenis"] == "Finansial" else None,
-            axis=1
-        )
-    
-        df_agg["Value_Debitur"] = df_agg.apply(
-            lambda r: r["Total_Value"] if r["Jenis"] == "Debitur" else None,
-            axis=1
-        )
-    
-        fig2 = go.Figure()
-    
-        fig2.add_bar(
-            x=df_agg["Metrics"],
-            y=df_agg["Value_T"],
-            name="Nilai Finansial (Triliun)",
-            yaxis="y"
-        )
-    
-        fig2.add_bar(
-            x=df_agg["Metrics"],
-            y=df_agg["Value_Debitur"],
-            name="Jumlah Debitur",
-            yaxis="y2"
-        )
-    
-        fig2.update_layout(
-            title=f"📊 Metrics vs Jumlah Debitur berdasarkan {dimensi_label}",
-            barmode="group",
-            yaxis=dict(title="Triliun Rupiah"),
-            yaxis2=dict(
-                title="Jumlah Debitur",
-                overlaying="y",
-                side="right"
-            )
-        )
-    
-        st.plotly_chart(fig2, use_container_width=True)
-    
+    cache_caption()
     
     #==========================================================================================================================
     # ===============================
@@ -1398,11 +1164,6 @@ def bagian_2_penjaminan():
         unsafe_allow_html=True
     )
 
-st.set_page_config(
-    page_title="Dashboard Gearing Ratio & Penjaminan",
-    layout="wide"
-)
-
 st.sidebar.title("📌 Menu")
 
 menu = st.sidebar.radio(
@@ -1413,11 +1174,18 @@ menu = st.sidebar.radio(
     ]
 )
 
-if menu == "📈 Gearing Ratio":
-    bagian_1_proyeksi()
+# Mode profil: setiap tahap run ini dicatat lalu ditampilkan di sidebar
+prof = Profiler() if profiling_enabled(st.query_params) else None
+
+with prof.aktif() if prof else nullcontext():
+    if menu == "📈 Gearing Ratio":
+        bagian_1_proyeksi()
+
+    elif menu == "📊 Outstanding Penjaminan":
+        bagian_2_penjaminan()
 
-elif menu == "📊 Outstanding Penjaminan":
-    bagian_2_penjaminan()
+if prof:
+    tampil_profil(prof, menu)
 
 # menu = st.radio(
 #     "📌 Pilih Perhitungan",
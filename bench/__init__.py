@@ -0,0 +1 @@
+"""Benchmark & generator data sintetis (lihat bench/suite.py)."""
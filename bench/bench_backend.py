@@ -0,0 +1,134 @@
+"""
+Backend agregasi penjaminan: pandas vs cube vs DuckDB per ukuran sheet.
+
+Satu "render" = count + agg_dimensi + agg_metrics dengan filter sebagian
+Periode / KUR-PEN-KPP / Dimensi, seperti satu sheet di dashboard.
+Hasil setiap backend dibandingkan dengan pandas sebelum diukur; waktu
+build cube (sekali per sheet) dilaporkan terpisah.
+
+    python bench/bench_backend.py --rows 10000 100000 1000000 5000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_memory import buat_penjaminan  # noqa: E402
+from gearing.backend import (  # noqa: E402
+    HAS_DUCKDB,
+    CubeBackend,
+    DuckBackend,
+    PandasBackend,
+)
+from gearing.dtypes import compact_frame  # noqa: E402
+from gearing.penjaminan import prepare_sheet  # noqa: E402
+
+
+def render(mesin, nama, sel):
+    mesin.count(nama, *sel)
+    dim = mesin.agg_dimensi(nama, "kota", *sel)
+    met = mesin.agg_metrics(nama, *sel)
+    return dim, met
+
+
+def _teks(df):
+    return df.reset_index(drop=True).astype(
+        {c: str for c in df.columns if not pd.api.types.is_float_dtype(df[c])}
+    )
+
+
+def cek_sama(a, b):
+    for x, y in zip(a, b):
+        pd.testing.assert_frame_equal(
+            _teks(x), _teks(y), check_dtype=False, rtol=1e-12
+        )
+
+
+def ukur(fn, ulang):
+    fn()  # pemanasan
+    t = []
+    for _ in range(ulang):
+        t0 = time.perf_counter()
+        fn()
+        t.append(time.perf_counter() - t0)
+    return min(t)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--rows", type=int, nargs="+",
+        default=[10_000, 100_000, 1_000_000, 5_000_000]
+    )
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    duck = DuckBackend() if HAS_DUCKDB else None
+    print(
+        f"{'baris':>12} {'pandas (ms)':>12} {'cube (ms)':>10} "
+        f"{'build (ms)':>11} {'duckdb (ms)':>12}"
+    )
+
+    crossover = None
+    for n in args.rows:
+        df, _ = prepare_sheet(buat_penjaminan(n))
+        df = compact_frame(df)
+
+        rng = np.random.default_rng(n)
+        kota = sorted(df["Dimensi"].unique())
+        sel = (
+            ["2024-01", "2024-02"],
+            ["KUR", "PEN"],
+            list(rng.choice(kota, len(kota) // 2, replace=False)),
+        )
+
+        pandas = PandasBackend()
+        cube = CubeBackend()
+        nama = f"bench-{n}"
+        pandas.register(nama, df)
+
+        t0 = time.perf_counter()
+        cube.register(nama, df)
+        tb = time.perf_counter() - t0
+
+        acuan = render(pandas, nama, sel)
+        cek_sama(acuan, render(cube, nama, sel))
+
+        # Cache filter PandasBackend dikosongkan: ukur render dari awal
+        def jalan_pandas():
+            pandas._terakhir = (None, None)
+            render(pandas, nama, sel)
+
+        tp = ukur(jalan_pandas, args.repeat)
+        tc = ukur(lambda: render(cube, nama, sel), args.repeat)
+
+        td = None
+        if duck is not None:
+            duck.register(nama, df)
+            cek_sama(acuan, render(duck, nama, sel))
+            td = ukur(lambda: render(duck, nama, sel), args.repeat)
+            if crossover is None and td < tp:
+                crossover = n
+
+        kolom_duck = f"{td * 1e3:>12.1f}" if td is not None else f"{'-':>12}"
+        print(
+            f"{n:>12,} {tp * 1e3:>12.1f} {tc * 1e3:>10.2f} "
+            f"{tb * 1e3:>11.1f} {kolom_duck}"
+        )
+
+    if duck is None:
+        print("\nduckdb tidak terpasang: kolom DuckDB dilewati")
+    else:
+        print(
+            f"\nDuckDB lebih cepat dari pandas mulai ~{crossover:,} baris"
+            if crossover else
+            "\nDuckDB tidak lebih cepat dari pandas pada ukuran yang diuji"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Engine xlsx pada workbook sintetis: waktu baca seluruh workbook per engine
+(calamine jika terpasang, openpyxl), dan hasil parse kedua dashboard
+(prepare_gearing_frame / prepare_sheet) harus identik byte per byte dengan
+openpyxl. Keluar dengan kode 1 jika ada hasil yang berbeda.
+
+    python bench/bench_excel.py --rows 1000 10000 100000 --out excel.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.generators import (  # noqa: E402
+    XLSX_MAX_ROWS,
+    gearing_frame,
+    penjaminan_workbook,
+    tulis_file,
+)
+from gearing.loader import available_excel_engines, load_workbook  # noqa: E402
+from gearing.penjaminan import prepare_sheet  # noqa: E402
+from gearing.ratio import prepare_gearing_frame  # noqa: E402
+
+
+def sidik(layout, sheets):
+    """SHA-256 hasil parse semua sheet (CSV + dtype), untuk banding antar engine."""
+    h = hashlib.sha256()
+    for sheet, raw in sheets.items():
+        if layout == "gearing":
+            df = prepare_gearing_frame(raw)
+        else:
+            try:
+                df, _ = prepare_sheet(raw)
+            except ValueError as e:
+                h.update(f"{sheet}:{e}".encode())
+                continue
+        h.update(sheet.encode())
+        h.update(str(df.dtypes.to_dict()).encode())
+        h.update(df.to_csv(index=False).encode())
+    return h.hexdigest()
+
+
+def ukur(path, engine, repeat):
+    waktu = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        sheets = load_workbook(path, engine)
+        waktu.append(time.perf_counter() - t0)
+    return min(waktu), sheets
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    ap.add_argument(
+        "--layout", nargs="+", choices=["gearing", "penjaminan"],
+        default=["gearing", "penjaminan"]
+    )
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="tulis hasil ke JSON")
+    args = ap.parse_args()
+
+    engines = available_excel_engines()
+    if "calamine" not in engines:
+        print("python-calamine tidak terpasang: hanya openpyxl yang diukur")
+
+    tmp = tempfile.mkdtemp(prefix="gearing-excel-")
+    generator = {"gearing": gearing_frame, "penjaminan": penjaminan_workbook}
+
+    hasil, beda = [], []
+    print(f"{'layout':<11} {'baris':>9} {'engine':<9} {'ms':>10} {'speedup':>8}  identik")
+    for layout in args.layout:
+        for n in args.rows:
+            if n > XLSX_MAX_ROWS:
+                print(f"{layout} {n:,}: melewati batas baris xlsx, dilewati")
+                continue
+            data = generator[layout](n, args.seed)
+            if layout == "gearing":
+                data = {"Sheet1": data}
+            path = tulis_file(data, os.path.join(tmp, f"{layout}-{n}.xlsx"))
+            del data
+
+            acuan = None
+            for engine in ["openpyxl"] + [e for e in engines if e != "openpyxl"]:
+                detik, sheets = ukur(path, engine, args.repeat)
+                sha = sidik(layout, sheets)
+                if acuan is None:
+                    acuan = (detik, sha)
+                identik = sha == acuan[1]
+                if not identik:
+                    beda.append(f"{layout} {n:,} {engine}")
+                hasil.append({
+                    "layout": layout, "rows": n, "engine": engine,
+                    "min_s": detik, "speedup": acuan[0] / detik,
+                    "sha256": sha, "identical": identik,
+                })
+                print(
+                    f"{layout:<11} {n:>9,} {engine:<9} {detik * 1e3:>10.1f} "
+                    f"{acuan[0] / detik:>7.1f}x  {'ya' if identik else 'TIDAK'}",
+                    flush=True,
+                )
+            os.remove(path)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"engines": engines, "results": hasil, "mismatch": beda},
+                      f, indent=2)
+
+    if beda:
+        sys.exit(f"hasil parse berbeda dari openpyxl: {', '.join(beda)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Laporan memori dataset sebelum & sesudah compact_frame.
+
+    python bench/bench_memory.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.bench_periode import buat_periode  # noqa: E402
+from gearing.dtypes import compact_frame, memory_report  # noqa: E402
+from gearing.penjaminan import prepare_sheet  # noqa: E402
+from gearing.ratio import SEMUA_JENIS, prepare_gearing_frame  # noqa: E402
+
+
+def buat_gearing(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Periode": buat_periode(n, seed).astype(object),
+        "Jenis": np.array(SEMUA_JENIS, dtype=object)[
+            rng.integers(0, len(SEMUA_JENIS), n)
+        ],
+        "Value": rng.uniform(1e9, 1e13, n),
+    })
+
+
+def buat_penjaminan(n, seed=0):
+    rng = np.random.default_rng(seed)
+    kota = np.array([f"Kota {i}" for i in range(500)], dtype=object)
+    return pd.DataFrame({
+        "Periode": np.array(["2024-01", "2024-02", "2024-03"], dtype=object)[
+            rng.integers(0, 3, n)
+        ],
+        "KUR/PEN/KPP": np.array(["KUR", "PEN", "KPP"], dtype=object)[
+            rng.integers(0, 3, n)
+        ],
+        "Kota": kota[rng.integers(0, len(kota), n)],
+        "Metrics": np.array(["OS Penjaminan", "Jumlah Debitur"], dtype=object)[
+            rng.integers(0, 2, n)
+        ],
+        "Value": rng.uniform(1e6, 1e12, n),
+    })
+
+
+def _sebagai_object(df):
+    teks = df.select_dtypes(exclude="number").columns
+    return df.astype({c: object for c in teks})
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    pd.set_option("display.width", 120)
+
+    # Kolom teks dipaksa object seperti dtype sebelum compact_frame
+    df = _sebagai_object(prepare_gearing_frame(buat_gearing(args.rows)))
+    print(f"== Gearing Ratio ({args.rows:,} baris)")
+    print(memory_report(df, compact_frame(df)).round(2))
+
+    sheet, _ = prepare_sheet(buat_penjaminan(args.rows))
+    sheet = _sebagai_object(sheet)
+    print(f"\n== Penjaminan ({args.rows:,} baris)")
+    print(memory_report(sheet, compact_frame(sheet)).round(2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark parsing Periode: versi lama (apply per baris) vs parse_periode_series.
+Versi lama memakai peta bulan baseline yang dibekukan di file ini; baris
+yang berbeda hanya karena tambahan "des" (Desember) dilaporkan terpisah.
+Keluar dengan kode 1 jika ada perbedaan lain.
+
+    python bench/bench_periode.py --rows 1000000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gearing.parsing import bulan_map, parse_periode_series  # noqa: E402
+
+
+# ===============================
+# IMPLEMENTASI LAMA (REFERENSI)
+# ===============================
+# Salinan peta bulan baseline (sebelum "des" ditambahkan di gearing.parsing)
+BULAN_MAP_LAMA = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4,
+    "may": 5, "mei": 5, "jun": 6, "jul": 7,
+    "aug": 8, "agu": 8, "sep": 9,
+    "oct": 10, "okt": 10,
+    "nov": 11, "dec": 12
+}
+
+# Singkatan bulan yang sengaja ditambahkan setelah baseline
+BULAN_BARU = [b for b in bulan_map if b not in BULAN_MAP_LAMA]
+
+
+def parse_periode_lama(val):
+    try:
+        dt = pd.to_datetime(val)
+        return dt.year, dt.month
+    except Exception:
+        pass
+
+    text = str(val).lower()
+    for b, m in BULAN_MAP_LAMA.items():
+        if b in text:
+            year_match = re.search(r"(20\d{2}|\d{2})", text)
+            if year_match:
+                y = int(year_match.group())
+                if y < 100:
+                    y += 2000
+                return y, m
+    return None, None
+
+
+def buat_periode(n, seed=0):
+    rng = np.random.default_rng(seed)
+    nama = list(bulan_map)
+    pool = []
+    for y in range(2015, 2026):
+        for m in range(1, 13):
+            pool.append(f"{y}-{m:02d}-28 00:00:00")
+            pool.append(f"{nama[m % len(nama)].title()} {y}")
+            pool.append(f"{nama[m % len(nama)].title()} {y} (Audited)")
+        # Bulan yang hanya dikenal versi baru (hasil beda disengaja)
+        pool += [f"{b.title()} {y}" for b in BULAN_BARU]
+    return pd.Series(np.array(pool, dtype=object)[rng.integers(0, len(pool), n)])
+
+
+def timeit(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--skip-lama", action="store_true",
+                    help="lewati versi lama (lambat untuk jutaan baris)")
+    args = ap.parse_args()
+
+    s = buat_periode(args.rows)
+
+    t_baru, baru = timeit(parse_periode_series, s)
+    print(f"parse_periode_series : {t_baru:8.3f} s  ({args.rows:,} baris)")
+
+    if args.skip_lama:
+        return
+
+    t_lama, lama = timeit(
+        lambda x: x.apply(lambda v: pd.Series(parse_periode_lama(v))), s
+    )
+    print(f"apply per baris      : {t_lama:8.3f} s")
+    print(f"speedup              : {t_lama / t_baru:8.1f}x")
+
+    lama.columns = ["Year", "Month"]
+    a = lama.astype("float64").to_numpy()
+    b = baru.to_numpy()
+    beda = ~np.isclose(a, b, equal_nan=True).all(axis=1)
+
+    # Beda yang disengaja: baseline tidak mengenal bulan baru (mis. "des")
+    low = s.astype(str).str.lower()
+    bulan_baru = low.str.contains("|".join(BULAN_BARU)) if BULAN_BARU else False
+    disengaja = beda & np.asarray(bulan_baru) & np.isnan(a).any(axis=1)
+    lain = beda & ~disengaja
+    print(f"beda karena {'/'.join(BULAN_BARU) or '-':<9}: {disengaja.sum():,} baris")
+    print(f"beda lain            : {lain.sum():,} baris")
+    print(f"hasil identik        : {not lain.any()} (di luar bulan baru)")
+    if lain.any():
+        sys.exit(f"contoh beda: {s[lain].unique()[:5].tolist()}")
+
+
+if __name__ == "__main__":
+    main()
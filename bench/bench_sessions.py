@@ -0,0 +1,90 @@
+"""
+RSS & jumlah parse saat N sesi mengupload workbook yang sama bersamaan.
+
+Mode "bersama" memakai jalur load New.py (DATASETS.get_or_load di atas
+cached_sheets); mode "per-sesi" mem-parse sendiri-sendiri seperti tanpa
+cache lintas sesi. Setiap (mode, N) dijalankan di interpreter baru.
+
+    python bench/bench_sessions.py --rows 200000 --sessions 1 4 16 32
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.generators import penjaminan_workbook, tulis_file  # noqa: E402
+
+KODE = """
+import io, json, os, resource, threading, time
+from gearing.cache import cached_sheets, file_digest
+from gearing.datasets import DATASETS
+
+isi = open(PATH, "rb").read()
+siap = threading.Barrier(N)
+hasil = [None] * N
+
+def sesi(i):
+    file = io.BytesIO(isi)
+    file.name = os.path.basename(PATH)
+    digest = file_digest(file)
+    siap.wait()
+    if MODE == "bersama":
+        hasil[i] = DATASETS.get_or_load(
+            (digest, "sheets"), cached_sheets, file, digest=digest
+        )
+    else:
+        hasil[i] = cached_sheets(file, digest=digest)
+
+t0 = time.perf_counter()
+threads = [threading.Thread(target=sesi, args=(i,)) for i in range(N)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+print(json.dumps({
+    "detik": time.perf_counter() - t0,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "parse": DATASETS.misses if MODE == "bersama" else N,
+}))
+"""
+
+
+def jalankan(mode, n, path, env):
+    prelude = f"MODE = {mode!r}\nN = {n}\nPATH = {path!r}\n"
+    out = subprocess.run(
+        [sys.executable, "-c", prelude + KODE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16, 32])
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="gearing-sessions-")
+    path = tulis_file(
+        penjaminan_workbook(args.rows), os.path.join(tmp, "workbook.csv")
+    )
+    # Tanpa cache Parquet agar setiap parse benar-benar membaca file
+    env = dict(os.environ, PYTHONPATH=ROOT, GEARING_CACHE_MAX_MB="0")
+
+    print(f"{'mode':<9} {'sesi':>5} {'parse':>6} {'detik':>7} {'RSS (MB)':>9}")
+    for mode in ("bersama", "per-sesi"):
+        for n in args.sessions:
+            r = jalankan(mode, n, path, env)
+            print(
+                f"{mode:<9} {n:>5} {r['parse']:>6} {r['detik']:>7.2f} "
+                f"{r['rss_mb']:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Waktu import & first paint dashboard, masing-masing di interpreter baru.
+
+- import_ms      : import streamlit + modul gearing yang dipakai New.py
+- first_paint_ms : run pertama New.py lewat AppTest (halaman awal, belum upload)
+- rerun_ms       : rerun berikutnya (overhead statis per interaksi)
+- first_chart_ms : upload workbook kecil sampai grafik pertama tampil
+
+Juga dicek bahwa modul berat (plotly.express, matplotlib, duckdb) belum diimpor
+sebelum ada grafik. Keluar dengan kode 1 jika melewati budget.
+
+    python bench/bench_startup.py --repeat 5 --out startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.generators import gearing_frame, tulis_file  # noqa: E402
+
+# Budget default (ms) untuk mesin 1 CPU; sesuaikan lewat argumen
+BUDGET = {
+    "import_ms": 1500,
+    "first_paint_ms": 1500,
+    "rerun_ms": 300,
+    "first_chart_ms": 3000,
+}
+
+# Streamlit sendiri mengimpor paket plotly (ringan, lazy); yang mahal
+# adalah plotly.express
+MODUL_BERAT = ["plotly.express", "matplotlib", "duckdb"]
+
+KODE_IMPORT = """
+import json, sys, time
+t0 = time.perf_counter()
+import streamlit
+import gearing.backend, gearing.cache, gearing.downsample, gearing.filters
+import gearing.ingest, gearing.memo, gearing.parsing, gearing.penjaminan
+import gearing.preview, gearing.profiling, gearing.ratio, gearing.store
+ms = (time.perf_counter() - t0) * 1e3
+print(json.dumps({
+    "import_ms": ms,
+    "loaded": [m for m in MODUL_BERAT if m in sys.modules],
+}))
+"""
+
+KODE_APP = """
+import json, sys, time
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+set_log_level("error")
+
+at = AppTest.from_file(APP, default_timeout=120)
+t0 = time.perf_counter()
+at.run()
+first = (time.perf_counter() - t0) * 1e3
+loaded = [m for m in MODUL_BERAT if m in sys.modules]
+
+t0 = time.perf_counter()
+at.run()
+rerun = (time.perf_counter() - t0) * 1e3
+
+with open(DATA, "rb") as f:
+    at.file_uploader[0].upload("gearing.xlsx", f.read())
+t0 = time.perf_counter()
+at.run()
+chart = (time.perf_counter() - t0) * 1e3
+
+print(json.dumps({
+    "first_paint_ms": first,
+    "rerun_ms": rerun,
+    "first_chart_ms": chart,
+    "loaded_before_chart": loaded,
+    "charts": len(at.get("plotly_chart")),
+    "errors": [e.message for e in at.exception],
+}))
+"""
+
+
+def jalankan(kode, env, **nilai):
+    prelude = "".join(f"{k} = {v!r}\n" for k, v in nilai.items())
+    out = subprocess.run(
+        [sys.executable, "-c", prelude + kode],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", help="tulis hasil ke JSON")
+    for nama, ms in BUDGET.items():
+        ap.add_argument(f"--budget-{nama.replace('_ms', '').replace('_', '-')}",
+                        type=float, default=ms, dest=nama,
+                        help=f"budget {nama} (default {ms})")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="gearing-startup-")
+    data = tulis_file({"Sheet1": gearing_frame(1000)},
+                      os.path.join(tmp, "gearing.xlsx"))
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        GEARING_CACHE_MAX_MB="0",
+        GEARING_STORE_PATH=os.path.join(tmp, "store.sqlite"),
+    )
+
+    imp, app = [], []
+    for _ in range(args.repeat):
+        imp.append(jalankan(KODE_IMPORT, env, MODUL_BERAT=MODUL_BERAT))
+        app.append(jalankan(
+            KODE_APP, env, MODUL_BERAT=MODUL_BERAT,
+            APP=os.path.join(ROOT, "New.py"), DATA=data,
+        ))
+
+    hasil = {
+        "import_ms": min(r["import_ms"] for r in imp),
+        "first_paint_ms": min(r["first_paint_ms"] for r in app),
+        "rerun_ms": min(r["rerun_ms"] for r in app),
+        "first_chart_ms": min(r["first_chart_ms"] for r in app),
+    }
+    berat = sorted(
+        {m for r in imp for m in r["loaded"]}
+        | {m for r in app for m in r["loaded_before_chart"]}
+    )
+    errors = sorted({e for r in app for e in r["errors"]})
+
+    gagal = []
+    for nama, ms in hasil.items():
+        budget = getattr(args, nama)
+        lewat = ms > budget
+        if lewat:
+            gagal.append(nama)
+        print(
+            f"{nama:<16} {ms:>9.1f} ms  (budget {budget:,.0f})"
+            f"{'  LEWAT' if lewat else ''}"
+        )
+
+    print(f"modul berat sebelum grafik: {', '.join(berat) or '-'}")
+    if berat:
+        gagal.append("lazy_import")
+    if errors:
+        print("exception:", *errors, sep="\n  ")
+        gagal.append("errors")
+    if min(r["charts"] for r in app) == 0:
+        print("upload tidak menghasilkan grafik")
+        gagal.append("charts")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "results": hasil,
+                "budget": {n: getattr(args, n) for n in BUDGET},
+                "heavy_before_chart": berat,
+                "errors": errors,
+                "failed": gagal,
+            }, f, indent=2)
+
+    if gagal:
+        sys.exit(f"startup melewati budget: {', '.join(gagal)}")
+
+
+if __name__ == "__main__":
+    main()
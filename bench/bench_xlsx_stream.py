@@ -0,0 +1,100 @@
+"""
+Puncak RSS parse satu sheet penjaminan xlsx besar: mode "penuh" (seluruh
+sheet dimuat ke pandas) lawan "stream" (openpyxl read_only per chunk,
+lihat gearing.streaming.iter_xlsx_chunks). Setiap (mode, ukuran) dijalankan
+di interpreter baru lewat jalur load dashboard (cached_sheets); kenaikan
+RSS mode stream seharusnya hampir konstan terhadap jumlah baris.
+
+    python bench/bench_xlsx_stream.py --rows 50000 200000 800000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.generators import penjaminan_sheet, tulis_file  # noqa: E402
+
+KODE = """
+import json, resource, time
+from gearing.cache import cached_sheets
+
+def rss_mb():
+    # VmHWM direset saat exec; ru_maxrss mewarisi puncak proses induk
+    try:
+        with open("/proc/self/status") as f:
+            for baris in f:
+                if baris.startswith("VmHWM:"):
+                    return int(baris.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+awal = rss_mb()
+t0 = time.perf_counter()
+sheets = cached_sheets(PATH)
+print(json.dumps({
+    "detik": time.perf_counter() - t0,
+    "rss_awal_mb": awal,
+    "rss_mb": rss_mb(),
+    "baris_hasil": sum(len(df) for _, df, _, _ in sheets if df is not None),
+    "error": [err for _, _, _, err in sheets if err],
+}))
+"""
+
+
+def jalankan(path, env):
+    out = subprocess.run(
+        [sys.executable, "-c", f"PATH = {path!r}\n" + KODE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[50_000, 200_000, 800_000])
+    ap.add_argument("--sheet", default="Kota",
+                    help="jenis sheet penjaminan yang dibuat (lihat generators)")
+    ap.add_argument("--out", help="tulis hasil ke JSON")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="gearing-xlsx-stream-")
+    # Tanpa cache Parquet; ambang GEARING_STREAM_XLSX_MB memilih mode
+    base = dict(os.environ, PYTHONPATH=ROOT, GEARING_CACHE_MAX_MB="0")
+    mode_env = {
+        "penuh": {"GEARING_STREAM_XLSX_MB": str(10 ** 9)},
+        "stream": {"GEARING_STREAM_XLSX_MB": "0"},
+    }
+
+    hasil = []
+    print(f"{'mode':<7} {'baris':>9} {'file MB':>8} {'detik':>7} "
+          f"{'RSS naik (MB)':>14}")
+    for n in args.rows:
+        path = tulis_file(
+            {args.sheet: penjaminan_sheet(args.sheet, n)},
+            os.path.join(tmp, f"sheet-{n}.xlsx"),
+        )
+        mb = os.path.getsize(path) / 1024 ** 2
+        for mode, env in mode_env.items():
+            r = jalankan(path, {**base, **env})
+            if r["error"]:
+                sys.exit(f"{mode} {n:,}: {r['error']}")
+            naik = r["rss_mb"] - r["rss_awal_mb"]
+            hasil.append({"mode": mode, "rows": n, "file_mb": mb, **r,
+                          "rss_naik_mb": naik})
+            print(f"{mode:<7} {n:>9,} {mb:>8.1f} {r['detik']:>7.2f} {naik:>14.0f}",
+                  flush=True)
+        os.remove(path)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"results": hasil}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Generator workbook sintetis untuk benchmark, mengikuti dua format input:
+
+- Gearing Ratio (gambar/ssXlsx.png): Jenis, Periode, Value (teks angka
+  Indonesia), Display Period, Periode Mod, termasuk baris "(Audited)".
+- Outstanding Penjaminan (gambar/xlsxPic2.png): satu sheet per dimensi
+  (GEN, Tenor, Issued Year, Jenis Polis, Jenis Kredit (KUR), Bank, Kota,
+  Proyeksi) dengan Periode, KUR/PEN, dimensi, Metrics & Value.
+
+Semua generator deterministik per (n, seed).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from gearing.parsing import bulan_id
+from gearing.ratio import SEMUA_JENIS
+
+# Batas baris per sheet Excel (tanpa header)
+XLSX_MAX_ROWS = 1_048_575
+
+BULAN_PANJANG = {
+    1: "Januari", 2: "Februari", 3: "Maret", 4: "April",
+    5: "Mei", 6: "Juni", 7: "Juli", 8: "Agustus",
+    9: "September", 10: "Oktober", 11: "November", 12: "Desember",
+}
+
+# Porsi baris per sheet penjaminan (Kota paling besar)
+PORSI_SHEET = {
+    "GEN": 0.05,
+    "Tenor": 0.10,
+    "Issued Year": 0.05,
+    "Jenis Polis": 0.05,
+    "Jenis Kredit (KUR)": 0.05,
+    "Bank": 0.15,
+    "Kota": 0.45,
+    "Proyeksi": 0.10,
+}
+
+
+def angka_id(nilai, desimal=2):
+    """Float -> teks angka Indonesia ("18.551.000.000.000,80")."""
+    teks = [f"{v:,.{desimal}f}" for v in nilai]
+    return np.array(
+        [t.replace(",", "_").replace(".", ",").replace("_", ".") for t in teks],
+        dtype=object,
+    )
+
+
+def _pool_angka(rng, low, high, desimal=2, ukuran=4096):
+    # Format teks mahal untuk jutaan baris: ambil dari pool nilai unik
+    return angka_id(rng.uniform(low, high, ukuran), desimal)
+
+
+def _pilih(rng, pool, n):
+    pool = np.asarray(pool, dtype=object)
+    return pool[rng.integers(0, len(pool), n)]
+
+
+# ===============================
+# FORMAT GEARING RATIO
+# ===============================
+def gearing_frame(n, seed=0, tahun=(2015, 2026)):
+    """
+    n baris format Gearing Ratio. Periode campuran tanggal Excel
+    ("2021-12-31 00:00:00") dan nama bulan ("Des 2021"); sebagian
+    periode Desember ditandai "(Audited)".
+    """
+    rng = np.random.default_rng(seed)
+
+    periode, display = [], []
+    for y in range(*tahun):
+        for m in range(1, 13):
+            akhir = pd.Timestamp(y, m, 1) + pd.offsets.MonthEnd(0)
+            periode += [f"{akhir:%Y-%m-%d} 00:00:00", f"{bulan_id[m]} {y}"]
+            display += [f"{y}-{m:02d}"] * 2
+            if m == 12:
+                periode.append(f"{bulan_id[m]} {y} (Audited)")
+                display.append(f"{y}-{m:02d}")
+
+    pos = rng.integers(0, len(periode), n)
+    display = np.array(display, dtype=object)[pos]
+    return pd.DataFrame({
+        "Jenis": _pilih(rng, SEMUA_JENIS, n),
+        "Periode": np.array(periode, dtype=object)[pos],
+        "Value": _pilih(rng, _pool_angka(rng, 1e12, 9e13), n),
+        "Display Period": display,
+        "Periode Mod": display,
+    })
+
+
+# ===============================
+# FORMAT OUTSTANDING PENJAMINAN
+# ===============================
+def _dimensi(sheet):
+    if sheet == "GEN":
+        return "Gen", ["Gen 1", "Gen 2"]
+    if sheet == "Tenor":
+        return "Tenor", list(range(1, 13))
+    if sheet == "Issued Year":
+        return "Issued Year", list(range(2015, 2026))
+    if sheet == "Jenis Polis":
+        return "Jenis Polis", ["SPR", "Surety Bond", "Kontra Bank Garansi"]
+    if sheet == "Jenis Kredit (KUR)":
+        return "Jenis Kredit", ["Super Mikro", "Mikro", "Kecil", "TKI"]
+    if sheet == "Bank":
+        return "Bank", [f"Bank {i}" for i in range(120)]
+    return "Kota", [f"Kota {i}" for i in range(514)]
+
+
+def _periode_penjaminan(tahun=(2024, 2026)):
+    return [
+        f"{BULAN_PANJANG[m]} {y}" for y in range(*tahun) for m in range(1, 13)
+    ]
+
+
+def penjaminan_sheet(sheet, n, seed=0):
+    """n baris untuk satu sheet penjaminan (format xlsxPic2.png)."""
+    rng = np.random.default_rng(seed)
+    if sheet == "Proyeksi":
+        return proyeksi_sheet(n, seed)
+
+    label, nilai = _dimensi(sheet)
+    metrics = _pilih(rng, ["OS Penjaminan", "Jumlah Debitur"], n)
+    rupiah = _pilih(rng, _pool_angka(rng, 1e6, 1e13, desimal=0), n)
+    debitur = _pilih(rng, _pool_angka(rng, 1, 1e6, desimal=0), n)
+    return pd.DataFrame({
+        "Periode": _pilih(rng, _periode_penjaminan(), n),
+        "KUR/PEN": _pilih(rng, ["KUR", "PEN", "KPP"], n),
+        label: _pilih(rng, nilai, n),
+        "Metrics": metrics,
+        "Value": np.where(metrics == "Jumlah Debitur", debitur, rupiah),
+    })
+
+
+def proyeksi_sheet(n, seed=0):
+    rng = np.random.default_rng(seed)
+    periode = _pilih(rng, ["Desember 2025", "Desember 2026"], n)
+    asof = pd.date_range("2025-12-31", periods=60, freq="ME")
+    pos = rng.integers(0, len(asof), n)
+    return pd.DataFrame({
+        "Periode": periode,
+        "KUR/PEN": _pilih(rng, ["KUR", "PEN"], n),
+        "Gross/Nett": _pilih(rng, ["OS Gross", "OS Nett"], n),
+        "Tenor": rng.integers(1, 11, n),
+        "Proyeksi as of": asof.strftime("%d-%b-%y").to_numpy(dtype=object)[pos],
+        "Proyeksi as of Mod": asof.strftime("%Y-%m").to_numpy(dtype=object)[pos],
+        "Value": _pilih(rng, _pool_angka(rng, 1e8, 1e13, desimal=0), n),
+    })
+
+
+def penjaminan_workbook(n, seed=0):
+    """
+    Workbook penjaminan total ~n baris, dibagi ke semua sheet menurut
+    PORSI_SHEET. Return dict nama sheet -> DataFrame (urutan workbook).
+    """
+    return {
+        sheet: penjaminan_sheet(sheet, max(1, int(n * porsi)), seed + i)
+        for i, (sheet, porsi) in enumerate(PORSI_SHEET.items())
+    }
+
+
+# ===============================
+# TULIS KE DISK
+# ===============================
+def tulis_file(sheets, path):
+    """
+    Tulis dict sheet ke .xlsx (semua sheet) atau .csv (sheet terbesar,
+    dipakai untuk ukuran di atas batas baris Excel). Return path.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".csv"):
+        terbesar = max(sheets.values(), key=len)
+        terbesar.to_csv(path, index=False)
+        return path
+
+    if max(len(df) for df in sheets.values()) > XLSX_MAX_ROWS:
+        raise ValueError("Sheet melebihi batas baris Excel; gunakan .csv")
+    with pd.ExcelWriter(path) as writer:
+        for sheet, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet, index=False)
+    return path
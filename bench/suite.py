@@ -0,0 +1,392 @@
+"""
+Suite benchmark end-to-end dengan workbook sintetis (bench/generators.py).
+
+Per layout (gearing / penjaminan) dan ukuran baris, diukur: load file,
+parse_periode, parse_value, persiapan frame, filter, setiap agregasi, dan
+satu run script penuh lewat Streamlit AppTest (upload file -> semua
+grafik). Hasil ditulis ke JSON; --baseline membandingkan dengan hasil
+versi sebelumnya dan keluar dengan kode 1 jika ada tahap yang melambat.
+
+    python bench/suite.py --rows 1000 10000 100000 1000000 10000000
+    python bench/suite.py --rows 1000 100000 --baseline lama.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.generators import (  # noqa: E402
+    XLSX_MAX_ROWS,
+    gearing_frame,
+    penjaminan_workbook,
+    tulis_file,
+)
+from gearing.backend import CubeBackend  # noqa: E402
+from gearing.datasets import DATASETS  # noqa: E402
+from gearing.downsample import downsample  # noqa: E402
+from gearing.dtypes import compact_frame  # noqa: E402
+from gearing.filters import PeriodIndex  # noqa: E402
+from gearing.loader import excel_engine, load_workbook  # noqa: E402
+from gearing.memo import AGG_CACHE  # noqa: E402
+from gearing.parsing import (  # noqa: E402
+    bulan_id,
+    parse_periode_series,
+    parse_value_series,
+)
+from gearing.penjaminan import (  # noqa: E402
+    agg_dimensi,
+    agg_metrics,
+    filter_sheet,
+    prepare_sheet,
+    proyeksi_view,
+    sheet_kind,
+    top_n_dimensi,
+)
+from gearing.ratio import build_pivot, gearing_series, prepare_gearing_frame  # noqa: E402
+
+APP = os.path.join(ROOT, "New.py")
+MENU_PENJAMINAN = "📊 Outstanding Penjaminan"
+
+# Tahap di bawah batas ini terlalu berisik untuk dinilai regresi
+NOISE_FLOOR = 0.01  # detik
+
+
+# ===============================
+# PENGUKURAN
+# ===============================
+def ukur(fn, ulang):
+    """Jalankan fn sebanyak ulang; return (hasil terakhir, daftar detik)."""
+    waktu = []
+    for _ in range(ulang):
+        t0 = time.perf_counter()
+        hasil = fn()
+        waktu.append(time.perf_counter() - t0)
+    return hasil, waktu
+
+
+class Pencatat:
+    def __init__(self, layout, rows, fmt, ulang):
+        self.layout, self.rows, self.fmt, self.ulang = layout, rows, fmt, ulang
+        self.hasil = []
+
+    def tahap(self, nama, fn):
+        out, waktu = ukur(fn, self.ulang)
+        self.hasil.append({
+            "layout": self.layout,
+            "rows": self.rows,
+            "format": self.fmt,
+            "stage": nama,
+            "min_s": min(waktu),
+            "median_s": statistics.median(waktu),
+            "repeat": len(waktu),
+        })
+        print(f"  {nama:<16} {min(waktu) * 1e3:>11.1f} ms", flush=True)
+        return out
+
+
+def _separuh(nilai):
+    nilai = sorted(pd.unique(pd.Series(nilai).dropna()), key=str)
+    return nilai[: max(1, len(nilai) // 2)]
+
+
+# ===============================
+# LAYOUT GEARING RATIO
+# ===============================
+def bench_gearing(catat, path):
+    sheets = catat.tahap("load", lambda: load_workbook(path))
+    raw = next(iter(sheets.values()))
+
+    catat.tahap(
+        "parse_periode",
+        lambda: parse_periode_series(raw["Periode"].astype(str)),
+    )
+    catat.tahap("parse_value", lambda: parse_value_series(raw["Value"]))
+    df = catat.tahap(
+        "prepare", lambda: compact_frame(prepare_gearing_frame(raw))
+    )
+
+    idx = catat.tahap("period_index", lambda: PeriodIndex(df))
+    years = _separuh(idx.tahun)
+    months = list(bulan_id.values())[:9]
+    df_f = catat.tahap("filter", lambda: idx.apply(df, years, months))
+
+    pv = catat.tahap("build_pivot", lambda: build_pivot(df_f))
+    seri = catat.tahap("gearing_series", lambda: gearing_series(pv))
+    catat.tahap(
+        "downsample",
+        lambda: downsample(seri["gr_kur"], "Gearing_Ratio", n_out=100),
+    )
+
+
+# ===============================
+# LAYOUT OUTSTANDING PENJAMINAN
+# ===============================
+def bench_penjaminan(catat, path):
+    sheets = catat.tahap("load", lambda: load_workbook(path))
+    if path.endswith(".csv"):
+        # CSV berisi sheet terbesar (Kota), lihat generators.tulis_file
+        sheets = {"Kota": sheets["CSV"]}
+
+    catat.tahap(
+        "parse_value",
+        lambda: [parse_value_series(df["Value"]) for df in sheets.values()],
+    )
+
+    def siapkan():
+        out = {}
+        for sheet, raw in sheets.items():
+            df, _ = prepare_sheet(raw)
+            out[sheet] = compact_frame(df)
+        return out
+
+    data = catat.tahap("prepare", siapkan)
+    sel = {
+        sheet: (
+            _separuh(df["Periode"]),
+            sorted(df["KUR/PEN/KPP"].dropna().unique()),
+            _separuh(df["Dimensi"]),
+        )
+        for sheet, df in data.items()
+    }
+
+    df_f = catat.tahap(
+        "filter",
+        lambda: {s: filter_sheet(df, *sel[s]) for s, df in data.items()},
+    )
+
+    berdimensi = {
+        s: sheet_kind(s) for s in data
+        if sheet_kind(s) not in (None, "proyeksi")
+    }
+    agg = catat.tahap(
+        "agg_dimensi",
+        lambda: {s: agg_dimensi(df_f[s], k) for s, k in berdimensi.items()},
+    )
+    if "Kota" in agg:
+        catat.tahap("top_n_dimensi", lambda: top_n_dimensi(agg["Kota"]))
+    catat.tahap(
+        "agg_metrics",
+        lambda: [
+            agg_metrics(df) for s, df in df_f.items() if s != "Proyeksi"
+        ],
+    )
+    if "Proyeksi" in data:
+        tenor_col = sheets["Proyeksi"].columns[3]
+        tenor = _separuh(data["Proyeksi"][tenor_col])
+        catat.tahap(
+            "proyeksi_view",
+            lambda: proyeksi_view(df_f["Proyeksi"], tenor_col, tenor),
+        )
+
+    # Backend default dashboard: build cube sekali, lalu render per filter
+    def bangun():
+        mesin = CubeBackend()
+        for s, df in data.items():
+            if s != "Proyeksi":
+                mesin.register(s, df)
+        return mesin
+
+    mesin = catat.tahap("cube_build", bangun)
+
+    def render():
+        for s, k in berdimensi.items():
+            mesin.count(s, *sel[s])
+            mesin.agg_dimensi(s, k, *sel[s])
+            mesin.agg_metrics(s, *sel[s])
+
+    catat.tahap("cube_render", render)
+
+
+# ===============================
+# RUN SCRIPT PENUH (APPTEST)
+# ===============================
+def bench_app(catat, path, timeout):
+    """Upload file ke New.py lalu ukur satu run penuh (cache dikosongkan)."""
+    import streamlit as st
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    # Peringatan "bare mode" / deprecation tidak relevan untuk pengukuran
+    set_log_level("error")
+
+    with open(path, "rb") as f:
+        isi = f.read()
+    galat = []
+
+    def jalan():
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        AGG_CACHE.clear()
+        DATASETS.clear()
+
+        at = AppTest.from_file(APP, default_timeout=timeout)
+        at.run()
+        if catat.layout == "penjaminan":
+            at.sidebar.radio[0].set_value(MENU_PENJAMINAN).run()
+        at.file_uploader[0].upload(os.path.basename(path), isi)
+
+        t0 = time.perf_counter()
+        at.run()
+        detik = time.perf_counter() - t0
+        galat.extend(e.message for e in at.exception)
+        return detik
+
+    # Waktu setup AppTest (run tanpa file) tidak ikut dihitung
+    detik = [jalan() for _ in range(catat.ulang)]
+    catat.hasil.append({
+        "layout": catat.layout,
+        "rows": catat.rows,
+        "format": catat.fmt,
+        "stage": "app_run",
+        "min_s": min(detik),
+        "median_s": statistics.median(detik),
+        "repeat": len(detik),
+        "errors": sorted(set(galat)),
+    })
+    status = "ok" if not galat else f"{len(set(galat))} exception"
+    print(f"  {'app_run':<16} {min(detik) * 1e3:>11.1f} ms  ({status})")
+
+
+# ===============================
+# METADATA & REGRESI
+# ===============================
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata():
+    import streamlit
+
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "streamlit": streamlit.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "excel_engine": excel_engine(),
+    }
+
+
+def bandingkan(hasil, baseline, toleransi):
+    """Tahap yang min_s-nya > toleransi x baseline. Return daftar regresi."""
+    lama = {
+        (r["layout"], r["rows"], r["format"], r["stage"]): r["min_s"]
+        for r in baseline["results"]
+    }
+    regresi = []
+    print(f"\nBanding dengan {baseline['meta'].get('commit')}:")
+    for r in hasil:
+        kunci = (r["layout"], r["rows"], r["format"], r["stage"])
+        if kunci not in lama:
+            continue
+        rasio = r["min_s"] / lama[kunci] if lama[kunci] else float("inf")
+        lambat = rasio > toleransi and r["min_s"] > NOISE_FLOOR
+        if lambat:
+            regresi.append({**r, "baseline_s": lama[kunci], "ratio": rasio})
+        print(
+            f"  {kunci[0]:<11} {kunci[1]:>11,} {kunci[2]:<5} {kunci[3]:<16} "
+            f"{rasio:>6.2f}x{'  REGRESI' if lambat else ''}"
+        )
+    return regresi
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "--rows", type=int, nargs="+",
+        default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+    )
+    ap.add_argument(
+        "--layout", nargs="+", choices=["gearing", "penjaminan"],
+        default=["gearing", "penjaminan"]
+    )
+    ap.add_argument("--repeat", type=int, default=3,
+                    help="ulangan per tahap (ukuran >= 1 juta baris: 1)")
+    ap.add_argument("--xlsx-max", type=int, default=100_000,
+                    help="di atas ukuran ini workbook ditulis sebagai CSV")
+    ap.add_argument("--app-max", type=int, default=100_000,
+                    help="ukuran terbesar yang diukur dengan AppTest")
+    ap.add_argument("--app-timeout", type=float, default=600)
+    ap.add_argument("--out", default="bench-results.json")
+    ap.add_argument("--baseline", help="JSON hasil versi sebelumnya")
+    ap.add_argument("--toleransi", type=float, default=1.25,
+                    help="rasio waktu yang dianggap regresi")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--excel-engine", choices=["auto", "calamine", "openpyxl"],
+                    help="engine xlsx (default GEARING_EXCEL_ENGINE / auto)")
+    args = ap.parse_args()
+
+    # Run terisolasi: tanpa cache Parquet & riwayat milik pengguna
+    tmp = tempfile.mkdtemp(prefix="gearing-bench-")
+    os.environ["GEARING_CACHE_MAX_MB"] = "0"
+    os.environ["GEARING_STORE_PATH"] = os.path.join(tmp, "store.sqlite")
+    if args.excel_engine:
+        os.environ["GEARING_EXCEL_ENGINE"] = args.excel_engine
+    out = os.path.abspath(args.out)
+    baseline = args.baseline and os.path.abspath(args.baseline)
+    os.chdir(ROOT)  # New.py membaca gambar/ relatif terhadap root repo
+
+    generator = {"gearing": gearing_frame, "penjaminan": penjaminan_workbook}
+    runner = {"gearing": bench_gearing, "penjaminan": bench_penjaminan}
+
+    hasil = []
+    for layout in args.layout:
+        for n in args.rows:
+            data = generator[layout](n, args.seed)
+            if layout == "gearing":
+                data = {"Sheet1": data}
+            xlsx = n <= min(args.xlsx_max, XLSX_MAX_ROWS)
+            path = tulis_file(
+                data, os.path.join(tmp, f"{layout}-{n}.{'xlsx' if xlsx else 'csv'}")
+            )
+            del data
+
+            fmt = "xlsx" if xlsx else "csv"
+            print(f"{layout} {n:,} baris ({fmt})", flush=True)
+            catat = Pencatat(
+                layout, n, fmt, args.repeat if n < 1_000_000 else 1
+            )
+            runner[layout](catat, path)
+            if n <= args.app_max:
+                bench_app(catat, path, args.app_timeout)
+            hasil += catat.hasil
+            os.remove(path)
+
+    laporan = {"meta": metadata(), "results": hasil}
+    regresi = []
+    if baseline:
+        with open(baseline) as f:
+            regresi = bandingkan(hasil, json.load(f), args.toleransi)
+        laporan["regressions"] = regresi
+
+    with open(out, "w") as f:
+        json.dump(laporan, f, indent=2)
+    print(f"\nHasil ditulis ke {out}")
+
+    if regresi:
+        sys.exit(f"{len(regresi)} tahap melambat > {args.toleransi}x")
+
+
+if __name__ == "__main__":
+    main()
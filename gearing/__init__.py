@@ -0,0 +1,118 @@
+"""
+Inti headless (parsing, loader, ratio, penjaminan) diimpor langsung.
+Modul tingkat sesi/proses (cache bersama, thread pool parse, backend, store)
+tidak diimpor di sini agar `import gearing`, CLI dan worker proses tidak
+ikut membuat objek globalnya; impor dari submodulnya (mis.
+gearing.ingest.INGEST), atau lewat nama di _LAZY yang dimuat saat diakses.
+"""
+import importlib
+
+from gearing.loader import (
+    available_excel_engines,
+    csv_read_kwargs,
+    excel_engine,
+    excel_locale,
+    excel_value_lokal,
+    iter_workbook,
+    load_sheet,
+    load_table,
+    load_workbook,
+    read_csv_lokal,
+    read_excel,
+    sheet_names,
+    value_lokal,
+)
+from gearing.parsing import (
+    bulan_id,
+    bulan_map,
+    detect_locale,
+    parse_periode_series,
+    parse_value_series,
+)
+from gearing.penjaminan import (
+    agg_dimensi,
+    agg_metrics,
+    agg_proyeksi,
+    filter_sheet,
+    opsi_filter,
+    prepare_sheet,
+    sheet_kind,
+    top_n_dimensi,
+)
+from gearing.ratio import (
+    build_pivot,
+    gearing_series,
+    periode_label,
+    prepare_gearing_frame,
+)
+
+# nama -> submodul; dimuat saat pertama diakses (gearing.INGEST, dst.)
+_LAZY = {
+    "AGG_CACHE": "gearing.memo",
+    "MemoCache": "gearing.memo",
+    "selection_key": "gearing.memo",
+    "CubeBackend": "gearing.backend",
+    "DuckBackend": "gearing.backend",
+    "PandasBackend": "gearing.backend",
+    "make_backend": "gearing.backend",
+    "SheetCube": "gearing.cube",
+    "DATASETS": "gearing.datasets",
+    "DatasetCache": "gearing.datasets",
+    "downsample": "gearing.downsample",
+    "lttb_indices": "gearing.downsample",
+    "minmax_indices": "gearing.downsample",
+    "compact_frame": "gearing.dtypes",
+    "memory_report": "gearing.dtypes",
+    "PeriodIndex": "gearing.filters",
+    "INGEST": "gearing.ingest",
+    "IngestPool": "gearing.ingest",
+    "format_value": "gearing.preview",
+    "preview_page": "gearing.preview",
+    "Profiler": "gearing.profiling",
+    "profiling_enabled": "gearing.profiling",
+    "PeriodStore": "gearing.store",
+}
+
+
+def __getattr__(nama):
+    if nama in _LAZY:
+        return getattr(importlib.import_module(_LAZY[nama]), nama)
+    raise AttributeError(f"module 'gearing' has no attribute {nama!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY])
+
+
+__all__ = [
+    "agg_dimensi",
+    "agg_metrics",
+    "agg_proyeksi",
+    "available_excel_engines",
+    "build_pivot",
+    "bulan_id",
+    "bulan_map",
+    "csv_read_kwargs",
+    "detect_locale",
+    "excel_engine",
+    "excel_locale",
+    "excel_value_lokal",
+    "filter_sheet",
+    "gearing_series",
+    "iter_workbook",
+    "load_sheet",
+    "load_table",
+    "load_workbook",
+    "opsi_filter",
+    "parse_periode_series",
+    "parse_value_series",
+    "periode_label",
+    "prepare_gearing_frame",
+    "prepare_sheet",
+    "read_csv_lokal",
+    "read_excel",
+    "sheet_kind",
+    "sheet_names",
+    "top_n_dimensi",
+    "value_lokal",
+]
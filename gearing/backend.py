@@ -0,0 +1,302 @@
+import importlib.util
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from gearing.cube import SheetCube, max_cells
+from gearing.penjaminan import (
+    agg_dimensi,
+    agg_metrics,
+    agg_proyeksi,
+    filter_sheet,
+    kolom_metrics,
+    proyeksi_view,
+)
+
+HAS_DUCKDB = importlib.util.find_spec("duckdb") is not None
+
+KOLOM_FILTER = ["Periode", "KUR/PEN/KPP", "Dimensi"]
+
+# Sheet terdaftar paling lama dilepas agar dataset lama bisa dibebaskan
+MAKS_SHEET = 64
+
+
+def available_backends():
+    return ["cube", "pandas"] + (["duckdb"] if HAS_DUCKDB else [])
+
+
+def default_backend():
+    """GEARING_BACKEND (cube / pandas / duckdb); duckdb hanya jika terpasang."""
+    nama = os.environ.get("GEARING_BACKEND", "cube").lower()
+    return nama if nama in available_backends() else "cube"
+
+
+def make_backend(nama):
+    if nama == "duckdb":
+        return DuckBackend()
+    if nama == "cube":
+        return CubeBackend()
+    return PandasBackend()
+
+
+# ===============================
+# BACKEND PANDAS
+# ===============================
+class PandasBackend:
+    """
+    Filter & agregasi sheet penjaminan dengan pandas. Semua method menerima
+    nama sheet terdaftar plus pilihan filter (per, kp, dim).
+    """
+
+    name = "pandas"
+
+    def __init__(self):
+        self._sheets = OrderedDict()
+        self._terakhir = (None, None)
+        self._lock = threading.Lock()
+
+    def register(self, nama, df):
+        with self._lock:
+            self._sheets[nama] = df
+            self._sheets.move_to_end(nama)
+            while len(self._sheets) > MAKS_SHEET:
+                self._sheets.popitem(last=False)
+
+    def _filter(self, nama, per, kp, dim):
+        # Satu sheet dirender dengan beberapa agregasi atas filter yang sama
+        kunci = (nama, tuple(map(tuple, (per, kp, dim))))
+        with self._lock:
+            if self._terakhir[0] == kunci:
+                return self._terakhir[1]
+        df_f = filter_sheet(self._sheets[nama], per, kp, dim)
+        with self._lock:
+            self._terakhir = (kunci, df_f)
+        return df_f
+
+    def count(self, nama, per, kp, dim):
+        return len(self._filter(nama, per, kp, dim))
+
+    def distinct(self, nama, col, per, kp, dim):
+        return sorted(self._filter(nama, per, kp, dim)[col].dropna().unique())
+
+    def agg_dimensi(self, nama, kind, per, kp, dim):
+        return agg_dimensi(self._filter(nama, per, kp, dim), kind)
+
+    def agg_metrics(self, nama, per, kp, dim):
+        return agg_metrics(self._filter(nama, per, kp, dim))
+
+    def proyeksi_view(self, nama, tenor_col, tenor, per, kp, dim):
+        return proyeksi_view(self._filter(nama, per, kp, dim), tenor_col, tenor)
+
+
+# ===============================
+# BACKEND CUBE (DEFAULT)
+# ===============================
+class CubeBackend(PandasBackend):
+    """
+    Setiap sheet dipra-agregasi sekali menjadi SheetCube; count, agg_dimensi
+    & agg_metrics dibaca dengan slicing cube. Sheet tanpa kolom Metrics atau
+    yang cube-nya melewati GEARING_CUBE_MAX_CELLS, serta daftar tenor &
+    proyeksi (butuh kolom Tenor), tetap memakai pandas.
+    """
+
+    name = "cube"
+
+    def __init__(self):
+        super().__init__()
+        self._cube = {}
+
+    def register(self, nama, df):
+        if nama in self._sheets:
+            return super().register(nama, df)
+        cube = None
+        if "Metrics" in df.columns and SheetCube.cells(df) <= max_cells():
+            cube = SheetCube(df)
+        super().register(nama, df)
+        with self._lock:
+            self._cube[nama] = cube
+            for lama in set(self._cube) - set(self._sheets):
+                del self._cube[lama]
+
+    def count(self, nama, per, kp, dim):
+        cube = self._cube.get(nama)
+        if cube is None:
+            return super().count(nama, per, kp, dim)
+        return cube.count(per, kp, dim)
+
+    def agg_dimensi(self, nama, kind, per, kp, dim):
+        cube = self._cube.get(nama)
+        if cube is None:
+            return super().agg_dimensi(nama, kind, per, kp, dim)
+        return cube.agg_dimensi(kind, per, kp, dim)
+
+    def agg_metrics(self, nama, per, kp, dim):
+        cube = self._cube.get(nama)
+        if cube is None:
+            return super().agg_metrics(nama, per, kp, dim)
+        return cube.agg_metrics(per, kp, dim)
+
+
+# ===============================
+# BACKEND DUCKDB (OPSIONAL)
+# ===============================
+def _q(col):
+    return '"' + col.replace('"', '""') + '"'
+
+
+class DuckBackend:
+    """
+    Sheet disalin sekali menjadi tabel DuckDB in-memory. Kolom category
+    disimpan sebagai kode integer, sehingga filter Periode / KUR-PEN-KPP /
+    Dimensi menjadi semi-join integer yang didorong ke scan, dan agregasi
+    dijalankan paralel oleh DuckDB. Hasil group (kecil) dikembalikan ke
+    label lalu dirapikan dengan fungsi pandas yang sama, sehingga kolom,
+    dtype & urutan identik dengan PandasBackend.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, threads=None):
+        import duckdb
+
+        self.con = duckdb.connect()
+        self.con.execute(f"SET threads = {threads or os.cpu_count() or 1}")
+        self._tabel = OrderedDict()
+        self._kategori = {}
+        self._tipe = {}
+        self._urut = 0
+        self._lock = threading.Lock()
+
+    def register(self, nama, df):
+        with self._lock:
+            if nama in self._tabel:
+                self._tabel.move_to_end(nama)
+                return
+            self._urut += 1
+            tabel = f"s_{self._urut}"
+
+            kategori = {
+                c: df[c].cat.categories for c in df.columns
+                if isinstance(df[c].dtype, pd.CategoricalDtype)
+            }
+            kode = df.assign(**{
+                c: df[c].cat.codes.astype("Int32").mask(df[c].cat.codes < 0)
+                for c in kategori
+            })
+            self.con.register("_baru", kode)
+            self.con.execute(f"CREATE TABLE {tabel} AS SELECT * FROM _baru")
+            self.con.unregister("_baru")
+
+            self._tabel[nama] = tabel
+            self._kategori[nama] = kategori
+            self._tipe[nama] = dict(self.con.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_name = ?", [tabel]
+            ).fetchall())
+
+            while len(self._tabel) > MAKS_SHEET:
+                lama, t = self._tabel.popitem(last=False)
+                self.con.execute(f"DROP TABLE {t}")
+                del self._kategori[lama], self._tipe[lama]
+
+    def _param(self, nama, col, nilai):
+        """Pilihan filter -> list kode (kolom category) atau nilai asli."""
+        kategori = self._kategori[nama].get(col)
+        if kategori is not None:
+            pos = kategori.get_indexer(list(nilai))
+            return [int(p) for p in pos if p >= 0]
+        return pd.Series(list(nilai)).tolist()
+
+    def _label(self, nama, out):
+        """Kolom kode hasil query -> category dengan label asli."""
+        for col, kategori in self._kategori[nama].items():
+            if col in out.columns:
+                kode = out[col].fillna(-1).astype(int)
+                out[col] = pd.Categorical.from_codes(kode, kategori)
+        return out
+
+    def _query(self, nama, sql, per, kp, dim, extra=None):
+        """
+        Jalankan sql dengan CTE f = baris sheet yang lolos filter.
+        extra: {kolom: nilai} filter IN tambahan (mis. Tenor).
+        """
+        filter_ = dict(zip(KOLOM_FILTER, (per, kp, dim)))
+        filter_.update(extra or {})
+
+        where, params = [], []
+        for col, nilai in filter_.items():
+            where.append(
+                f"{_q(col)} IN (SELECT unnest(?::{self._tipe[nama][col]}[]))"
+            )
+            params.append(self._param(nama, col, nilai))
+
+        full = (
+            f"WITH f AS (SELECT * FROM {self._tabel[nama]} "
+            f"WHERE {' AND '.join(where)}) {sql}"
+        )
+        with self._lock:
+            out = self.con.execute(full, params).df()
+        return self._label(nama, out)
+
+    def count(self, nama, per, kp, dim):
+        out = self._query(nama, "SELECT COUNT(*) AS n FROM f", per, kp, dim)
+        return int(out["n"].iloc[0])
+
+    def distinct(self, nama, col, per, kp, dim):
+        out = self._query(
+            nama,
+            f"SELECT DISTINCT {_q(col)} FROM f WHERE {_q(col)} IS NOT NULL",
+            per, kp, dim,
+        )
+        return sorted(out[col].dropna().unique())
+
+    def _jumlah_per(self, nama, kolom, per, kp, dim, extra=None):
+        # Total Value per kombinasi kolom (NaN / NULL diabaikan)
+        grup = ", ".join(_q(c) for c in kolom)
+        return self._query(
+            nama,
+            f"""
+            SELECT {grup}, fsum(Value) AS Value
+            FROM f
+            WHERE Value IS NOT NULL AND NOT isnan(Value)
+            GROUP BY {grup}
+            """,
+            per, kp, dim, extra,
+        )
+
+    def agg_dimensi(self, nama, kind, per, kp, dim):
+        # Pembersihan kota / tenor numerik dikerjakan pandas atas hasil group
+        return agg_dimensi(
+            self._jumlah_per(nama, ["Dimensi"], per, kp, dim), kind
+        )
+
+    def agg_metrics(self, nama, per, kp, dim):
+        # Grup tanpa nilai tetap ada dengan total 0 (sama dengan pandas sum)
+        out = self._query(
+            nama,
+            """
+            SELECT Metrics,
+                   COALESCE(fsum(Value) FILTER (WHERE NOT isnan(Value)), 0)
+                       AS Total_Value
+            FROM f
+            WHERE Metrics IS NOT NULL
+            GROUP BY Metrics
+            ORDER BY Metrics
+            """,
+            per, kp, dim,
+        )
+        return kolom_metrics(out)
+
+    def proyeksi_view(self, nama, tenor_col, tenor, per, kp, dim):
+        extra = {tenor_col: tenor}
+        rows = self._query(
+            nama, "SELECT COUNT(*) AS n FROM f", per, kp, dim, extra
+        )
+        d = self._jumlah_per(nama, ["Periode", "Dimensi"], per, kp, dim, extra)
+        return {
+            "rows": int(rows["n"].iloc[0]),
+            "gross": agg_proyeksi(d, "OS Gross"),
+            "nett": agg_proyeksi(d, "OS Nett"),
+        }
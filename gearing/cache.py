@@ -0,0 +1,309 @@
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from gearing.dtypes import compact_frame
+from gearing.loader import iter_workbook, load_table, sheet_names
+from gearing.penjaminan import prepare_sheet
+from gearing.profiling import stage
+from gearing.ratio import prepare_gearing_frame
+from gearing.streaming import should_stream, stream_gearing, stream_sheet
+
+# Naikkan jika hasil parsing berubah agar cache lama tidak terpakai
+CACHE_VERSION = 4
+
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gearing")
+DEFAULT_MAX_MB = 2048
+
+
+# ===============================
+# HASH ISI FILE
+# ===============================
+def file_bytes(file):
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    if hasattr(file, "read"):
+        pos = file.tell()
+        data = file.read()
+        file.seek(pos)
+        return data
+    with open(file, "rb") as f:
+        return f.read()
+
+
+def file_digest(file):
+    """SHA-256 isi file (UploadedFile, file object, atau path)."""
+    return hashlib.sha256(file_bytes(file)).hexdigest()
+
+
+def _arrow_safe(df):
+    """Kolom object bertipe campuran (mis. tanggal + teks) -> teks, NaN tetap NaN."""
+    out = df
+    for col in df.columns:
+        s = df[col]
+        if s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) in (
+            "mixed", "mixed-integer"
+        ):
+            if out is df:
+                out = df.copy()
+            out[col] = s.where(s.isna(), s.astype(str))
+    return out
+
+
+# ===============================
+# CACHE PARQUET DI DISK (LRU)
+# ===============================
+class DiskCache:
+    """
+    Cache DataFrame hasil parsing di disk, dialamatkan dengan hash isi file.
+    Entri yang paling lama tidak dipakai (mtime) dibuang saat total ukuran
+    melewati max_bytes. Tanpa pyarrow cache otomatis nonaktif.
+    """
+
+    def __init__(self, root=DEFAULT_DIR, max_bytes=DEFAULT_MAX_MB * 1024 ** 2):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.enabled = (
+            max_bytes > 0 and importlib.util.find_spec("pyarrow") is not None
+        )
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            root=os.environ.get("GEARING_CACHE_DIR", DEFAULT_DIR),
+            max_bytes=int(
+                float(os.environ.get("GEARING_CACHE_MAX_MB", DEFAULT_MAX_MB))
+                * 1024 ** 2
+            ),
+        )
+
+    def _path(self, key, ext):
+        return os.path.join(self.root, f"{key}.{ext}")
+
+    def _hit(self, path):
+        # Tandai baru dipakai (LRU). Entri bisa dihapus evict() thread /
+        # proses lain kapan saja: file hilang dianggap miss
+        try:
+            os.utime(path)
+        except OSError:
+            return False
+        return True
+
+    def _write(self, path, tulis):
+        # Gagal menulis cache tidak boleh menggagalkan dashboard
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            os.close(fd)
+            try:
+                tulis(tmp)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        except Exception:
+            return False
+        self.evict()
+        return True
+
+    def _read(self, path, baca):
+        try:
+            return baca(path)
+        except Exception:
+            # entri rusak / terpotong -> anggap miss
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    # ---------- DataFrame ----------
+    def get_frame(self, key):
+        path = self._path(key, "parquet")
+        if not self.enabled or not self._hit(path):
+            return None
+        with stage("parquet_read"):
+            return self._read(path, pd.read_parquet)
+
+    def put_frame(self, key, df):
+        if self.enabled:
+            with stage("parquet_write"):
+                return self._write(
+                    self._path(key, "parquet"),
+                    lambda p: df.to_parquet(p, index=False),
+                )
+        return False
+
+    # ---------- metadata kecil (JSON) ----------
+    def get_meta(self, key):
+        path = self._path(key, "json")
+        if not self.enabled or not self._hit(path):
+            return None
+
+        def baca(p):
+            with open(p, encoding="utf-8") as f:
+                return json.load(f)
+
+        return self._read(path, baca)
+
+    def put_meta(self, key, meta):
+        def tulis(p):
+            with open(p, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+        if self.enabled:
+            return self._write(self._path(key, "json"), tulis)
+        return False
+
+    # ---------- eviction ----------
+    def entries(self):
+        if not os.path.isdir(self.root):
+            return []
+        out = []
+        for nama in os.listdir(self.root):
+            if nama.endswith((".parquet", ".json")):
+                st = os.stat(os.path.join(self.root, nama))
+                out.append((st.st_mtime, st.st_size, nama))
+        return sorted(out)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, nama in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.root, nama))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+# ===============================
+# LOADER DENGAN CACHE
+# ===============================
+def _key(digest, *parts):
+    return "-".join([f"v{CACHE_VERSION}", digest, *map(str, parts)])
+
+
+def _mode(file):
+    # Mode stream menyimpan agregat per kunci, mode penuh baris asli: hasil
+    # keduanya tidak boleh tertukar saat ambang GEARING_STREAM_* berubah
+    return "stream" if should_stream(file) else "full"
+
+
+def _lapor(progress, selesai, total=None, pesan=""):
+    if progress:
+        progress(selesai, total, pesan)
+
+
+def _lapor_baris(progress, sheet=None, selesai=None, total=None):
+    """Adaptor progress(baris) milik streaming ke progress(selesai, total, pesan)."""
+    if not progress:
+        return None
+    if sheet is None:
+        return lambda baris: progress(baris, None, f"{baris:,} baris dibaca")
+    return lambda baris: progress(
+        selesai, total, f"Sheet {sheet}: {baris:,} baris dibaca"
+    )
+
+
+def cached_gearing_frame(file, cache=None, digest=None, progress=None):
+    """
+    load_table + prepare_gearing_frame, hasilnya disimpan per hash file.
+    progress(selesai, total, pesan) opsional dipanggil per tahap / chunk;
+    exception dari progress menghentikan parse (dipakai untuk pembatalan).
+    """
+    cache = cache or DiskCache.from_env()
+    mode = _mode(file)
+    key = _key(digest or file_digest(file), "gearing", mode)
+
+    df = cache.get_frame(key)
+    if df is not None:
+        return df
+
+    if mode == "stream":
+        with stage("stream"):
+            df = stream_gearing(file, progress=_lapor_baris(progress))
+    else:
+        _lapor(progress, 0, 2, "Membaca file")
+        raw = load_table(file)
+        _lapor(progress, 1, 2, f"Parse {len(raw):,} baris")
+        df = prepare_gearing_frame(raw)
+        del raw
+    with stage("compact"):
+        df = compact_frame(_arrow_safe(df))
+    cache.put_frame(key, df)
+    return df
+
+
+def cached_sheets(file, cache=None, digest=None, progress=None):
+    """
+    Semua sheet penjaminan yang sudah dipetakan & diparse.
+    Return list (sheet, df, dimensi_label, error); df None jika sheet
+    tidak valid dan error berisi pesan untuk UI. progress seperti pada
+    cached_gearing_frame, dipanggil per sheet (atau per chunk CSV besar).
+    """
+    cache = cache or DiskCache.from_env()
+    digest = digest or file_digest(file)
+    mode = _mode(file)
+    key = _key(digest, "sheets", mode)
+
+    meta = cache.get_meta(key)
+    if meta is not None:
+        out = []
+        for i, m in enumerate(meta):
+            df = None
+            if m["error"] is None:
+                df = cache.get_frame(_key(digest, "sheet", mode, i))
+                if df is None:  # sebagian entri sudah di-evict
+                    break
+            out.append((m["sheet"], df, m["label"], m["error"]))
+        else:
+            return out
+
+    out = []
+    if mode == "stream":
+        # File besar: setiap sheet dibaca per chunk, disimpan sebagai agregat
+        # per kunci
+        nama = sheet_names(file)
+        sheets = ((sheet, None) for sheet in nama)
+    else:
+        nama, sheets = iter_workbook(file)
+
+    # Workbook dibaca sheet demi sheet: progress & pembatalan di antara sheet
+    for i, sheet in enumerate(nama):
+        _lapor(progress, i, len(nama), f"Sheet {sheet}")
+        _, df_raw = next(sheets)
+        try:
+            with stage("prepare", sheet=sheet):
+                if df_raw is None:
+                    with stage("stream"):
+                        df, label = stream_sheet(
+                            file, sheet, progress=_lapor_baris(
+                                progress, sheet, i, len(nama)
+                            )
+                        )
+                else:
+                    df, label = prepare_sheet(df_raw)
+                with stage("compact"):
+                    df = compact_frame(_arrow_safe(df))
+            out.append((sheet, df, label, None))
+        except ValueError as e:
+            out.append((sheet, None, None, str(e)))
+
+    _lapor(progress, len(nama), len(nama), "Menyimpan cache")
+    for i, (_, df, _, _) in enumerate(out):
+        if df is not None:
+            cache.put_frame(_key(digest, "sheet", mode, i), df)
+    cache.put_meta(key, [
+        {"sheet": s, "label": label, "error": err} for s, _, label, err in out
+    ])
+    return out
@@ -0,0 +1,232 @@
+"""
+Batch Gearing Ratio & Outstanding Penjaminan tanpa Streamlit.
+
+    python -m gearing data/ -o hasil/ --format parquet
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from gearing.loader import (
+    available_excel_engines,
+    is_csv,
+    load_table,
+    load_workbook,
+    read_excel,
+    sheet_names,
+)
+from gearing.penjaminan import (
+    agg_dimensi,
+    agg_metrics,
+    agg_proyeksi,
+    prepare_sheet,
+    sheet_kind,
+)
+from gearing.ratio import build_pivot, gearing_series, prepare_gearing_frame
+from gearing.streaming import should_stream, stream_gearing, stream_sheet
+
+EKSTENSI = (".csv", ".xlsx")
+KOLOM_GEARING = {"Periode", "Jenis", "Value"}
+
+
+# ===============================
+# DETEKSI LAYOUT FILE
+# ===============================
+def detect_layout(path, engine=None):
+    """'gearing' jika header berisi Periode/Jenis/Value, selain itu 'penjaminan'."""
+    if is_csv(path):
+        cols = pd.read_csv(path, nrows=0).columns
+    else:
+        cols = read_excel(path, engine, nrows=0).columns
+    return "gearing" if KOLOM_GEARING <= set(cols) else "penjaminan"
+
+
+# ===============================
+# HITUNG PER FILE
+# ===============================
+def hitung_gearing(path, chunksize=None, engine=None):
+    if chunksize or should_stream(path):
+        df = stream_gearing(path, chunksize)
+    else:
+        df = prepare_gearing_frame(load_table(path, engine))
+    return gearing_series(build_pivot(df))
+
+
+def _sheets(path, chunksize=None, engine=None):
+    # CSV besar dibaca per chunk
+    if is_csv(path) and (chunksize or should_stream(path)):
+        yield "CSV", stream_sheet(path, chunksize=chunksize)
+        return
+    # xlsx besar: setiap sheet dibaca per chunk (openpyxl read_only)
+    if chunksize or should_stream(path):
+        for sheet in sheet_names(path, engine):
+            try:
+                yield sheet, stream_sheet(path, sheet, chunksize)
+            except ValueError:
+                continue
+        return
+    # Selain itu workbook diparse sekali untuk semua sheet
+    for sheet, df_raw in load_workbook(path, engine).items():
+        try:
+            yield sheet, prepare_sheet(df_raw)
+        except ValueError:
+            continue
+
+
+def hitung_penjaminan(path, chunksize=None, engine=None):
+    metrics, dimensi, proyeksi = [], [], []
+
+    for sheet, (df, dimensi_label) in _sheets(path, chunksize, engine):
+
+        kind = sheet_kind(sheet)
+
+        if kind == "proyeksi":
+            for jenis in ("OS Gross", "OS Nett"):
+                agg = agg_proyeksi(df, jenis)
+                agg["Periode"] = agg["Periode"].astype(str)
+                agg.insert(0, "Jenis", jenis)
+                agg.insert(0, "Sheet", sheet)
+                proyeksi.append(agg)
+            continue
+
+        if kind is not None:
+            agg = agg_dimensi(df, kind)
+            # Dimensi antar sheet bisa angka (Tenor) atau teks (Bank, Kota)
+            agg["Dimensi"] = agg["Dimensi"].astype(str)
+            agg.insert(0, "Dimensi_Label", dimensi_label)
+            agg.insert(0, "Sheet", sheet)
+            dimensi.append(agg)
+
+        agg = agg_metrics(df)
+        agg.insert(0, "Sheet", sheet)
+        metrics.append(agg)
+
+    hasil = {
+        "penjaminan_metrics": metrics,
+        "penjaminan_dimensi": dimensi,
+        "proyeksi_os": proyeksi,
+    }
+    return {k: pd.concat(v, ignore_index=True) for k, v in hasil.items() if v}
+
+
+def proses_file(path, layout="auto", chunksize=None, engine=None):
+    if layout == "auto":
+        layout = detect_layout(path, engine)
+    if layout == "gearing":
+        return hitung_gearing(path, chunksize, engine)
+    return hitung_penjaminan(path, chunksize, engine)
+
+
+def _proses(args):
+    path, layout, chunksize, engine = args
+    try:
+        return path, proses_file(path, layout, chunksize, engine), None
+    except Exception as e:  # satu file rusak tidak menghentikan batch
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+# ===============================
+# INPUT & OUTPUT
+# ===============================
+def kumpulkan_file(inputs):
+    files = []
+    for p in inputs:
+        if os.path.isdir(p):
+            for nama in sorted(os.listdir(p)):
+                if nama.lower().endswith(EKSTENSI) and not nama.startswith("~$"):
+                    files.append(os.path.join(p, nama))
+        else:
+            files.append(p)
+    return files
+
+
+def tulis(frames, out_dir, fmt):
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for nama, df in frames.items():
+        path = os.path.join(out_dir, f"{nama}.{fmt}")
+        if fmt == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m gearing",
+        description="Hitung agregat Gearing Ratio / Outstanding Penjaminan "
+                    "untuk satu atau banyak file xlsx/csv.",
+    )
+    ap.add_argument("input", nargs="+", help="file atau folder berisi xlsx/csv")
+    ap.add_argument("-o", "--output", default="hasil", help="folder output")
+    ap.add_argument("-f", "--format", choices=["csv", "parquet"], default="csv")
+    ap.add_argument(
+        "--layout", choices=["auto", "gearing", "penjaminan"], default="auto",
+        help="format input (default: deteksi dari header)",
+    )
+    ap.add_argument(
+        "--chunksize", type=int, default=None,
+        help="baca CSV / sheet xlsx per N baris (agregasi bertahap, memori "
+             "terbatas); default otomatis untuk CSV > GEARING_STREAM_MB dan "
+             "xlsx > GEARING_STREAM_XLSX_MB",
+    )
+    ap.add_argument(
+        "--excel-engine", choices=["auto", "calamine", "openpyxl"], default=None,
+        help="engine xlsx (default GEARING_EXCEL_ENGINE / auto: calamine jika "
+             "terpasang); gagal dengan calamine otomatis dibaca ulang dengan openpyxl",
+    )
+    ap.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="jumlah proses paralel",
+    )
+    args = ap.parse_args(argv)
+
+    if args.format == "parquet" and not (
+        importlib.util.find_spec("pyarrow") or importlib.util.find_spec("fastparquet")
+    ):
+        ap.error("format parquet membutuhkan pyarrow atau fastparquet")
+
+    files = kumpulkan_file(args.input)
+    if not files:
+        ap.error("tidak ada file .xlsx / .csv")
+
+    t0 = time.perf_counter()
+    if args.excel_engine == "calamine" and "calamine" not in available_excel_engines():
+        ap.error("engine calamine membutuhkan paket python-calamine")
+
+    tugas = [(f, args.layout, args.chunksize, args.excel_engine) for f in files]
+    if args.jobs > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+            hasil = list(ex.map(_proses, tugas))
+    else:
+        hasil = [_proses(t) for t in tugas]
+
+    # Gabungkan per agregat, kolom File menandai sumbernya
+    gabung, gagal = {}, 0
+    for path, frames, err in hasil:
+        if err:
+            gagal += 1
+            print(f"GAGAL {path}: {err}", file=sys.stderr)
+            continue
+        for nama, df in frames.items():
+            df = df.copy()
+            df.insert(0, "File", os.path.basename(path))
+            gabung.setdefault(nama, []).append(df)
+
+    frames = {k: pd.concat(v, ignore_index=True) for k, v in gabung.items()}
+    for path in tulis(frames, args.output, args.format):
+        print(path)
+
+    print(
+        f"{len(files) - gagal}/{len(files)} file diproses "
+        f"dalam {time.perf_counter() - t0:.2f} s",
+        file=sys.stderr,
+    )
+    return 1 if gagal else 0
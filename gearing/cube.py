@@ -0,0 +1,147 @@
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+from gearing.penjaminan import agg_dimensi, kolom_metrics
+
+DEFAULT_MAX_CELLS = 2_000_000
+
+# Sumbu filter (urutan sumbu array) + Metrics sebagai sumbu terakhir
+SUMBU = ["Periode", "KUR/PEN/KPP", "Dimensi"]
+
+
+def max_cells():
+    """Batas sel cube per sheet (GEARING_CUBE_MAX_CELLS)."""
+    return int(os.environ.get("GEARING_CUBE_MAX_CELLS", DEFAULT_MAX_CELLS))
+
+
+def _kode(s):
+    """Kolom -> (kode int, label urut); NaN = -1."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy(), s.cat.categories
+    kode, label = pd.factorize(s, sort=True)
+    return kode, label
+
+
+# ===============================
+# CUBE PER SHEET (ARRAY)
+# ===============================
+class SheetCube:
+    """
+    Sum Value atas Periode x KUR/PEN/KPP x Dimensi x Metrics dalam array
+    numpy padat, plus semua level rollup sumbu filter. Filter multiselect
+    menjadi slicing indeks, sehingga biaya per perubahan filter bergantung
+    pada ukuran cube, bukan jumlah baris.
+
+    Sumbu Metrics punya satu slot ekstra untuk Metrics kosong (ikut dihitung
+    di count & agg_dimensi, tidak tampil di agg_metrics). Baris dengan
+    Periode / KUR/PEN/KPP / Dimensi kosong tidak pernah lolos filter
+    sehingga tidak disimpan.
+    """
+
+    def __init__(self, df):
+        kode, self.label = [], []
+        for col in SUMBU + ["Metrics"]:
+            k, lab = _kode(df[col])
+            kode.append(k)
+            self.label.append(lab)
+        self.dtype_dimensi = df["Dimensi"].dtype
+        self.dtype_metrics = df["Metrics"].dtype
+
+        self.shape = tuple(len(lab) for lab in self.label[:3]) + (
+            len(self.label[3]) + 1,
+        )
+        kode[3] = np.where(kode[3] < 0, self.shape[3] - 1, kode[3])
+
+        ada = (kode[0] >= 0) & (kode[1] >= 0) & (kode[2] >= 0)
+        flat = np.ravel_multi_index([k[ada] for k in kode], self.shape)
+        nilai = df["Value"].to_numpy(dtype="float64")[ada]
+        valid = ~np.isnan(nilai)
+
+        n = int(np.prod(self.shape))
+        base = {
+            "sum": np.bincount(flat[valid], nilai[valid], n),
+            "rows": np.bincount(flat, minlength=n),
+            "valid": np.bincount(flat[valid], minlength=n),
+        }
+        base = {k: v.reshape(self.shape) for k, v in base.items()}
+
+        # Rollup: setiap subset sumbu filter yang dijumlahkan penuh
+        self._rollup = {}
+        for r in range(4):
+            for axes in itertools.combinations(range(3), r):
+                self._rollup[axes] = {
+                    k: v.sum(axis=axes, keepdims=True) if axes else v
+                    for k, v in base.items()
+                }
+
+    @classmethod
+    def cells(cls, df):
+        """Jumlah sel cube untuk df (untuk cek batas sebelum build)."""
+        n = 1
+        for col in SUMBU:
+            n *= df[col].nunique(dropna=True)
+        return n * (df["Metrics"].nunique(dropna=True) + 1)
+
+    @property
+    def nbytes(self):
+        return sum(
+            a.nbytes for level in self._rollup.values() for a in level.values()
+        )
+
+    def _slice(self, per, kp, dim, per_dimensi=False):
+        """
+        Array sum / rows / valid (Dimensi x Metrics) untuk filter. Sumbu yang
+        terpilih semua diambil dari level rollup; Dimensi hanya dirinci
+        jika per_dimensi.
+        """
+        idx = []
+        for lab, pilih in zip(self.label[:3], (per, kp, dim)):
+            pos = lab.get_indexer(list(pilih))
+            idx.append(np.unique(pos[pos >= 0]))
+
+        penuh = tuple(
+            a for a in range(3)
+            if len(idx[a]) == self.shape[a] and not (a == 2 and per_dimensi)
+        )
+        level = self._rollup[penuh]
+
+        out = {}
+        for k, v in level.items():
+            for a in range(3):
+                if a not in penuh:
+                    v = v.take(idx[a], axis=a)
+            # Dimensi dipertahankan, Periode & KUR/PEN/KPP dijumlahkan
+            out[k] = v.sum(axis=(0, 1))
+        out["dimensi"] = idx[2]
+        return out
+
+    def count(self, per, kp, dim):
+        return int(self._slice(per, kp, dim)["rows"].sum())
+
+    def agg_dimensi(self, kind, per, kp, dim):
+        s = self._slice(per, kp, dim, per_dimensi=True)
+        total = s["sum"].sum(axis=1)
+        ada = s["valid"].sum(axis=1) > 0
+
+        dimensi = self.label[2][s["dimensi"][ada]]
+        if isinstance(self.dtype_dimensi, pd.CategoricalDtype):
+            dimensi = pd.Categorical(dimensi, dtype=self.dtype_dimensi)
+        # Pembersihan kota / tenor numerik tetap lewat agg_dimensi pandas
+        return agg_dimensi(
+            pd.DataFrame({"Dimensi": dimensi, "Value": total[ada]}), kind
+        )
+
+    def agg_metrics(self, per, kp, dim):
+        s = self._slice(per, kp, dim)
+        total = s["sum"].sum(axis=0)[:-1]
+        ada = s["rows"].sum(axis=0)[:-1] > 0
+
+        metrics = self.label[3][ada]
+        if isinstance(self.dtype_metrics, pd.CategoricalDtype):
+            metrics = pd.Categorical(metrics, dtype=self.dtype_metrics)
+        return kolom_metrics(
+            pd.DataFrame({"Metrics": metrics, "Total_Value": total[ada]})
+        )
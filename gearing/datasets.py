@@ -0,0 +1,182 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from gearing.ingest import Dibatalkan
+from gearing.profiling import stage
+
+DEFAULT_MAX_MB = 1024
+
+MB = 1024 ** 2
+
+
+def ukuran(value):
+    """Perkiraan byte dataset (DataFrame / array / tuple / list / dict / objek)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(ukuran(v) for v in value)
+    if isinstance(value, dict):
+        return sum(ukuran(v) for v in value.values())
+    if hasattr(value, "__dict__"):
+        return sum(ukuran(v) for v in vars(value).values())
+    return 0
+
+
+def _bagikan(value):
+    """
+    Salinan dangkal untuk diserahkan ke sesi: kolom/baris DataFrame
+    dipakai bersama (copy-on-write), tetapi menambah / mengganti kolom di
+    satu sesi tidak mengubah dataset milik sesi lain.
+    """
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_bagikan(v) for v in value)
+    if isinstance(value, list):
+        return [_bagikan(v) for v in value]
+    return value
+
+
+class _Flight:
+    """Satu parse yang sedang berjalan; sesi lain menunggu hasilnya."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        # Parse pemilik dibatalkan (bukan gagal): penunggu mengulang sendiri
+        self.batal = False
+
+
+# ===============================
+# CACHE DATASET LINTAS SESI
+# ===============================
+class DatasetCache:
+    """
+    Dataset hasil parse (dikunci hash isi file + jenis) dipakai bersama
+    semua sesi dalam satu proses. Upload file yang sama secara bersamaan
+    hanya diparse sekali (single-flight): sesi lain menunggu parse yang
+    sedang berjalan. Entri paling lama tidak dipakai dibuang saat total
+    ukuran melewati max_bytes; entri terbaru selalu disimpan.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_MB * MB):
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> (value, byte)
+        self._flight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_bytes=int(
+                float(os.environ.get("GEARING_DATASET_MAX_MB", DEFAULT_MAX_MB))
+                * MB
+            )
+        )
+
+    def get_or_load(self, key, loader, *args, **kwargs):
+        """
+        Dataset untuk key dari cache, atau hasil loader(*args, **kwargs).
+        Jika parse yang ditunggu dibatalkan pemiliknya (Dibatalkan),
+        penunggu tidak ikut gagal: ia mengulang, menjadi pemilik baru bila
+        belum ada parse lain untuk key tersebut.
+        """
+        while True:
+            with self._lock:
+                item = self._data.get(key)
+                if item is not None:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return _bagikan(item[0])
+
+                flight = self._flight.get(key)
+                pemilik = flight is None
+                if pemilik:
+                    flight = self._flight[key] = _Flight()
+                    self.misses += 1
+                else:
+                    self.waits += 1
+
+            if pemilik:
+                return _bagikan(self._muat(key, flight, loader, args, kwargs))
+
+            with stage("tunggu_parse"):
+                flight.done.wait()
+            if flight.batal:
+                continue
+            if flight.error is not None:
+                raise flight.error
+            return _bagikan(flight.value)
+
+    def _muat(self, key, flight, loader, args, kwargs):
+        ok = False
+        try:
+            flight.value = loader(*args, **kwargs)
+            ok = True
+        except Dibatalkan as e:
+            flight.error, flight.batal = e, True
+            raise
+        except Exception as e:
+            # Error tidak di-cache; sesi yang menunggu menerima error yang sama
+            flight.error = e
+            raise
+        finally:
+            if not ok and flight.error is None:
+                # BaseException (mis. thread script dihentikan): anggap batal
+                flight.error = RuntimeError("Parse dataset dibatalkan")
+                flight.batal = True
+            # Ukuran (deep) dihitung di luar lock
+            nbytes = ukuran(flight.value) if ok else 0
+            with self._lock:
+                del self._flight[key]
+                if ok:
+                    self._simpan(key, flight.value, nbytes)
+            flight.done.set()
+        return flight.value
+
+    def _simpan(self, key, value, nbytes):
+        self._data[key] = (value, nbytes)
+        self._data.move_to_end(key)
+        while len(self._data) > 1 and self.nbytes > self.max_bytes:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def nbytes(self):
+        return sum(b for _, b in self._data.values())
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "mb": self.nbytes / MB,
+                "hits": self.hits,
+                "misses": self.misses,
+                "waits": self.waits,
+                "evictions": self.evictions,
+            }
+
+
+# Satu cache per proses, dipakai bersama semua sesi dashboard
+DATASETS = DatasetCache.from_env()
@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+
+DEFAULT_MAX_POINTS = 1500
+DEFAULT_WEBGL_POINTS = 1000
+
+METODE = ("lttb", "minmax")
+
+
+def max_points():
+    """Batas titik per grafik sebelum downsampling (GEARING_MAX_POINTS)."""
+    return int(os.environ.get("GEARING_MAX_POINTS", DEFAULT_MAX_POINTS))
+
+
+def webgl_points():
+    """Di atas jumlah titik ini trace dirender WebGL (GEARING_WEBGL_POINTS)."""
+    return int(os.environ.get("GEARING_WEBGL_POINTS", DEFAULT_WEBGL_POINTS))
+
+
+# ===============================
+# LARGEST TRIANGLE THREE BUCKETS
+# ===============================
+def lttb_indices(y, n_out):
+    """
+    Posisi titik terpilih LTTB (x = urutan periode 0..n-1).
+    Titik pertama & terakhir selalu ikut; tiap bucket menyumbang satu titik
+    dengan segitiga terbesar terhadap titik sebelumnya & rata-rata bucket
+    berikutnya.
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype="float64")
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+
+    pilih = np.empty(n_out, dtype=np.intp)
+    pilih[0], pilih[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+
+        area = np.abs(
+            (x[a] - cx) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (cy - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        pilih[i + 1] = a
+    return pilih
+
+
+# ===============================
+# MIN / MAX PER BUCKET
+# ===============================
+def minmax_indices(y, n_out):
+    """Posisi min & max tiap bucket (n_out // 2 bucket), urut periode."""
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.intp)
+    pilih = [0, n - 1]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            pilih += [lo + int(np.argmin(y[lo:hi])), lo + int(np.argmax(y[lo:hi]))]
+    return np.unique(pilih)
+
+
+# ===============================
+# DOWNSAMPLE SERI GRAFIK
+# ===============================
+def downsample(df, y, n_out=None, metode="lttb"):
+    """
+    Kurangi baris df (urut periode) menjadi sekitar n_out titik untuk kolom y.
+    Titik NaN dilewati, puncak & lembah global selalu dipertahankan.
+    Return (df_plot, jumlah_titik_asli).
+    """
+    n = len(df)
+    if n_out is None:
+        n_out = max_points()
+    if metode not in METODE or n <= n_out:
+        return df, n
+
+    nilai = df[y].to_numpy(dtype="float64")
+    valid = np.flatnonzero(np.isfinite(nilai))
+    if len(valid) <= n_out:
+        return df.iloc[valid], n
+
+    cari = lttb_indices if metode == "lttb" else minmax_indices
+    pos = valid[cari(nilai[valid], n_out)]
+    puncak = valid[[np.argmax(nilai[valid]), np.argmin(nilai[valid])]]
+    return df.iloc[np.union1d(pos, puncak)], n
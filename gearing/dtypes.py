@@ -0,0 +1,53 @@
+import pandas as pd
+
+# ===============================
+# KOLOM YANG DIRINGKAS
+# ===============================
+KOLOM_KATEGORI = [
+    "Periode", "Periode_Raw", "Periode_Label", "Bulan_Nama", "Jenis",
+    "KUR/PEN/KPP", "Dimensi", "Metrics",
+]
+
+KOLOM_INT = {
+    "Year": "int16",
+    "Month": "int8",
+    "SortKey": "int32",
+    "Is_Audited": "int8",
+}
+
+
+def compact_frame(df):
+    """
+    Kolom teks berulang -> category, Year/Month/SortKey/Is_Audited -> integer
+    kecil. Kolom yang tidak ada atau berisi NaN (untuk integer) dilewati.
+    """
+    ubah = {}
+    for col in KOLOM_KATEGORI:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+                ubah[col] = "category"
+
+    for col, dtype in KOLOM_INT.items():
+        if col in df.columns and df[col].notna().all():
+            ubah[col] = dtype
+
+    return df.astype(ubah) if ubah else df
+
+
+# ===============================
+# LAPORAN MEMORI
+# ===============================
+def memory_report(before, after):
+    """Ukuran per kolom (MB, deep) sebelum & sesudah compact_frame."""
+    mb = 1024 ** 2
+    b = before.memory_usage(deep=True, index=False) / mb
+    a = after.memory_usage(deep=True, index=False) / mb
+    out = pd.DataFrame({
+        "dtype_before": before.dtypes.astype(str),
+        "dtype_after": after.dtypes.reindex(before.columns).astype(str),
+        "MB_before": b,
+        "MB_after": a.reindex(b.index),
+    })
+    out.loc["TOTAL", ["MB_before", "MB_after"]] = [b.sum(), a.sum()]
+    out["ratio"] = out["MB_before"] / out["MB_after"]
+    return out
@@ -0,0 +1,61 @@
+import numpy as np
+
+from gearing.parsing import bulan_id
+
+BULAN_KODE = {nama: kode for kode, nama in bulan_id.items()}
+
+
+# ===============================
+# INDEX PERIODE (TAHUN x BULAN)
+# ===============================
+class PeriodIndex:
+    """
+    Index filter Tahun/Bulan yang dibangun sekali per dataset.
+
+    Baris dikelompokkan per SortKey (urutan asli dalam satu SortKey
+    dipertahankan), sehingga setiap periode adalah satu rentang posisi.
+    Pilihan filter cukup dicocokkan ke daftar periode unik (puluhan / ratusan
+    elemen), lalu rentang yang terpilih digabung menjadi posisi baris.
+    """
+
+    def __init__(self, df):
+        sk = df["SortKey"].to_numpy()
+        self.n = len(sk)
+
+        if self.n and (np.diff(sk) >= 0).all():
+            self.order = None  # sudah urut, rentang = slice langsung
+            sk_urut = sk
+        else:
+            self.order = np.argsort(sk, kind="stable")
+            sk_urut = sk[self.order]
+
+        self.keys, self.start = np.unique(sk_urut, return_index=True)
+        self.end = np.append(self.start[1:], self.n)
+        self.year = self.keys // 100
+        self.month = self.keys % 100
+
+    @property
+    def tahun(self):
+        return [int(y) for y in np.unique(self.year)]
+
+    def positions(self, years, months):
+        """
+        Posisi baris untuk Tahun x Bulan terpilih. Bulan boleh kode (1-12)
+        atau nama ("Jan", "Mei", ...). None berarti semua baris.
+        """
+        months = [BULAN_KODE.get(m, m) for m in months]
+        pilih = np.isin(self.year, list(years)) & np.isin(self.month, months)
+
+        if pilih.all():
+            return None
+
+        rentang = [
+            np.arange(s, e) for s, e in zip(self.start[pilih], self.end[pilih])
+        ]
+        pos = np.concatenate(rentang) if rentang else np.empty(0, dtype=np.intp)
+        return pos if self.order is None else self.order[pos]
+
+    def apply(self, df, years, months):
+        """Subset df untuk filter Tahun/Bulan (df sendiri jika semua terpilih)."""
+        pos = self.positions(years, months)
+        return df if pos is None else df.iloc[pos]
@@ -0,0 +1,153 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+DEFAULT_WORKERS = 2
+
+
+class Dibatalkan(Exception):
+    """Parse dihentikan karena upload diganti atau ditinggalkan semua sesi."""
+
+
+# ===============================
+# SATU PARSE DI WORKER
+# ===============================
+class ParseJob:
+    """
+    Satu parse dataset yang berjalan di thread pool. Worker melaporkan
+    progress lewat progress(); panggilan yang sama juga titik pembatalan:
+    setelah cancel() parse berhenti di laporan berikutnya (antar sheet /
+    chunk), bukan di tengah pembacaan satu sheet.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.future = None
+        self.selesai = 0
+        self.total = None
+        self.pesan = "Menunggu antrean parse..."
+        self._batal = threading.Event()
+        self._peminat = set()
+
+    def progress(self, selesai, total=None, pesan=""):
+        if self._batal.is_set():
+            raise Dibatalkan(f"Parse {self.key} dibatalkan")
+        self.selesai, self.total = selesai, total
+        if pesan:
+            self.pesan = pesan
+
+    @property
+    def fraksi(self):
+        """Bagian yang selesai (0..1), None jika total belum diketahui."""
+        if not self.total:
+            return None
+        return min(self.selesai / self.total, 1.0)
+
+    def cancel(self):
+        self._batal.set()
+        self.future.cancel()  # belum mulai: tidak pernah dijalankan
+
+    @property
+    def cancelled(self):
+        return self._batal.is_set()
+
+    def done(self):
+        return self.future.done()
+
+    def wait(self, timeout=None):
+        """Tunggu sampai selesai paling lama timeout detik; True jika selesai."""
+        wait([self.future], timeout)
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+
+# ===============================
+# THREAD POOL PARSE (PER PROSES)
+# ===============================
+class IngestPool:
+    """
+    Thread pool untuk parse upload agar script Streamlit tetap bisa
+    menampilkan header & progress. Satu job per key dataset: sesi yang
+    mengupload file yang sama ikut menunggu job yang sudah ada. Setiap sesi
+    punya paling banyak satu job; upload baru di sesi itu melepas job lama,
+    dan job yang tidak lagi ditunggu sesi mana pun dibatalkan.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="gearing-parse"
+        )
+        self._jobs = {}  # key -> ParseJob yang masih berjalan
+        self._sesi = {}  # id sesi -> ParseJob yang ditunggu
+        self._lock = threading.Lock()
+        self.cancelled = 0
+
+    @classmethod
+    def from_env(cls):
+        workers = int(os.environ.get("GEARING_PARSE_WORKERS", DEFAULT_WORKERS))
+        return cls(workers=max(1, workers))
+
+    def submit(self, key, sesi, loader, *args, **kwargs):
+        """
+        Jalankan loader(*args, progress=job.progress, **kwargs) di worker,
+        atau pakai job yang sedang berjalan untuk key yang sama.
+        """
+        with self._lock:
+            lama = self._sesi.get(sesi)
+            if lama is not None and lama.key != key:
+                self._lepas(lama, sesi)
+
+            job = self._jobs.get(key)
+            if job is None or job.cancelled:
+                job = ParseJob(key)
+                # Context (profiler aktif) ikut ke worker
+                ctx = contextvars.copy_context()
+                job.future = self._pool.submit(
+                    ctx.run, self._jalan, job, loader, args, kwargs
+                )
+                self._jobs[key] = job
+            job._peminat.add(sesi)
+            self._sesi[sesi] = job
+        return job
+
+    def _jalan(self, job, loader, args, kwargs):
+        try:
+            job.progress(0)
+            return loader(*args, progress=job.progress, **kwargs)
+        finally:
+            with self._lock:
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+
+    def _lepas(self, job, sesi):
+        job._peminat.discard(sesi)
+        if self._sesi.get(sesi) is job:
+            del self._sesi[sesi]
+        if not job._peminat and not job.done():
+            job.cancel()
+            self.cancelled += 1
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+
+    def release(self, sesi):
+        """Sesi tidak lagi menunggu job-nya (upload dihapus / hasil diambil)."""
+        with self._lock:
+            job = self._sesi.get(sesi)
+            if job is not None:
+                self._lepas(job, sesi)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": len(self._jobs),
+                "cancelled": self.cancelled,
+            }
+
+
+# Satu pool per proses, dipakai bersama semua sesi dashboard
+INGEST = IngestPool.from_env()
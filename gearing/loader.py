@@ -0,0 +1,196 @@
+import importlib.util
+import os
+
+import pandas as pd
+
+from gearing.parsing import detect_locale, parse_value_series
+from gearing.profiling import stage
+
+HAS_CALAMINE = importlib.util.find_spec("python_calamine") is not None
+
+# Jumlah baris awal untuk menebak format angka Value (CSV maupun xlsx)
+LOCALE_SAMPLE = 1000
+
+
+# ===============================
+# CSV DENGAN SEPARATOR LOKAL
+# ===============================
+def csv_read_kwargs(file, value_col="Value", sample=LOCALE_SAMPLE):
+    """
+    Intip sampel CSV: return (argumen pd.read_csv, locale kolom Value).
+    Value dan kolom periode dibaca sebagai teks; kolom lain diparse biasa
+    oleh pandas. Separator lokal hanya berlaku untuk Value (lihat
+    value_lokal), tidak untuk seluruh file.
+    """
+    head = pd.read_csv(file, nrows=sample, dtype=str)
+    if hasattr(file, "seek"):
+        file.seek(0)
+
+    if value_col not in head.columns:
+        return {}, None
+
+    # Kolom periode tetap teks agar "31.12.2024" tidak terbaca sebagai ribuan
+    teks = {head.columns[0], value_col} | ({"Periode"} & set(head.columns))
+    return {"dtype": {c: str for c in teks}}, detect_locale(head[value_col])
+
+
+def value_lokal(df, locale, value_col="Value"):
+    """Parse kolom Value dengan locale yang dideteksi sekali per file."""
+    if locale is not None and value_col in df.columns:
+        with stage("parse_value"):
+            df[value_col] = parse_value_series(df[value_col], locale)
+    return df
+
+
+def read_csv_lokal(file, value_col="Value"):
+    kwargs, locale = csv_read_kwargs(file, value_col)
+    with stage("read_csv"):
+        df = pd.read_csv(file, **kwargs)
+    return value_lokal(df, locale, value_col)
+
+
+# ===============================
+# ENGINE EXCEL
+# ===============================
+def available_excel_engines():
+    return (["calamine"] if HAS_CALAMINE else []) + ["openpyxl"]
+
+
+def excel_engine(nama=None):
+    """
+    Engine xlsx dari argumen atau GEARING_EXCEL_ENGINE (auto / calamine /
+    openpyxl). auto memakai calamine (python-calamine, parser Rust) jika
+    terpasang; engine yang tidak terpasang jatuh ke openpyxl.
+    """
+    nama = (nama or os.environ.get("GEARING_EXCEL_ENGINE", "auto")).lower()
+    pilihan = available_excel_engines()
+    return nama if nama in pilihan else pilihan[0]
+
+
+def _coba_engine(file, engine, baca):
+    """baca(engine); jika engine cepat gagal, ulangi dengan openpyxl."""
+    engine = excel_engine(engine)
+    try:
+        return baca(engine)
+    except Exception:
+        if engine == "openpyxl":
+            raise
+        if hasattr(file, "seek"):
+            file.seek(0)
+        return baca("openpyxl")
+
+
+def read_excel(file, engine=None, **kwargs):
+    """pd.read_excel dengan engine pilihan dan fallback ke openpyxl."""
+    return _coba_engine(
+        file, engine, lambda e: pd.read_excel(file, engine=e, **kwargs)
+    )
+
+
+# ===============================
+# VALUE XLSX DENGAN SEPARATOR LOKAL
+# ===============================
+# Value dibaca apa adanya (angka tetap angka, teks tetap teks); tanpa ini
+# pandas mengubah teks "1.234" menjadi 1.234 sebelum locale diketahui
+VALUE_XLSX = {"Value": object}
+
+
+def excel_locale(df, value_col="Value", sample=LOCALE_SAMPLE):
+    """
+    Locale teks Value dari sample baris pertama sheet; None jika tidak ada
+    kolom Value. Dipakai mode penuh dan streaming agar hasilnya sama.
+    """
+    if value_col not in df.columns:
+        return None
+    head = df[value_col].iloc[:sample]
+    return detect_locale(head[head.map(lambda v: isinstance(v, str))])
+
+
+def excel_value_lokal(df, value_col="Value"):
+    return value_lokal(df, excel_locale(df, value_col), value_col)
+
+
+# ===============================
+# LOAD FILE (CSV / XLSX)
+# ===============================
+def _nama(file):
+    return str(getattr(file, "name", file)).lower()
+
+
+def is_csv(file):
+    return _nama(file).endswith(".csv")
+
+
+def load_table(file, engine=None):
+    """Load satu tabel (CSV, atau sheet pertama xlsx)."""
+    if is_csv(file):
+        return read_csv_lokal(file)
+    with stage("read_excel"):
+        df = read_excel(file, engine, dtype=VALUE_XLSX)
+    return excel_value_lokal(df)
+
+
+def sheet_names(file, engine=None):
+    if is_csv(file):
+        return ["CSV"]
+    with _coba_engine(file, engine, lambda e: pd.ExcelFile(file, engine=e)) as xl:
+        return xl.sheet_names
+
+
+def load_sheet(file, sheet=None, engine=None):
+    if is_csv(file):
+        return read_csv_lokal(file)
+    with stage("read_excel", sheet=sheet):
+        df = read_excel(file, engine, sheet_name=sheet, dtype=VALUE_XLSX)
+    if isinstance(df, dict):  # sheet None: semua sheet
+        return {nama: excel_value_lokal(d) for nama, d in df.items()}
+    return excel_value_lokal(df)
+
+
+def iter_workbook(file, engine=None):
+    """
+    Sheet satu per satu dari satu kali buka workbook: return (daftar nama
+    sheet, generator (nama, DataFrame)). Pemanggil bisa melaporkan progress
+    atau berhenti di antara sheet. CSV dianggap satu sheet bernama "CSV".
+    """
+    if hasattr(file, "seek"):
+        file.seek(0)
+    if is_csv(file):
+        return ["CSV"], iter([("CSV", read_csv_lokal(file))])
+
+    xl = _coba_engine(file, engine, lambda e: pd.ExcelFile(file, engine=e))
+
+    def parse(sheet):
+        nonlocal xl
+        try:
+            return xl.parse(sheet, dtype=VALUE_XLSX)
+        except Exception:
+            if xl.engine == "openpyxl":
+                raise
+            # Sheet yang gagal dibaca engine cepat dibaca ulang dengan openpyxl
+            xl.close()
+            if hasattr(file, "seek"):
+                file.seek(0)
+            xl = pd.ExcelFile(file, engine="openpyxl")
+            return xl.parse(sheet, dtype=VALUE_XLSX)
+
+    def baca():
+        try:
+            for sheet in nama:
+                with stage("read_excel", sheet=sheet):
+                    df = parse(sheet)
+                yield sheet, excel_value_lokal(df)
+        finally:
+            xl.close()
+
+    nama = list(xl.sheet_names)
+    return nama, baca()
+
+
+def load_workbook(file, engine=None):
+    """
+    Semua sheet sekaligus dari satu kali parse workbook
+    (dict nama sheet -> DataFrame, urutan sesuai workbook).
+    CSV dianggap satu sheet bernama "CSV".
+    """
+    return dict(iter_workbook(file, engine)[1])
@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from gearing.profiling import stage
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 3600  # detik
+
+
+def selection_key(values):
+    """Pilihan multiselect -> tuple terurut (urutan klik tidak berpengaruh)."""
+    if values is None:
+        return None
+    return tuple(sorted(set(values), key=lambda v: (type(v).__name__, str(v))))
+
+
+# ===============================
+# MEMO AGREGASI (LRU + TTL)
+# ===============================
+class MemoCache:
+    """
+    Cache hasil fungsi agregasi murni, dikunci dengan
+    (hash dataset, pilihan filter yang dinormalisasi, ...).
+    Dibatasi max_entries (LRU) dan ttl detik; mencatat hit/miss.
+    Nilai yang dikembalikan dipakai bersama: jangan dimodifikasi.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_entries=int(
+                os.environ.get("GEARING_MEMO_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+            ),
+            ttl=float(os.environ.get("GEARING_MEMO_TTL", DEFAULT_TTL)),
+        )
+
+    def get_or_compute(self, key, fn, *args, **kwargs):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and now - item[0] <= self.ttl:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+
+        # Hitung di luar lock agar sesi lain tidak ikut menunggu
+        nama = getattr(fn, "__name__", "<lambda>")
+        with stage(nama if nama != "<lambda>" else "agregasi"):
+            value = fn(*args, **kwargs)
+
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            self._evict(time.monotonic())
+        return value
+
+    def _evict(self, now):
+        expired = [k for k, (t, _) in self._data.items() if now - t > self.ttl]
+        for k in expired:
+            del self._data[k]
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        self.evictions += len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# Satu cache per proses, dipakai bersama semua sesi dashboard
+AGG_CACHE = MemoCache.from_env()
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# ===============================
+# PETA BULAN
+# ===============================
+bulan_map = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4,
+    "may": 5, "mei": 5, "jun": 6, "jul": 7,
+    "aug": 8, "agu": 8, "sep": 9,
+    "oct": 10, "okt": 10,
+    "nov": 11, "dec": 12, "des": 12
+}
+
+bulan_id = {
+    1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr",
+    5: "Mei", 6: "Jun", 7: "Jul", 8: "Agu",
+    9: "Sep", 10: "Okt", 11: "Nov", 12: "Des"
+}
+
+_BULAN_RE = "(" + "|".join(bulan_map) + ")"
+_TAHUN_RE = r"(20\d{2}|\d{2})"
+
+
+# ===============================
+# PARSING PERIODE (PER NILAI UNIK)
+# ===============================
+def _parse_periode_unik(uniq):
+    """Parse daftar periode unik -> (year, month) float64, NaN jika gagal."""
+    text = pd.Series(uniq, dtype=object).astype(str)
+
+    # 1) Format tanggal standar (2024-01-31, Jan 2024, 31/01/2024, ...)
+    dt = pd.to_datetime(text, errors="coerce", format="mixed")
+    year = dt.dt.year.astype("float64")
+    month = dt.dt.month.astype("float64")
+
+    # 2) Fallback nama bulan Indonesia / Inggris + tahun 2 / 4 digit
+    sisa = dt.isna()
+    if sisa.any():
+        low = text[sisa].str.lower()
+        m = low.str.extract(_BULAN_RE, expand=False).map(bulan_map)
+        y = pd.to_numeric(
+            low.str.extract(_TAHUN_RE, expand=False), errors="coerce"
+        )
+        y = y.where(y >= 100, y + 2000)
+
+        ok = m.notna() & y.notna()
+        year[sisa] = y.where(ok).astype("float64")
+        month[sisa] = m.where(ok).astype("float64")
+
+    return year.to_numpy(), month.to_numpy()
+
+
+def parse_periode_series(s):
+    """
+    Parse kolom Periode sekaligus: setiap string unik cukup diparse sekali,
+    lalu hasilnya dipetakan kembali ke seluruh baris lewat kode factorize.
+    Return DataFrame kolom Year & Month (float64, NaN jika tidak dikenali).
+    """
+    codes, uniq = pd.factorize(s)
+
+    year, month = _parse_periode_unik(uniq)
+
+    # kode -1 (NaN) diarahkan ke slot NaN terakhir
+    year = np.append(year, np.nan)[codes]
+    month = np.append(month, np.nan)[codes]
+
+    return pd.DataFrame({"Year": year, "Month": month}, index=s.index)
+
+
+# ===============================
+# DETEKSI FORMAT ANGKA
+# ===============================
+# "id": 516.859.837.493,95  (titik = ribuan, koma = desimal)
+# "en": 516,859,837,493.95  (koma = ribuan, titik = desimal)
+_POLA_ID = r"^[-+]?(?:\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+,\d+)$"
+_POLA_EN = r"^[-+]?(?:\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+\.\d+)$"
+
+SEPARATOR = {
+    "id": {"thousands": ".", "decimal": ","},
+    "en": {"thousands": ",", "decimal": "."},
+}
+
+
+def detect_locale(s, sample=1000):
+    """
+    Tebak format angka kolom teks dari sampel (tersebar merata).
+    Nilai ambigu seperti "1.234" dihitung untuk kedua format;
+    jika seri, default ke format Indonesia.
+    """
+    txt = s.dropna()
+    if txt.empty:
+        return "id"
+    if len(txt) > sample:
+        txt = txt.iloc[:: len(txt) // sample]
+
+    txt = txt.str.strip().str.replace(" ", "", regex=False).dropna()
+    suara_id = txt.str.match(_POLA_ID).sum()
+    suara_en = txt.str.match(_POLA_EN).sum()
+    return "en" if suara_en > suara_id else "id"
+
+
+# ===============================
+# PARSING VALUE (VECTORIZED)
+# ===============================
+def parse_value_series(s, locale=None):
+    """
+    Ubah kolom Value (angka / teks format Indonesia / Inggris) ke float64.
+    Kolom numerik langsung di-cast; teks yang gagal diparse menjadi NaN.
+    """
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype("float64")
+
+    # .str menghasilkan NaN untuk sel non-teks (angka asli dari Excel)
+    try:
+        txt = s.str.strip().str.replace(" ", "", regex=False)
+    except AttributeError:
+        # kolom object tanpa satu pun teks
+        return pd.to_numeric(s, errors="coerce").astype("float64")
+    is_txt = txt.notna()
+
+    out = pd.to_numeric(s.where(~is_txt), errors="coerce").astype("float64")
+    if not is_txt.any():
+        return out
+
+    if locale is None:
+        locale = detect_locale(txt[is_txt])
+    sep = SEPARATOR[locale]
+
+    txt = txt[is_txt].str.replace(sep["thousands"], "", regex=False)
+    if sep["decimal"] != ".":
+        txt = txt.str.replace(sep["decimal"], ".", regex=False)
+
+    out[is_txt] = pd.to_numeric(txt, errors="coerce")
+    return out
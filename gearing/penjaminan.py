@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+from gearing.parsing import parse_value_series
+from gearing.profiling import stage
+
+TRILIUN = 1_000_000_000_000
+
+KOLOM_MINIMAL = 5
+
+
+# ===============================
+# JENIS SHEET
+# ===============================
+def sheet_kind(sheet):
+    """Jenis grafik khusus untuk sebuah sheet (None jika tidak ada)."""
+    s = str(sheet).lower().strip()
+    if s == "proyeksi":
+        return "proyeksi"
+    if s == "tenor":
+        return "tenor"
+    if s == "jenis polis":
+        return "jenis polis"
+    if "jenis kredit" in s:
+        return "jenis kredit"
+    if "bank" in s:
+        return "bank"
+    if "kota" in s:
+        return "kota"
+    return None
+
+
+# ===============================
+# PERSIAPAN SHEET
+# ===============================
+def prepare_sheet(df_raw):
+    """
+    Mapping kolom berdasarkan posisi (Periode, KUR/PEN/KPP, Dimensi)
+    dan parse Value. Return (df, dimensi_label); ValueError jika sheet
+    tidak memenuhi struktur minimal.
+    """
+    if df_raw.empty:
+        raise ValueError("Sheet kosong")
+
+    cols = list(df_raw.columns)
+    if len(cols) < KOLOM_MINIMAL:
+        raise ValueError("Struktur kolom tidak memenuhi standar → dilewati")
+
+    dimensi_label = cols[2]
+
+    df = df_raw.rename(columns={
+        cols[0]: "Periode",
+        cols[1]: "KUR/PEN/KPP",
+        cols[2]: "Dimensi",
+    })
+
+    if "Value" not in df.columns:
+        raise ValueError("Kolom Value tidak ditemukan")
+
+    with stage("parse_value"):
+        df["Value"] = parse_value_series(df["Value"])
+    return df, dimensi_label
+
+
+KOLOM_FILTER = ["Periode", "KUR/PEN/KPP", "Dimensi"]
+
+
+def opsi_filter(df):
+    """Pilihan filter struktural (nilai unik terurut) per kolom KOLOM_FILTER."""
+    return {col: sorted(df[col].dropna().unique()) for col in KOLOM_FILTER}
+
+
+def filter_sheet(df, per, kp, dim):
+    return df[
+        df["Periode"].isin(per) &
+        df["KUR/PEN/KPP"].isin(kp) &
+        df["Dimensi"].isin(dim)
+    ]
+
+
+# ===============================
+# AGREGASI PER DIMENSI
+# ===============================
+def agg_dimensi(df_f, kind):
+    """Total Value per Dimensi untuk sheet tenor / polis / kredit / bank / kota."""
+    d = df_f[["Dimensi", "Value"]]
+
+    if kind == "tenor":
+        # Pastikan tenor numerik & urut
+        d = d.assign(Dimensi=pd.to_numeric(d["Dimensi"], errors="coerce"))
+    elif kind == "kota":
+        # Bersihkan kolom Dimensi (Kota)
+        d = d.assign(Dimensi=d["Dimensi"].astype(str).str.strip())
+        d = d[(d["Dimensi"] != "") & (d["Dimensi"].str.lower() != "nan")]
+
+    d = d.dropna(subset=["Dimensi", "Value"])
+
+    out = (
+        d.groupby("Dimensi", as_index=False, observed=True)
+        .agg(Total_Value=("Value", "sum"))
+    )
+    return urut_dimensi(out, kind)
+
+
+def urut_dimensi(out, kind):
+    """Kota urut nilai terbesar, dimensi lain urut nama / tenor."""
+    if kind == "kota":
+        return out.sort_values("Total_Value", ascending=False)
+    return out.sort_values("Dimensi")
+
+
+# ===============================
+# TOP-N + "LAINNYA" (DIMENSI BESAR)
+# ===============================
+TOP_N_DEFAULT = 20
+LAINNYA = "Lainnya"
+
+
+def top_n_dimensi(df_agg, n=TOP_N_DEFAULT, halaman=0):
+    """
+    Potong hasil agg_dimensi menjadi n bar per halaman, urut Total_Value
+    terbesar (nlargest, tanpa sort penuh). Halaman 0 = Top-N, halaman
+    berikutnya = peringkat n+1.. dst. Semua nilai di luar halaman (peringkat
+    di atas maupun di bawahnya) digabung menjadi satu bar "Lainnya",
+    sehingga jumlah bar selalu sama dengan total. Return dict rows / total /
+    halaman / sisa.
+    """
+    total = len(df_agg)
+    jumlah_halaman = max(1, -(-total // n))
+    halaman = min(max(halaman, 0), jumlah_halaman - 1)
+
+    if total <= n:
+        return {"rows": df_agg, "total": total, "halaman": 1, "sisa": 0}
+
+    atas = df_agg.nlargest((halaman + 1) * n, "Total_Value", keep="first")
+    rows = atas.iloc[halaman * n:].assign(
+        Dimensi=lambda d: d["Dimensi"].astype(str)
+    )
+
+    sisa = total - len(rows)
+    # Total sisa = total semua - total bar di halaman ini
+    nilai_sisa = df_agg["Total_Value"].sum() - rows["Total_Value"].sum()
+    rows = pd.concat(
+        [rows, pd.DataFrame({
+            "Dimensi": [f"{LAINNYA} ({sisa:,})"],
+            "Total_Value": [nilai_sisa],
+        })],
+        ignore_index=True
+    )
+
+    return {
+        "rows": rows,
+        "total": total,
+        "halaman": jumlah_halaman,
+        "sisa": sisa,
+    }
+
+
+def agg_proyeksi(df_f, jenis):
+    """Total Value per Periode untuk Dimensi 'OS Gross' / 'OS Nett'."""
+    d = df_f[
+        df_f["Dimensi"].astype(str).str.lower() == jenis.lower()
+    ].dropna(subset=["Value"])
+
+    return (
+        d.groupby("Periode", as_index=False, observed=True)
+        .agg(Total_Value=("Value", "sum"))
+    )
+
+
+def proyeksi_view(df_f, tenor_col, tenor):
+    """Filter Tenor lalu OS Gross & OS Nett per Periode (sheet Proyeksi)."""
+    d = df_f[df_f[tenor_col].isin(tenor)]
+    return {
+        "rows": len(d),
+        "gross": agg_proyeksi(d, "OS Gross"),
+        "nett": agg_proyeksi(d, "OS Nett"),
+    }
+
+
+# ===============================
+# AGREGASI METRICS
+# ===============================
+def agg_metrics(df_f):
+    """
+    Total Value per Metrics (Rupiah & Triliun) plus pemisahan
+    Finansial / Debitur untuk grafik dual axis.
+    """
+    df_agg = (
+        df_f.groupby("Metrics", as_index=False, observed=True)
+        .agg(Total_Value=("Value", "sum"))
+    )
+    return kolom_metrics(df_agg)
+
+
+def kolom_metrics(df_agg):
+    """Total_T, Jenis, Value_T & Value_Debitur dari total per Metrics."""
+    df_agg = df_agg.copy()
+    df_agg["Total_T"] = df_agg["Total_Value"] / TRILIUN
+
+    debitur = df_agg["Metrics"].astype(str).str.lower().str.contains(
+        "debitur", regex=False
+    )
+    df_agg["Jenis"] = np.where(debitur, "Debitur", "Finansial")
+    df_agg["Value_T"] = df_agg["Total_T"].where(~debitur)
+    df_agg["Value_Debitur"] = df_agg["Total_Value"].where(debitur)
+    return df_agg
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+PREVIEW_ROWS = 100
+
+
+# ===============================
+# PREVIEW PER HALAMAN
+# ===============================
+def preview_page(df, halaman=0, baris=PREVIEW_ROWS):
+    """
+    Satu halaman preview (iloc, tanpa menyalin seluruh frame).
+    Return dict rows / total / halaman (jumlah halaman).
+    """
+    total = len(df)
+    jumlah_halaman = max(1, -(-total // baris))
+    halaman = min(max(halaman, 0), jumlah_halaman - 1)
+    mulai = halaman * baris
+    return {
+        "rows": df.iloc[mulai:mulai + baris],
+        "total": total,
+        "halaman": jumlah_halaman,
+    }
+
+
+def format_value(page, metrics_col=None):
+    """
+    Kolom Value -> teks: "Rp 1,234.50", atau "1,234" untuk baris Metrics
+    yang mengandung 'debitur'. Hanya dijalankan pada satu halaman.
+    """
+    nilai = pd.to_numeric(page["Value"], errors="coerce")
+    ada = nilai.notna().to_numpy()
+
+    if metrics_col is not None and metrics_col in page.columns:
+        debitur = (
+            page[metrics_col].astype(str).str.lower()
+            .str.contains("debitur", regex=False).to_numpy()
+        )
+    else:
+        debitur = np.zeros(len(page), dtype=bool)
+
+    teks = np.full(len(page), "", dtype=object)
+    rp = ada & ~debitur
+    teks[rp] = ["Rp {:,.2f}".format(v) for v in nilai.to_numpy()[rp]]
+    teks[ada & debitur] = [
+        "{:,.0f}".format(v) for v in nilai.to_numpy()[ada & debitur]
+    ]
+    return page.assign(Value=teks)
@@ -0,0 +1,169 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+QUERY_PARAM = "profile"
+AKTIF = ("1", "true", "yes", "on")
+
+MB = 1024 ** 2
+
+# Profiler milik run script yang sedang berjalan (per thread Streamlit)
+_PROFILER = contextvars.ContextVar("gearing_profiler", default=None)
+
+
+def profiling_enabled(query_params=None):
+    """Mode debug aktif lewat GEARING_PROFILE=1 atau query ?profile=1."""
+    if os.environ.get("GEARING_PROFILE", "").lower() in AKTIF:
+        return True
+    nilai = (query_params or {}).get(QUERY_PARAM, "")
+    return str(nilai).lower() in AKTIF
+
+
+def stage(nama, sheet=None):
+    """
+    Context manager pencatat satu tahap pada profiler aktif. Tanpa profiler
+    aktif (mode normal) tidak melakukan apa-apa.
+    """
+    prof = _PROFILER.get()
+    if prof is None:
+        return nullcontext()
+    return prof.stage(nama, sheet)
+
+
+# ===============================
+# TRACEMALLOC BERSAMA (PER PROSES)
+# ===============================
+# tracemalloc global untuk seluruh proses: dinyalakan oleh profiler pertama
+# dan dimatikan oleh profiler terakhir (tidak dimatikan jika sudah aktif
+# dari luar, mis. python -X tracemalloc)
+_TRACE_LOCK = threading.Lock()
+_trace = {"pemakai": 0, "milik": False}
+
+
+def _trace_mulai():
+    with _TRACE_LOCK:
+        if _trace["pemakai"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _trace["milik"] = True
+        _trace["pemakai"] += 1
+
+
+def _trace_selesai():
+    with _TRACE_LOCK:
+        _trace["pemakai"] -= 1
+        if _trace["pemakai"] == 0 and _trace["milik"]:
+            tracemalloc.stop()
+            _trace["milik"] = False
+
+
+def _trace_sendiri():
+    """True jika hanya satu profiler yang memakai tracemalloc saat ini."""
+    with _TRACE_LOCK:
+        return _trace["pemakai"] <= 1
+
+
+# ===============================
+# PROFILER PER RUN
+# ===============================
+class Profiler:
+    """
+    Waktu (ms) dan alokasi memori tracemalloc (MB) per tahap, boleh
+    bersarang. Tahap anak mewarisi sheet induknya. Catatan urut waktu mulai
+    sehingga bisa langsung digambar sebagai waterfall. MB mencakup alokasi
+    seluruh proses (semua sesi & thread) selama tahap berjalan; bersama
+    True jika ada profiler lain aktif sehingga puncaknya tidak bisa dipisah.
+    """
+
+    def __init__(self, memori=True):
+        self.records = []
+        self._stack = []
+        self._t0 = time.perf_counter()
+        self.memori = memori
+        self.bersama = False
+
+    @contextmanager
+    def aktif(self):
+        """Jadikan profiler ini tujuan stage() selama blok berjalan."""
+        if self.memori:
+            _trace_mulai()
+        token = _PROFILER.set(self)
+        try:
+            yield self
+        finally:
+            _PROFILER.reset(token)
+            if self.memori:
+                _trace_selesai()
+
+    def _memori(self):
+        if not self.memori or not tracemalloc.is_tracing():
+            return 0, 0
+        return tracemalloc.get_traced_memory()
+
+    @contextmanager
+    def stage(self, nama, sheet=None):
+        induk = self._stack[-1] if self._stack else None
+        if sheet is None and induk is not None:
+            sheet = induk["sheet"]
+
+        # Puncak induk sampai titik ini disimpan sebelum puncak di-reset
+        cur, peak = self._memori()
+        if induk is not None:
+            induk["_peak"] = max(induk["_peak"], peak)
+        # reset_peak berlaku untuk seluruh proses: hanya saat tidak ada
+        # profiler lain, agar puncak tahap sesi lain tidak ikut terpotong
+        if self.memori and tracemalloc.is_tracing():
+            if _trace_sendiri():
+                tracemalloc.reset_peak()
+            else:
+                self.bersama = True
+
+        rec = {
+            "stage": nama,
+            "sheet": sheet,
+            "depth": len(self._stack),
+            "start_ms": (time.perf_counter() - self._t0) * 1e3,
+            "_cur": cur,
+            "_peak": cur,
+        }
+        self.records.append(rec)
+        self._stack.append(rec)
+        try:
+            yield rec
+        finally:
+            self._stack.pop()
+            akhir, peak = self._memori()
+            rec["_peak"] = max(rec["_peak"], peak)
+            rec["ms"] = (time.perf_counter() - self._t0) * 1e3 - rec["start_ms"]
+            rec["mb"] = (akhir - rec["_cur"]) / MB
+            rec["mb_peak"] = (rec["_peak"] - rec["_cur"]) / MB
+            if induk is not None:
+                induk["_peak"] = max(induk["_peak"], rec["_peak"])
+
+    # ---------------------------------
+    # HASIL
+    # ---------------------------------
+    def frame(self):
+        """Satu baris per tahap selesai: stage, sheet, depth, start_ms, ms, mb, mb_peak."""
+        kolom = ["stage", "sheet", "depth", "start_ms", "ms", "mb", "mb_peak"]
+        rows = [
+            {k: r[k] for k in kolom} for r in self.records if "ms" in r
+        ]
+        return pd.DataFrame(rows, columns=kolom)
+
+    def to_json(self, **meta):
+        return json.dumps(
+            {
+                **meta,
+                "tracemalloc": self.memori,
+                "tracemalloc_bersama": self.bersama,
+                "stages": self.frame().to_dict(orient="records"),
+            },
+            indent=2,
+            default=str,
+        )
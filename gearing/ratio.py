@@ -0,0 +1,143 @@
+import pandas as pd
+
+from gearing.parsing import bulan_id, parse_periode_series, parse_value_series
+from gearing.profiling import stage
+
+# ===============================
+# KELOMPOK JENIS
+# ===============================
+JENIS_KUR = ["KUR Gen 1", "KUR Gen 2"]
+JENIS_PEN = ["PEN Gen 1", "PEN Gen 2"]
+JENIS_KPP = ["KPP Gen 1", "KPP Gen 2"]
+EKUITAS_KUR = "Ekuitas KUR"
+EKUITAS_KPP = "Ekuitas KPP"
+
+SEMUA_JENIS = JENIS_KUR + JENIS_PEN + JENIS_KPP + [EKUITAS_KUR, EKUITAS_KPP]
+
+TRILIUN = 1_000_000_000_000
+
+
+def periode_label(sortkey):
+    """SortKey (YYYYMM) -> label 'Jan 2024'."""
+    sortkey = sortkey.astype(int)
+    return (sortkey % 100).map(bulan_id) + " " + (sortkey // 100).astype(str)
+
+
+# ===============================
+# PERSIAPAN DATA GEARING RATIO
+# ===============================
+REQUIRED_COLS = ["Periode", "Value"]
+
+
+def prepare_gearing_frame(df):
+    """
+    Validasi kolom lalu tambahkan Periode_Raw, Year, Month, SortKey,
+    Periode_Label, Is_Audited dan Value numerik. Baris dengan periode
+    yang tidak dikenali dibuang.
+    """
+    for col in REQUIRED_COLS:
+        if col not in df.columns:
+            raise ValueError(f"Kolom '{col}' tidak ditemukan")
+
+    df = df.copy()
+    df["Periode_Raw"] = df["Periode"].astype(str)
+
+    # Parse per periode unik (vectorized), bukan per baris
+    with stage("parse_periode"):
+        df[["Year", "Month"]] = parse_periode_series(df["Periode_Raw"])
+    df = df.dropna(subset=["Year", "Month"])
+    df["SortKey"] = df["Year"] * 100 + df["Month"]
+
+    df["Periode_Label"] = (
+        df["Month"].map(bulan_id) + " " + df["Year"].astype(int).astype(str)
+    )
+    df["Bulan_Nama"] = df["Month"].map(bulan_id)
+
+    # Flag audited (prioritas saat dedup)
+    df["Is_Audited"] = df["Periode_Raw"].str.contains(
+        "audit", case=False, na=False
+    ).astype(int)
+
+    with stage("parse_value"):
+        df["Value"] = parse_value_series(df["Value"])
+
+    # Urut per periode (stable: urutan asli dalam periode tetap) agar
+    # filter Tahun/Bulan cukup memotong rentang baris
+    return df.sort_values("SortKey", kind="stable").reset_index(drop=True)
+
+
+# ===============================
+# PIVOT SortKey x Jenis (AUDITED PRIORITY)
+# ===============================
+def build_pivot(df):
+    """
+    Satu pivot terdeduplikasi: per (SortKey, Jenis) ambil baris audited
+    jika ada, jika tidak ambil data biasa (baris terakhir).
+    Index SortKey terurut, kolom Periode_Label + satu kolom per Jenis.
+    """
+    d = (
+        df[["SortKey", "Jenis", "Is_Audited", "Value"]]
+        .dropna(subset=["Value"])
+        .sort_values(["SortKey", "Is_Audited"], kind="stable")
+        .drop_duplicates(["SortKey", "Jenis"], keep="last")
+    )
+    # Jenis bisa category; pivot cukup pada label yang benar-benar ada
+    d = d.assign(Jenis=d["Jenis"].astype(str))
+
+    pv = d.pivot(index="SortKey", columns="Jenis", values="Value")
+    pv = pv.reindex(columns=pv.columns.union(SEMUA_JENIS, sort=False))
+    pv.columns.name = None
+    pv.insert(0, "Periode_Label", periode_label(pv.index.to_series()))
+    return pv
+
+
+# ===============================
+# SERIES OUTSTANDING, EKUITAS & GEARING RATIO
+# ===============================
+def _jumlah(pv, jenis):
+    return pv[jenis].sum(axis=1, min_count=1)
+
+
+def _seri_os(pv, nilai, nama):
+    out = pd.DataFrame({
+        "SortKey": pv.index,
+        "Periode_Label": pv["Periode_Label"].to_numpy(),
+        f"{nama}_Rp": nilai.to_numpy(),
+    }).dropna(subset=[f"{nama}_Rp"])
+    out[f"{nama}_T"] = out[f"{nama}_Rp"] / TRILIUN
+    return out.reset_index(drop=True)
+
+
+def _seri_gr(pv, total, ekuitas, nama_total, nama_ratio):
+    out = pd.DataFrame({
+        "Periode_Label": pv["Periode_Label"].to_numpy(),
+        nama_total: total.to_numpy(),
+        "Ekuitas_Rp": ekuitas.to_numpy(),
+    }).dropna(subset=[nama_total])
+    out[nama_ratio] = out[nama_total] / out["Ekuitas_Rp"]
+    return out.reset_index(drop=True)
+
+
+def gearing_series(pv):
+    """Semua series dashboard Gearing Ratio dari aritmetika kolom pivot."""
+    os_kur = _jumlah(pv, JENIS_KUR)
+    os_kpp = _jumlah(pv, JENIS_KPP)
+    os_kur_pen = _jumlah(pv, JENIS_KUR + JENIS_PEN)
+    ekuitas_kur = pv[EKUITAS_KUR]
+    ekuitas_kpp = pv[EKUITAS_KPP]
+
+    return {
+        "os_kur": _seri_os(pv, os_kur, "OS_KUR"),
+        "os_kpp": _seri_os(pv, os_kpp, "OS_KPP"),
+        "ekuitas_kur": _seri_os(pv, ekuitas_kur, "Ekuitas_KUR"),
+        "os_kur_pen": _seri_os(pv, os_kur_pen, "OS_KUR_PEN"),
+        "gr_kur": _seri_gr(
+            pv, os_kur, ekuitas_kur, "KUR_Total_Rp", "Gearing_Ratio"
+        ),
+        "gr_kpp": _seri_gr(
+            pv, os_kpp, ekuitas_kpp, "KPP_Total_Rp", "Gearing_Ratio"
+        ),
+        "gr_kur_pen": _seri_gr(
+            pv, os_kur_pen, ekuitas_kur, "KUR_PEN_Total_Rp", "GR_KUR_PEN"
+        ),
+    }
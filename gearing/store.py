@@ -0,0 +1,216 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from gearing.cache import DEFAULT_DIR
+from gearing.dtypes import compact_frame
+from gearing.filters import BULAN_KODE
+from gearing.parsing import bulan_id
+from gearing.ratio import build_pivot, periode_label
+
+DEFAULT_PATH = os.path.join(DEFAULT_DIR, "store.sqlite")
+
+KOLOM = ["SortKey", "Jenis", "Year", "Month", "Is_Audited", "Value", "Periode_Raw"]
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS gearing (
+    SortKey     INTEGER NOT NULL,
+    Jenis       TEXT    NOT NULL,
+    Year        INTEGER NOT NULL,
+    Month       INTEGER NOT NULL,
+    Is_Audited  INTEGER NOT NULL,
+    Value       REAL    NOT NULL,
+    Periode_Raw TEXT,
+    PRIMARY KEY (SortKey, Jenis)
+);
+CREATE TABLE IF NOT EXISTS ingest (
+    digest  TEXT PRIMARY KEY,
+    rows    INTEGER,
+    changed INTEGER,
+    at      REAL
+);
+"""
+
+# Sama dengan dedup build_pivot: data audited tidak ditimpa data biasa,
+# selain itu upload terbaru menang
+UPSERT = """
+INSERT INTO gearing (SortKey, Jenis, Year, Month, Is_Audited, Value, Periode_Raw)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (SortKey, Jenis) DO UPDATE SET
+    Year = excluded.Year,
+    Month = excluded.Month,
+    Is_Audited = excluded.Is_Audited,
+    Value = excluded.Value,
+    Periode_Raw = excluded.Periode_Raw
+WHERE excluded.Is_Audited >= gearing.Is_Audited
+"""
+
+
+def _dedup(df):
+    """Satu baris per (SortKey, Jenis): audited menang, lalu baris terakhir."""
+    d = df[KOLOM].dropna(subset=["SortKey", "Jenis", "Value"])
+    d = d.assign(
+        Jenis=d["Jenis"].astype(str),
+        Periode_Raw=d["Periode_Raw"].astype(str),
+    )
+    d = d.astype({
+        "SortKey": "int64", "Year": "int64", "Month": "int64",
+        "Is_Audited": "int64", "Value": "float64",
+    })
+    return (
+        d.sort_values(["SortKey", "Is_Audited"], kind="stable")
+        .drop_duplicates(["SortKey", "Jenis"], keep="last")
+    )
+
+
+# ===============================
+# PENYIMPANAN RIWAYAT PERIODE (SQLITE)
+# ===============================
+class PeriodStore:
+    """
+    Riwayat Gearing Ratio ternormalisasi (satu baris per SortKey x Jenis)
+    di SQLite lokal. Upload bulanan cukup di-upsert sebagai delta; pivot
+    hanya dihitung ulang untuk periode yang berubah.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._pivot = None
+        self._versi_pivot = None
+        with closing(self._connect()) as con:
+            con.executescript(SKEMA)
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get("GEARING_STORE_PATH", DEFAULT_PATH))
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @property
+    def version(self):
+        """Naik setiap ada perubahan isi (PRAGMA user_version)."""
+        with closing(self._connect()) as con:
+            return con.execute("PRAGMA user_version").fetchone()[0]
+
+    def has_ingested(self, digest):
+        with closing(self._connect()) as con:
+            return con.execute(
+                "SELECT 1 FROM ingest WHERE digest = ?", (digest,)
+            ).fetchone() is not None
+
+    # ---------------------------------
+    # UPSERT DELTA
+    # ---------------------------------
+    def upsert(self, df, digest=None):
+        """
+        Upsert baris hasil prepare_gearing_frame. Return daftar SortKey
+        yang benar-benar berubah (baru, nilai berbeda, atau jadi audited).
+        """
+        baru = _dedup(df)
+        keys = baru["SortKey"].unique().tolist()
+
+        with self._lock, closing(self._connect()) as con, con:
+            lama = self._rows(con, keys)[["SortKey", "Jenis", "Is_Audited", "Value"]]
+            m = baru.merge(
+                lama, on=["SortKey", "Jenis"], how="left", suffixes=("", "_lama")
+            )
+            # Baris baru: Is_Audited_lama = -1 sehingga selalu ikut
+            audit_lama = m["Is_Audited_lama"].fillna(-1)
+            berubah = (m["Is_Audited"] >= audit_lama) & (
+                (m["Value"] != m["Value_lama"])
+                | (m["Is_Audited"] != audit_lama)
+            )
+            delta = m.loc[berubah, KOLOM]
+
+            versi = con.execute("PRAGMA user_version").fetchone()[0]
+            if len(delta):
+                con.executemany(UPSERT, delta.itertuples(index=False, name=None))
+                con.execute(f"PRAGMA user_version = {versi + 1}")
+            if digest is not None:
+                con.execute(
+                    "INSERT OR REPLACE INTO ingest VALUES (?, ?, ?, ?)",
+                    (digest, len(baru), len(delta), time.time()),
+                )
+
+            changed = sorted(int(k) for k in delta["SortKey"].unique())
+            if changed and self._pivot is not None and self._versi_pivot == versi:
+                self._pivot = self._splice(con, self._pivot, changed)
+                self._versi_pivot = versi + 1
+        return changed
+
+    # ---------------------------------
+    # BACA
+    # ---------------------------------
+    def _rows(self, con, keys=None):
+        sql = f"SELECT {', '.join(KOLOM)} FROM gearing"
+        if keys is None:
+            return pd.read_sql_query(sql + " ORDER BY SortKey", con)
+        # SortKey dikirim lewat tabel sementara (tanpa batas jumlah parameter)
+        con.execute("CREATE TEMP TABLE IF NOT EXISTS _keys (SortKey INTEGER)")
+        con.execute("DELETE FROM _keys")
+        con.executemany("INSERT INTO _keys VALUES (?)", [(int(k),) for k in keys])
+        return pd.read_sql_query(
+            sql + " WHERE SortKey IN (SELECT SortKey FROM _keys) ORDER BY SortKey",
+            con,
+        )
+
+    def frame(self):
+        """Seluruh riwayat dengan kolom seperti prepare_gearing_frame."""
+        with closing(self._connect()) as con:
+            df = self._rows(con)
+        df["Periode_Label"] = periode_label(df["SortKey"])
+        df["Bulan_Nama"] = df["Month"].map(bulan_id)
+        return compact_frame(df)
+
+    def _splice(self, con, pv, changed):
+        # Pivot baru hanya untuk periode yang berubah, sisanya dipakai ulang
+        baru = build_pivot(self._rows(con, changed))
+        pv = pd.concat([pv.drop(index=changed, errors="ignore"), baru])
+        return pv.sort_index()
+
+    def pivot(self, years=None, months=None):
+        """
+        Pivot SortKey x Jenis (sama dengan build_pivot atas seluruh riwayat),
+        opsional dibatasi Tahun / Bulan (kode atau nama bulan).
+        """
+        with self._lock:
+            versi = self.version
+            if self._pivot is None or self._versi_pivot != versi:
+                with closing(self._connect()) as con:
+                    self._pivot = build_pivot(self._rows(con))
+                self._versi_pivot = versi
+            pv = self._pivot
+
+        if years is None and months is None:
+            return pv
+        sk = pv.index.to_numpy()
+        pilih = np.ones(len(sk), dtype=bool)
+        if years is not None:
+            pilih &= np.isin(sk // 100, list(years))
+        if months is not None:
+            pilih &= np.isin(sk % 100, [BULAN_KODE.get(m, m) for m in months])
+        return pv[pilih]
+
+    def stats(self):
+        with closing(self._connect()) as con:
+            baris, periode = con.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT SortKey) FROM gearing"
+            ).fetchone()
+            upload = con.execute("SELECT COUNT(*) FROM ingest").fetchone()[0]
+        return {"rows": baris, "periods": periode, "uploads": upload}
+
+    def clear(self):
+        with self._lock, closing(self._connect()) as con, con:
+            con.execute("DELETE FROM gearing")
+            con.execute("DELETE FROM ingest")
+            versi = con.execute("PRAGMA user_version").fetchone()[0]
+            con.execute(f"PRAGMA user_version = {versi + 1}")
+            self._pivot = None
@@ -0,0 +1,225 @@
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from gearing.loader import (
+    LOCALE_SAMPLE,
+    csv_read_kwargs,
+    excel_locale,
+    is_csv,
+    value_lokal,
+)
+from gearing.penjaminan import prepare_sheet
+from gearing.ratio import prepare_gearing_frame
+
+DEFAULT_CHUNKSIZE = 200_000
+# Baris xlsx ditahan sebagai objek Python sebelum diketik: chunk lebih kecil
+DEFAULT_XLSX_CHUNKSIZE = 50_000
+DEFAULT_STREAM_MB = 100
+# xlsx terkompresi: di memori (openpyxl + DataFrame) bisa 10-20x ukuran file
+DEFAULT_STREAM_XLSX_MB = 20
+
+KUNCI_SHEET = ["Periode", "KUR/PEN/KPP", "Dimensi", "Metrics"]
+
+
+# ===============================
+# KAPAN PAKAI MODE STREAMING
+# ===============================
+def file_size(file):
+    if hasattr(file, "size"):
+        return file.size
+    if hasattr(file, "getbuffer"):
+        return file.getbuffer().nbytes
+    return os.path.getsize(file)
+
+
+def should_stream(file, threshold_mb=None):
+    """
+    File besar dibaca per chunk: CSV di atas GEARING_STREAM_MB (default
+    100 MB), xlsx di atas GEARING_STREAM_XLSX_MB (default 20 MB).
+    """
+    if threshold_mb is None:
+        if is_csv(file):
+            threshold_mb = os.environ.get("GEARING_STREAM_MB", DEFAULT_STREAM_MB)
+        else:
+            threshold_mb = os.environ.get(
+                "GEARING_STREAM_XLSX_MB", DEFAULT_STREAM_XLSX_MB
+            )
+    return file_size(file) > float(threshold_mb) * 1024 ** 2
+
+
+def iter_csv_chunks(file, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Chunk CSV; Value setiap chunk diparse dengan locale yang dideteksi dari
+    sampel awal file (sama dengan read_csv_lokal).
+    """
+    kwargs, locale = csv_read_kwargs(file)
+    with pd.read_csv(file, chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            yield value_lokal(chunk, locale)
+
+
+# ===============================
+# XLSX PER CHUNK (OPENPYXL READ-ONLY)
+# ===============================
+def _nilai_sel(v, kode_error):
+    # Sama dengan konversi sel pandas (_OpenpyxlReader._convert_cell) untuk
+    # nilai read_only values_only: sel error datang sebagai teks kode error
+    if v is None:
+        return ""
+    if type(v) is float:
+        return int(v) if v.is_integer() else v
+    if type(v) is str and v in kode_error:
+        return np.nan
+    return v
+
+
+def _baris(row, kode_error):
+    nilai = [_nilai_sel(v, kode_error) for v in row]
+    while nilai and nilai[-1] == "":
+        nilai.pop()
+    return nilai
+
+
+def _chunk_frame(header, rows, value_col="Value"):
+    # Baris dilebarkan ke lebar terlebar lalu diketik oleh TextParser dengan
+    # argumen yang sama seperti load_sheet (Value dibaca apa adanya, lihat
+    # VALUE_XLSX); angkanya diparse dengan locale sheet, bukan per chunk.
+    lebar = max(len(header), *(len(r) for r in rows))
+    data = [r + [""] * (lebar - len(r)) for r in [header, *rows]]
+    dtype = {value_col: object} if value_col in header else None
+    return TextParser(data, header=0, skip_blank_lines=False, dtype=dtype).read()
+
+
+def iter_xlsx_chunks(file, sheet=None, chunksize=DEFAULT_XLSX_CHUNKSIZE):
+    """
+    Chunk satu sheet xlsx (default sheet pertama) lewat openpyxl read_only:
+    baris dibaca berurutan dari XML dan hanya chunksize baris yang ditahan
+    di memori. Tipe kolom & Value per chunk sama dengan load_sheet: locale
+    Value ditebak dari LOCALE_SAMPLE baris pertama, sehingga chunk pertama
+    paling sedikit sepanjang itu.
+    """
+    # openpyxl baru diimpor saat dibutuhkan (startup dashboard)
+    from openpyxl import load_workbook
+    from openpyxl.cell.cell import ERROR_CODES
+
+    if hasattr(file, "seek"):
+        file.seek(0)
+    wb = load_workbook(file, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb[sheet] if sheet is not None else wb.worksheets[0]
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header = _baris(next(rows, ()), ERROR_CODES)
+        buffer, kosong = [], 0
+        batas, locale = max(chunksize, LOCALE_SAMPLE), None
+
+        def chunk():
+            nonlocal locale
+            df = _chunk_frame(header, buffer)
+            if locale is None:
+                locale = excel_locale(df)
+            return value_lokal(df, locale)
+
+        for row in rows:
+            nilai = _baris(row, ERROR_CODES)
+            if not nilai:
+                # Baris kosong di akhir sheet dibuang seperti pd.read_excel
+                kosong += 1
+                continue
+            buffer += [[]] * kosong + [nilai]
+            kosong = 0
+            if len(buffer) >= batas:
+                yield chunk()
+                buffer, batas = [], chunksize
+        if buffer:
+            yield chunk()
+    finally:
+        wb.close()
+
+
+def iter_chunks(file, sheet=None, chunksize=None):
+    """Chunk CSV atau satu sheet xlsx (chunksize None: default per format)."""
+    if is_csv(file):
+        return iter_csv_chunks(file, chunksize or DEFAULT_CHUNKSIZE)
+    return iter_xlsx_chunks(file, sheet, chunksize or DEFAULT_XLSX_CHUNKSIZE)
+
+
+# ===============================
+# GEARING RATIO: LAST PER SortKey x Jenis
+# ===============================
+def _reduce_last(df):
+    # Sama dengan dedup build_pivot: audited menang, lalu baris terakhir.
+    # Asosiatif, jadi aman digabung bertahap per chunk.
+    return (
+        df.dropna(subset=["Value"])
+        .sort_values(["SortKey", "Is_Audited"], kind="stable")
+        .drop_duplicates(["SortKey", "Jenis"], keep="last")
+    )
+
+
+def stream_gearing(file, chunksize=None, progress=None):
+    """
+    Versi streaming load_table + prepare_gearing_frame untuk CSV / xlsx besar.
+    Hanya satu baris per (SortKey, Jenis) yang disimpan, sehingga memori
+    dibatasi ukuran chunk, bukan ukuran file. Hasilnya langsung bisa
+    dipakai build_pivot dan filter Tahun/Bulan.
+    """
+    hasil = None
+    baris = 0
+    for chunk in iter_chunks(file, chunksize=chunksize):
+        part = _reduce_last(prepare_gearing_frame(chunk))
+        hasil = part if hasil is None else _reduce_last(
+            pd.concat([hasil, part], ignore_index=True)
+        )
+        baris += len(chunk)
+        if progress:
+            progress(baris)
+
+    if hasil is None:
+        raise ValueError("File kosong")
+    return hasil.sort_values("SortKey", kind="stable").reset_index(drop=True)
+
+
+# ===============================
+# PENJAMINAN: SUM PER Periode x KUR/PEN/KPP x Dimensi x Metrics
+# ===============================
+def _kunci(df):
+    # 4 kolom pertama (Periode, KUR/PEN/KPP, Dimensi, Tenor/Metrics) + Metrics
+    kunci = list(dict.fromkeys([*df.columns[:4], *KUNCI_SHEET]))
+    return [c for c in kunci if c in df.columns and c != "Value"]
+
+
+def _reduce_sum(df, kunci):
+    return (
+        df.groupby(kunci, dropna=False, sort=False, observed=True)["Value"]
+        .sum(min_count=1)
+        .reset_index()
+    )
+
+
+def stream_sheet(file, sheet=None, chunksize=None, progress=None):
+    """
+    Versi streaming prepare_sheet untuk CSV / sheet xlsx penjaminan besar:
+    setiap chunk dipetakan & diparse lalu dijumlahkan per kunci struktural.
+    Return (df, dimensi_label) seperti prepare_sheet.
+    """
+    hasil, label, kunci = None, None, None
+    baris = 0
+    for chunk in iter_chunks(file, sheet, chunksize):
+        df, label = prepare_sheet(chunk)
+        if kunci is None:
+            kunci = _kunci(df)
+        part = _reduce_sum(df, kunci)
+        hasil = part if hasil is None else _reduce_sum(
+            pd.concat([hasil, part], ignore_index=True), kunci
+        )
+        baris += len(chunk)
+        if progress:
+            progress(baris)
+
+    if hasil is None:
+        raise ValueError("Sheet kosong")
+    return hasil, label
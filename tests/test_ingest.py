@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from gearing.datasets import DatasetCache
+from gearing.ingest import Dibatalkan, IngestPool
+
+
+def tunggu(kondisi, batas=5):
+    akhir = time.monotonic() + batas
+    while not kondisi():
+        assert time.monotonic() < akhir, "timeout"
+        time.sleep(0.005)
+
+
+def test_sesi_lain_tidak_ikut_batal():
+    """
+    Sesi A melepas parse K di tengah jalan lalu sesi B mengupload K:
+    job B menunggu flight A yang dibatalkan, lalu harus mem-parse sendiri.
+    """
+    pool, datasets = IngestPool(workers=2), DatasetCache()
+    mulai, gerbang = threading.Event(), threading.Event()
+    panggilan = []
+
+    def loader(progress):
+        panggilan.append(threading.current_thread().name)
+        mulai.set()
+        gerbang.wait(5)
+        progress(1, 1)  # titik pembatalan
+        return "hasil"
+
+    job_a = pool.submit("K", "A", datasets.get_or_load, "K", loader)
+    assert mulai.wait(5)
+    pool.release("A")
+
+    job_b = pool.submit("K", "B", datasets.get_or_load, "K", loader)
+    assert job_b is not job_a
+    tunggu(lambda: datasets.stats()["waits"] == 1)
+    gerbang.set()
+
+    with pytest.raises(Dibatalkan):
+        job_a.result(5)
+    assert job_b.result(5) == "hasil"
+    assert len(panggilan) == 2
+    assert "K" in datasets
+
+
+def test_error_parse_tetap_diteruskan():
+    """Parse yang gagal (bukan dibatalkan) tetap memberi error ke penunggu."""
+    datasets = DatasetCache()
+    mulai, gerbang = threading.Event(), threading.Event()
+
+    def loader():
+        mulai.set()
+        gerbang.wait(5)
+        raise ValueError("Kolom Value tidak ditemukan")
+
+    hasil = []
+
+    def penunggu():
+        try:
+            datasets.get_or_load("K", loader)
+        except ValueError as e:
+            hasil.append(e)
+
+    pemilik = threading.Thread(target=penunggu)
+    pemilik.start()
+    assert mulai.wait(5)
+    lain = threading.Thread(target=penunggu)
+    lain.start()
+    tunggu(lambda: datasets.stats()["waits"] == 1)
+    gerbang.set()
+    pemilik.join(5)
+    lain.join(5)
+    assert len(hasil) == 2 and datasets.stats()["misses"] == 1